@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Content-addressed cache of simulate_rates results. The key is a hash of the
+# canonical model parameters (curve and seed included), so /simulate, /price and
+# /simulate-and-price with the same settings share one simulation. Entries are
+# evicted LRU against a byte budget and, when a spill directory is configured,
+# moved to .npy files that are memory-mapped back on a later hit.
+
+CACHE_BYTES = int(os.getenv("SIMULATION_CACHE_BYTES", 512 * 2**20))
+SPILL_DIR = os.getenv("SIMULATION_CACHE_SPILL_DIR")  # unset disables spilling
+SPILL_BYTES = int(os.getenv("SIMULATION_CACHE_SPILL_BYTES", 4 * 2**30))
+
+
+def simulation_key(model_name, params, engine="serial"):
+    """Canonical hash of a simulation request, or None if it is not reproducible."""
+    if params.get("seed") is None:
+        return None
+
+    canonical = {
+        "model": model_name,
+        "engine": engine,
+        "params": {k: v.tolist() if isinstance(v, np.ndarray) else v for k, v in params.items()},
+    }
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True).encode()).hexdigest()
+
+
+def _nbytes(simulation):
+    return sum(v.nbytes for v in simulation.values() if isinstance(v, np.ndarray))
+
+
+class SimulationCache:
+    """Thread-safe LRU of simulation dicts with an optional memory-mapped spill tier.
+
+    The lock only guards the bookkeeping; spill files are written, loaded and
+    deleted outside it, so lookups never wait on disk I/O.
+    """
+
+    def __init__(self, max_bytes=CACHE_BYTES, spill_dir=SPILL_DIR, spill_bytes=SPILL_BYTES):
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.spill_bytes = spill_bytes
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()  # key -> (simulation, nbytes)
+        self._spilled = OrderedDict()  # key -> (directory, nbytes, non-array values)
+        self._memory_bytes = 0
+        self._spilled_bytes = 0
+        self._spill_root = None
+
+    def get(self, key):
+        """Returns (simulation or None, status) with status 'hit', 'spill-hit' or 'miss'."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key][0], "hit"
+            if key not in self._spilled:
+                return None, "miss"
+            self._spilled.move_to_end(key)
+            directory, _, extras = self._spilled[key]
+
+        simulation = dict(extras)
+        try:
+            for name in os.listdir(directory):
+                simulation[name[:-4]] = np.load(os.path.join(directory, name), mmap_mode="r")
+        except OSError:
+            # Evicted while we were loading it
+            return None, "miss"
+        return simulation, "spill-hit"
+
+    def put(self, key, simulation):
+        for value in simulation.values():
+            if isinstance(value, np.ndarray):
+                value.flags.writeable = False
+
+        nbytes = _nbytes(simulation)
+        evicted = []
+        with self._lock:
+            if key in self._memory or key in self._spilled:
+                return
+
+            if nbytes > self.max_bytes:
+                evicted.append((key, simulation, nbytes))
+            else:
+                self._memory[key] = (simulation, nbytes)
+                self._memory_bytes += nbytes
+
+                while self._memory_bytes > self.max_bytes:
+                    old_key, (old, old_bytes) = self._memory.popitem(last=False)
+                    self._memory_bytes -= old_bytes
+                    evicted.append((old_key, old, old_bytes))
+
+        for old_key, old, old_bytes in evicted:
+            self._spill(old_key, old, old_bytes)
+
+    def _root(self):
+        # A private temporary directory, created on the first spill and removed at
+        # exit, so importing the cache touches no disk and clearing it touches nothing else
+        with self._lock:
+            if self._spill_root is None:
+                os.makedirs(self.spill_dir, exist_ok=True)
+                self._spill_root = tempfile.TemporaryDirectory(prefix="simcache-", dir=self.spill_dir)
+            return self._spill_root.name
+
+    def _spill(self, key, simulation, nbytes):
+        if not self.spill_dir or nbytes > self.spill_bytes:
+            return
+
+        directory = tempfile.mkdtemp(dir=self._root())
+        extras = {}
+        for name, value in simulation.items():
+            if isinstance(value, np.ndarray):
+                np.save(os.path.join(directory, f"{name}.npy"), value)
+            else:
+                extras[name] = value
+
+        stale = []
+        with self._lock:
+            if key in self._memory or key in self._spilled:
+                stale.append(directory)  # stored again while we were writing
+            else:
+                self._spilled[key] = (directory, nbytes, extras)
+                self._spilled_bytes += nbytes
+
+                while self._spilled_bytes > self.spill_bytes:
+                    _, (old_dir, old_bytes, _) = self._spilled.popitem(last=False)
+                    self._spilled_bytes -= old_bytes
+                    stale.append(old_dir)
+
+        for old_dir in stale:
+            shutil.rmtree(old_dir, ignore_errors=True)
+
+    def clear(self):
+        with self._lock:
+            stale = [directory for directory, _, _ in self._spilled.values()]
+            self._memory.clear()
+            self._spilled.clear()
+            self._memory_bytes = 0
+            self._spilled_bytes = 0
+
+        for directory in stale:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+simulation_cache = SimulationCache()
@@ -0,0 +1,57 @@
+import numpy as np
+
+# Display downsampling for the summary series. A chart cannot show more points
+# than it has pixels, so long grids are reduced with min/max bucketing: the first
+# and last points are kept, the interior is cut into equal buckets, and each
+# bucket contributes its minimum and maximum in the order they occur, so spikes
+# survive. All series share one time grid; each bucket's two points sit at its
+# first and last time.
+
+SERIES = ("mean_rate", "percentile_5", "percentile_25", "percentile_50", "percentile_75", "percentile_95")
+
+
+def minmax_buckets(time_grid, series, max_points):
+    """Reduce (n_series, n_points) rows on a shared grid to at most max_points columns."""
+    n_points = len(time_grid)
+    if n_points <= max_points:
+        return time_grid, series
+
+    interior = series[:, 1:-1]
+    m = interior.shape[1]
+    size = -(-m // ((max_points - 2) // 2))
+    n_buckets = -(-m // size)
+
+    # Pad with the last value so every bucket has the same width; repeats change no extremes
+    padded = np.pad(interior, ((0, 0), (0, n_buckets * size - m)), mode="edge")
+    buckets = padded.reshape(len(series), n_buckets, size)
+
+    lo_at = buckets.argmin(axis=2)
+    hi_at = buckets.argmax(axis=2)
+    lo = np.take_along_axis(buckets, lo_at[..., None], axis=2)[..., 0]
+    hi = np.take_along_axis(buckets, hi_at[..., None], axis=2)[..., 0]
+
+    low_first = lo_at <= hi_at
+    pairs = np.stack([np.where(low_first, lo, hi), np.where(low_first, hi, lo)], axis=2)
+
+    starts = np.arange(n_buckets) * size + 1
+    ends = np.minimum(starts + size - 1, m)
+    times = np.stack([time_grid[starts], time_grid[ends]], axis=1)
+
+    out_time = np.concatenate([time_grid[:1], times.ravel(), time_grid[-1:]])
+    out_series = np.concatenate([series[:, :1], pairs.reshape(len(series), -1), series[:, -1:]], axis=1)
+    return out_time, out_series
+
+
+def downsample_summary(summary: dict, max_points: int) -> dict:
+    """Downsample the plotted series of a summary; scalars and terminal stats are untouched."""
+    sample_paths = np.asarray(summary["sample_paths"])
+    rows = np.vstack([np.stack([summary[name] for name in SERIES]), sample_paths.reshape(-1, len(summary["time_grid"]))])
+
+    time_grid, reduced = minmax_buckets(np.asarray(summary["time_grid"]), rows, max_points)
+
+    out = dict(summary)
+    out["time_grid"] = time_grid
+    for name, row in zip(SERIES, reduced):
+        out[name] = row
+    out["sample_paths"] = reduced[len(SERIES):]
+    return out
@@ -0,0 +1,215 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+
+# Background jobs for runs too long for one HTTP request. A job is submitted and
+# driven from a small in-process thread pool, which hands the simulation work to
+# the request offloader's workers (sharing their back-pressure) and reports
+# progress as it goes; its status and JSON result live in a pluggable store:
+#
+#   JOB_STORE unset / "memory"   dict in this process (lost on restart)
+#   JOB_STORE=<path>             SQLite file, readable across restarts and by tests
+#
+# Admission is bounded like the request offloader: more than JOB_QUEUE_LIMIT
+# queued or running jobs gets 503 with Retry-After. Finished jobs are purged
+# JOB_TTL_SECONDS after they were last updated.
+
+JOB_STORE = os.getenv("JOB_STORE", "memory")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))
+JOB_QUEUE_LIMIT = int(os.getenv("JOB_QUEUE_LIMIT", 32))
+JOB_TTL_SECONDS = float(os.getenv("JOB_TTL_SECONDS", 24 * 3600))
+RETRY_AFTER_SECONDS = int(os.getenv("API_RETRY_AFTER_SECONDS", 5))
+
+ACTIVE = ("queued", "running")
+FIELDS = ("job_id", "status", "progress", "created_at", "updated_at", "error")
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class MemoryJobStore:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jobs = {}
+
+    def create(self, job_id):
+        now = time.time()
+        with self._lock:
+            self._jobs[job_id] = {
+                "job_id": job_id, "status": "queued", "progress": 0.0,
+                "created_at": now, "updated_at": now, "error": None, "result": None,
+            }
+
+    def update(self, job_id, **fields):
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields, updated_at=time.time())
+
+    def get(self, job_id, with_result=False):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return dict(job) if with_result else {k: job[k] for k in FIELDS}
+
+    def purge(self, older_than):
+        with self._lock:
+            for job_id in [k for k, job in self._jobs.items() if job["status"] not in ACTIVE and job["updated_at"] < older_than]:
+                del self._jobs[job_id]
+
+
+class SQLiteJobStore:
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "job_id TEXT PRIMARY KEY, status TEXT, progress REAL, created_at REAL, "
+                "updated_at REAL, error TEXT, result TEXT)"
+            )
+
+    def create(self, job_id):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs VALUES (?, 'queued', 0.0, ?, ?, NULL, NULL)",
+                (job_id, now, now),
+            )
+
+    def update(self, job_id, **fields):
+        if "result" in fields:
+            fields["result"] = json.dumps(fields["result"])
+        fields["updated_at"] = time.time()
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._conn:
+            self._conn.execute(f"UPDATE jobs SET {columns} WHERE job_id = ?", (*fields.values(), job_id))
+
+    def get(self, job_id, with_result=False):
+        columns = FIELDS + ("result",) if with_result else FIELDS
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(columns)} FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(columns, row))
+        if with_result and job["result"] is not None:
+            job["result"] = json.loads(job["result"])
+        return job
+
+    def purge(self, older_than):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM jobs WHERE status NOT IN ('queued', 'running') AND updated_at < ?",
+                (older_than,),
+            )
+
+
+def make_store(spec=JOB_STORE):
+    return MemoryJobStore() if spec in ("", "memory") else SQLiteJobStore(spec)
+
+
+class JobManager:
+    """Runs fn(*args, progress) jobs on a thread pool and records them in a store.
+
+    `progress(fraction)` is handed to each job; it records the fraction done and
+    raises JobCancelled once the job has been cancelled, so jobs stop at their
+    next progress report.
+    """
+
+    def __init__(self, store=None, workers=JOB_WORKERS, queue_limit=JOB_QUEUE_LIMIT, ttl=JOB_TTL_SECONDS):
+        self._store = store
+        self.queue_limit = queue_limit
+        self.ttl = ttl
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self._lock = threading.Lock()
+        self._store_lock = threading.Lock()
+        self._futures = {}
+        self._cancelled = set()
+
+    @property
+    def store(self):
+        # Opened on first use, so processes that only import this module (the
+        # offload workers) never open the store
+        with self._store_lock:
+            if self._store is None:
+                self._store = make_store()
+            return self._store
+
+    @property
+    def in_flight(self):
+        return len(self._futures)
+
+    def submit(self, fn, *args):
+        self.store.purge(time.time() - self.ttl)
+
+        with self._lock:
+            if len(self._futures) >= self.queue_limit:
+                raise HTTPException(
+                    status_code=503,
+                    detail="Job queue is full, retry shortly.",
+                    headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+                )
+            job_id = uuid.uuid4().hex
+            self.store.create(job_id)
+            self._futures[job_id] = self._pool.submit(self._run, job_id, fn, args)
+        return job_id
+
+    def _progress(self, job_id):
+        def report(fraction):
+            if job_id in self._cancelled:
+                raise JobCancelled
+            self.store.update(job_id, progress=float(fraction))
+        return report
+
+    def _run(self, job_id, fn, args):
+        try:
+            if job_id in self._cancelled:
+                raise JobCancelled
+            self.store.update(job_id, status="running")
+            result = fn(*args, self._progress(job_id))
+            if job_id in self._cancelled:
+                raise JobCancelled
+            self.store.update(job_id, status="done", progress=1.0, result=result)
+        except JobCancelled:
+            self.store.update(job_id, status="cancelled")
+        except Exception as exc:
+            self.store.update(job_id, status="failed", error=f"{type(exc).__name__}: {exc}")
+        finally:
+            with self._lock:
+                self._futures.pop(job_id, None)
+                self._cancelled.discard(job_id)
+
+    def status(self, job_id, with_result=False):
+        job = self.store.get(job_id, with_result=with_result)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Unknown job '{job_id}'.")
+        return job
+
+    def cancel(self, job_id):
+        """Cancel a queued job at once, or a running one at its next progress report."""
+        job = self.status(job_id)
+        if job["status"] not in ACTIVE:
+            return job
+
+        with self._lock:
+            future = self._futures.get(job_id)
+            if future is None:
+                return self.status(job_id)
+            self._cancelled.add(job_id)
+            if future.cancel():
+                self._futures.pop(job_id, None)
+                self._cancelled.discard(job_id)
+                self.store.update(job_id, status="cancelled")
+        return self.status(job_id)
+
+
+job_manager = JobManager()
@@ -0,0 +1,158 @@
+import asyncio
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from fastapi import HTTPException
+
+# Runs CPU-bound request work off the event loop on a bounded set of worker
+# processes. Each worker is its own single-process pool, and a request can name
+# a shard key (its simulation cache key) so identical settings land on the same
+# worker and hit that worker's simulation cache. Admission is bounded: once
+# QUEUE_LIMIT jobs are in flight, new requests get 503 with Retry-After.
+# API_WORKERS=0 runs jobs on a thread pool instead (same limits, no processes).
+# Background /jobs submit through call(), which waits for a slot instead of 503.
+# Progressive streams keep their running accumulators in this process, so their
+# chunks run on the server's thread pool rather than the workers; each holds a
+# slot the same way and at most STREAM_LIMIT of them run at once.
+# Jobs submitted with local=True (multi-core n_workers runs, which fan out to
+# their own shared process pool) run on a thread pool in this process, so the
+# workers never start pools of their own. shutdown() stops every pool.
+
+WORKERS = int(os.getenv("API_WORKERS", os.cpu_count() or 1))
+QUEUE_LIMIT = int(os.getenv("API_QUEUE_LIMIT", max(WORKERS, 1) * 4))
+TIMEOUT_SECONDS = float(os.getenv("API_TIMEOUT_SECONDS", 120))
+RETRY_AFTER_SECONDS = int(os.getenv("API_RETRY_AFTER_SECONDS", 5))
+STREAM_LIMIT = int(os.getenv("API_STREAM_LIMIT", max(WORKERS, 1)))
+LOCAL = "local"  # shard of the in-process thread pool
+
+
+class Offloader:
+    def __init__(self, workers=WORKERS, queue_limit=QUEUE_LIMIT, timeout=TIMEOUT_SECONDS, stream_limit=STREAM_LIMIT):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.timeout = timeout
+        self.stream_limit = stream_limit
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._streams = 0
+        self._pools = {}
+        self._pools_lock = threading.Lock()
+        self._round_robin = itertools.count()
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def _pool(self, shard):
+        if self.workers == 0:
+            shard = 0
+        with self._pools_lock:
+            if shard not in self._pools:
+                if self.workers == 0 or shard == LOCAL:
+                    self._pools[shard] = ThreadPoolExecutor(max_workers=max(self.queue_limit, 1))
+                else:
+                    self._pools[shard] = ProcessPoolExecutor(
+                        max_workers=1,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+            return self._pools[shard]
+
+    def _discard(self, shard):
+        with self._pools_lock:
+            self._pools.pop(shard, None)
+
+    def shutdown(self):
+        """Stop every pool, cancelling queued jobs; the next submit starts fresh ones."""
+        with self._pools_lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _check(self, stream):
+        if self._in_flight >= self.queue_limit or (stream and self._streams >= self.stream_limit):
+            raise HTTPException(
+                status_code=503,
+                detail="Simulation queue is full, retry shortly.",
+                headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+            )
+
+    def check(self, stream=False):
+        """Raise 503 if acquire would, without taking a slot."""
+        with self._lock:
+            self._check(stream)
+
+    def acquire(self, stream=False):
+        """Take an in-flight slot, or raise 503 if the queue (or the stream limit) is full."""
+        with self._lock:
+            self._check(stream)
+            self._in_flight += 1
+            self._streams += stream
+
+    def release(self, _future=None, stream=False):
+        with self._lock:
+            self._in_flight -= 1
+            self._streams -= stream
+
+    def submit(self, fn, *args, shard_key=None, local=False):
+        """Queue fn on a worker, holding a slot until it finishes; (future, shard), or 503 if full."""
+        self.acquire()
+
+        if local:
+            shard = LOCAL
+        else:
+            n_shards = max(self.workers, 1)
+            shard = (hash(shard_key) if shard_key is not None else next(self._round_robin)) % n_shards
+
+        try:
+            future = self._pool(shard).submit(fn, *args)
+        except BaseException:
+            self.release(None)
+            raise
+        # The slot is held until the job really finishes, even if the caller gives up
+        future.add_done_callback(self.release)
+        return future, shard
+
+    async def run(self, fn, *args, shard_key=None, local=False):
+        future, shard = self.submit(fn, *args, shard_key=shard_key, local=local)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            future.cancel()
+            raise HTTPException(status_code=504, detail=f"Request exceeded the {self.timeout:g}s time limit.")
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory); start a fresh one for the next request
+            self._discard(shard)
+            raise HTTPException(
+                status_code=503,
+                detail="Simulation worker crashed, retry shortly.",
+                headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+            )
+
+    def call(self, fn, *args, shard_key=None, local=False):
+        """Blocking run for background threads: waits for a free slot rather than failing with 503.
+
+        Background jobs have no request deadline, so no timeout applies.
+        """
+        while True:
+            try:
+                future, shard = self.submit(fn, *args, shard_key=shard_key, local=local)
+                break
+            except HTTPException as exc:
+                if exc.status_code != 503:
+                    raise
+                time.sleep(RETRY_AFTER_SECONDS)
+
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            self._discard(shard)
+            raise
+
+
+offloader = Offloader()
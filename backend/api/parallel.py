@@ -0,0 +1,112 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from api.simulate import simulate_rates, spawn_seeds, model_analytics
+
+# Multi-core path generation. Paths are split into fixed-size blocks whose layout
+# depends only on n_paths, and each block is seeded from its own SeedSequence
+# child of the request seed, so results are bit-identical for any worker count.
+# Workers write straight into shared-memory result arrays.
+#
+# One process pool of MAX_WORKERS is shared by every request; a request's
+# n_workers (clamped to the pool) bounds how many of its blocks run at once.
+# The pool belongs to the API process (the offloader runs these requests
+# locally) and is stopped by shutdown() when the app exits.
+# Parallel runs materialise their paths, so they are limited to MAX_RESULT_BYTES.
+
+BLOCK_SIZE = 1_000
+MAX_WORKERS = int(os.getenv("SIMULATION_WORKERS", os.cpu_count() or 1))
+MAX_RESULT_BYTES = int(os.getenv("SIMULATION_PARALLEL_BYTES", 2 * 2**30))
+
+_pool_lock = threading.Lock()
+_pool_executor = None
+
+
+def _pool():
+    global _pool_executor
+    with _pool_lock:
+        if _pool_executor is None:
+            _pool_executor = ProcessPoolExecutor(
+                max_workers=MAX_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool_executor
+
+
+def shutdown():
+    global _pool_executor
+    with _pool_lock:
+        executor, _pool_executor = _pool_executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def fits_in_memory(n_paths, n_steps):
+    """Whether a parallel run's rate and discount-factor arrays fit MAX_RESULT_BYTES."""
+    return 2 * n_paths * (n_steps + 1) * np.dtype(np.float64).itemsize <= MAX_RESULT_BYTES
+
+
+def block_layout(n_paths, block_size=BLOCK_SIZE):
+    return [(start, min(start + block_size, n_paths)) for start in range(0, n_paths, block_size)]
+
+
+def _run_block(model_name, params, start, stop, seed, names, shape):
+    simulation = simulate_rates(model_name, {**params, "n_paths": stop - start, "seed": seed})
+
+    for name, key in zip(names, ("rates", "discount_factors")):
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            np.ndarray(shape, dtype=np.float64, buffer=shm.buf)[start:stop] = simulation[key]
+        finally:
+            shm.close()
+
+
+def simulate_rates_parallel(model_name, params, n_workers=None, block_size=BLOCK_SIZE):
+    """Drop-in for simulate_rates that spreads fixed path blocks across a process pool."""
+    n_workers = max(min(n_workers or MAX_WORKERS, MAX_WORKERS), 1)
+    n_paths = params["n_paths"]
+    n_steps = int(params["T"] / params["dt"])
+    shape = (n_paths, n_steps + 1)
+
+    blocks = block_layout(n_paths, block_size)
+    seeds = spawn_seeds(params.get("seed"), len(blocks))
+
+    nbytes = n_paths * (n_steps + 1) * np.dtype(np.float64).itemsize
+    buffers = [shared_memory.SharedMemory(create=True, size=nbytes) for _ in range(2)]
+    names = [shm.name for shm in buffers]
+
+    try:
+        jobs = [(model_name, params, start, stop, seed, names, shape) for (start, stop), seed in zip(blocks, seeds)]
+        if n_workers == 1:
+            for job in jobs:
+                _run_block(*job)
+        else:
+            # At most n_workers of this request's blocks are queued on the shared pool at once
+            pending = set()
+            for job in jobs:
+                if len(pending) >= n_workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                pending.add(_pool().submit(_run_block, *job))
+            for future in pending:
+                future.result()
+
+        # Copy out so the shared segments can be released straight away
+        rates, discount_factors = (np.ndarray(shape, dtype=np.float64, buffer=shm.buf).copy() for shm in buffers)
+    finally:
+        for shm in buffers:
+            shm.close()
+            shm.unlink()
+
+    return {
+        "rates": rates,
+        "time_grid": np.linspace(0, params["T"], n_steps + 1),
+        "discount_factors": discount_factors,
+        **model_analytics(model_name, params),
+    }
@@ -1,6 +1,5 @@
-from pricing.zero_coupon import zcb
+from pricing.zero_coupon import zcb_block
 from pricing.forwards import forward_rates
-from pricing.swaps import par_swap_rate
 
 def price_instruments(simulation, pricing_request):
     DF = simulation["discount_factors"]
@@ -9,16 +8,14 @@ def price_instruments(simulation, pricing_request):
     results = {}
 
     if pricing_request.zcb_maturities:
-        results["zcb"] = {
-            T: zcb(DF, dt, T).mean()
-            for T in pricing_request.zcb_maturities
-        }
+        prices = zcb_block(DF, dt, pricing_request.zcb_maturities).mean(axis=0)
+        results["zcb"] = dict(zip(pricing_request.zcb_maturities, prices))
     
     if pricing_request.forward_pairs:
         results["forwards"] = {
             f"{T1}x{T2}": forward_rates(
-                zcb(DF, dt, T1),
-                zcb(DF, dt, T2),
+                zcb_block(DF, dt, [T1])[:, 0],
+                zcb_block(DF, dt, [T2])[:, 0],
                 T1, T2
             ).mean()
             for T1, T2 in pricing_request.forward_pairs
@@ -0,0 +1,149 @@
+import itertools
+import os
+
+import numpy as np
+
+from api.simulate import EXPECTED_MAP, model_analytics
+from api.streaming import percentile_bands
+from models.cir import _exact_step, _qe_step
+from models.hullwhite import _ar1_coefficients
+from models.recursion import ar1_paths
+from models.shocks import make_rng, normal_shocks
+from models.vasicek import _exact_coefficients
+
+# Scenario grids with common random numbers: one shock block is drawn for the
+# whole grid and every scenario is driven by it, so cross-scenario differences
+# carry far less Monte-Carlo noise than independent runs would.
+#
+# The Gaussian models are linear in their shocks, r_s(t) = E_s[r(t)] + scale_s * X(t)
+# with X the unit-scale AR(1) response to the shocks. X depends only on the decay
+# (kappa or alpha), so scenarios are grouped by decay and X is filtered, integrated
+# and sorted into percentile bands once per group; every r0, theta and sigma in the
+# grid is a broadcast on top. CIR is stepped with a leading
+# scenario axis on the state, in blocks bounded by SCENARIO_BLOCK_BYTES; its exact
+# scheme samples the chi-square transition directly and so shares only the RNG stream.
+
+GRID_PARAMS = {
+    "vasicek": ("r0", "kappa", "theta", "sigma"),
+    "cir": ("r0", "kappa", "theta", "sigma"),
+    "hull_white": ("r0", "alpha", "sigma"),
+    "ho_lee": ("r0", "sigma"),
+}
+MAX_SCENARIOS = 256
+SCENARIO_BLOCK_BYTES = int(os.getenv("SCENARIO_BLOCK_BYTES", 256 * 2**20))
+
+
+def scenario_grid(grid: dict) -> list[dict]:
+    """Cartesian product of the grid axes, in row-major order of the given keys."""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+
+
+def _unit_response(model_name, params):
+    """(decay, scale) of the shock term for the Gaussian models."""
+    dt = params["dt"]
+    scheme = params.get("scheme", "euler")
+
+    if model_name == "vasicek":
+        if scheme == "exact":
+            return _exact_coefficients(params["kappa"], params["sigma"], dt)
+        return 1 - params["kappa"] * dt, params["sigma"] * np.sqrt(dt)
+
+    if model_name == "hull_white":
+        decay, _drift, scale = _ar1_coefficients(
+            params["alpha"], params["sigma"], params["maturities"], params["zero_rates"],
+            params["T"], dt, scheme,
+        )
+        return decay, scale
+
+    return 1.0, params["sigma"] * np.sqrt(dt)  # ho_lee: a random walk
+
+
+def _with_discounting(rates, params, model_name, integral=None):
+    dt = params["dt"]
+    if integral is None:
+        integral = np.cumsum(rates * dt, axis=1)
+    return {
+        "rates": rates,
+        "time_grid": np.linspace(0, params["T"], rates.shape[1]),
+        "discount_factors": np.exp(-integral, out=integral),
+        **model_analytics(model_name, params),
+    }
+
+
+def _gaussian_grid(model_name, scenario_params, Z):
+    dt = scenario_params[0]["dt"]
+
+    # Scenarios are grouped by decay and only the current group's unit response,
+    # integral and bands are held, so memory stays at one response whatever the grid
+    units = [_unit_response(model_name, params) for params in scenario_params]
+    order = sorted(range(len(scenario_params)), key=lambda i: units[i][0])
+
+    for decay, group in itertools.groupby(order, key=lambda i: units[i][0]):
+        # Scenario rates are an affine map of the unit response, so (for scale >= 0) their bands are too
+        X = ar1_paths(0.0, decay, Z)
+        X_integral = np.cumsum(X, axis=1) * dt
+        X_bands = percentile_bands(X)
+
+        for i in group:
+            params, scale = scenario_params[i], units[i][1]
+            expected = EXPECTED_MAP[model_name](**params)
+            rates = scale * X
+            rates += expected
+            integral = scale * X_integral
+            integral += np.cumsum(expected) * dt
+
+            simulation = _with_discounting(rates, params, model_name, integral)
+            if scale >= 0:
+                simulation["percentile_bands"] = expected + scale * X_bands
+            yield i, simulation
+
+        del X, X_integral, X_bands
+
+
+def _cir_grid(scenario_params, Z, rng):
+    base = scenario_params[0]
+    n_paths, n_steps = base["n_paths"], int(base["T"] / base["dt"])
+    dt, scheme = base["dt"], base.get("scheme", "euler")
+    block = max(1, SCENARIO_BLOCK_BYTES // (n_paths * (n_steps + 1) * 8))
+
+    for start in range(0, len(scenario_params), block):
+        chunk = scenario_params[start:start + block]
+        kappa, theta, sigma, r0 = (
+            np.array([p[name] for p in chunk], dtype=float)[:, None] for name in ("kappa", "theta", "sigma", "r0")
+        )
+
+        rates = np.empty((len(chunk), n_paths, n_steps + 1))
+        rates[:, :, 0] = r0
+        for t in range(n_steps):
+            rt = rates[:, :, t]
+            if scheme == "exact":
+                rates[:, :, t + 1] = _exact_step(rt, kappa, theta, sigma, dt, rng)
+            elif scheme == "qe":
+                z = np.broadcast_to(Z[:, t], rt.shape)
+                rates[:, :, t + 1] = _qe_step(rt, kappa, theta, sigma, dt, z)
+            else:
+                rt = np.maximum(rt, 0.0)
+                rates[:, :, t + 1] = rt + kappa * (theta - rt) * dt + sigma * np.sqrt(rt) * np.sqrt(dt) * Z[:, t]
+
+        for i, (params, scenario_rates) in enumerate(zip(chunk, rates), start):
+            yield i, _with_discounting(scenario_rates, params, "cir")
+
+
+def simulate_grid(model_name, scenario_params):
+    """Yield (index, simulate_rates-style dict) per scenario, all driven by one shared shock block.
+
+    Scenarios come out grouped by the work they share, not in the order given.
+    Every entry of scenario_params must share T, dt, n_paths, seed, sampling and scheme.
+    """
+    base = scenario_params[0]
+    n_steps = int(base["T"] / base["dt"])
+    rng = make_rng(base.get("seed"))
+
+    exact_cir = model_name == "cir" and base.get("scheme") == "exact"
+    Z = None if exact_cir else normal_shocks(base["n_paths"], n_steps, rng, base.get("sampling", "pseudo"))
+
+    if model_name == "cir":
+        yield from _cir_grid(scenario_params, Z, rng)
+    else:
+        yield from _gaussian_grid(model_name, scenario_params, Z)
@@ -1,7 +1,10 @@
-from models.vasicek import simulate_vasicek
+from functools import partial
+
+from models.vasicek import simulate_vasicek, expected_vasicek
 from models.cir import simulate_cir
-from models.hullwhite import simulate_hull_white
-from models.holee import simulate_ho_lee
+from models.hullwhite import simulate_hull_white, expected_hull_white
+from models.holee import simulate_ho_lee, expected_ho_lee
+from pricing.analytic import ANALYTIC_ZCB
 import numpy as np
 
 MODEL_MAP = {
@@ -12,18 +15,53 @@ MODEL_MAP = {
 }
 
 
+# Exact grid means of the simulated rates (Gaussian models only), used as
+# control-variate targets when pricing
+EXPECTED_MAP = {
+    "vasicek": expected_vasicek,
+    "hull_white": expected_hull_white,
+    "ho_lee": expected_ho_lee,
+}
+
+
+def model_analytics(model_name, params):
+    expected = EXPECTED_MAP.get(model_name)
+    return {
+        "expected_rates": expected(**params) if expected else None,
+        "analytic_zcb": partial(ANALYTIC_ZCB[model_name], **params),
+    }
+
+
+def spawn_seeds(seed, n):
+    """Independent integer seeds for n blocks of paths, derived from the request seed."""
+    if seed is None:
+        return [None] * n
+    return [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(n)]
+
+
+# Models that return the integrated short rate alongside the paths
+INTEGRATED_MODELS = {"ho_lee"}
+
+
 def simulate_rates(model_name, params):
     simulate = MODEL_MAP[model_name]
-    rates = simulate(**params)
 
     T = params["T"]
     dt = params["dt"]
+
+    if model_name in INTEGRATED_MODELS:
+        rates, integral = simulate(**params, return_integral=True)
+    else:
+        rates = simulate(**params)
+        integral = np.cumsum(rates * dt, axis=1)
+
     time_grid = np.linspace(0, T, rates.shape[1])
 
-    discount_factors = np.exp(-np.cumsum(rates * dt, axis=1))
+    discount_factors = np.exp(-integral, out=integral)
 
     return {
         "rates": rates,
         "time_grid": time_grid,
         "discount_factors": discount_factors,
+        **model_analytics(model_name, params),
     }
\ No newline at end of file
@@ -0,0 +1,253 @@
+import numpy as np
+
+from api.simulate import simulate_rates, spawn_seeds
+from pricing.zero_coupon import zcb_block
+from pricing.forwards import forward_rates
+from pricing.swaps import swap_legs, payment_schedule
+
+# Chunked simulation: paths are generated DEFAULT_CHUNK_SIZE at a time and folded
+# into online accumulators, so peak memory depends on the chunk size rather
+# than on n_paths. The running result can be read between chunks, which is what
+# the progressive /simulate-and-price/stream endpoint reports.
+
+DEFAULT_CHUNK_SIZE = 2_000
+N_BINS = 256  # histogram bins per time step for the percentile bands
+BIN_BLOCK = 512  # time steps binned at once, bounds the temporary index array
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def percentile_bands(rates, percentiles=PERCENTILES):
+    """Per-step percentiles of a (paths x steps) block, matching np.percentile's linear rule.
+
+    One sort down the path axis is much cheaper than np.percentile's
+    multi-pivot partition on this layout.
+    """
+    ordered = np.sort(rates, axis=0)
+    position = np.asarray(percentiles, dtype=float) / 100 * (len(ordered) - 1)
+    lo = np.floor(position).astype(int)
+    hi = np.minimum(lo + 1, len(ordered) - 1)
+    frac = (position - lo)[:, None]
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * frac
+
+
+class MomentAccumulator:
+    """Running count, mean and sum of squared deviations, merged chunk by chunk."""
+
+    def __init__(self, shape=()):
+        self.n = 0
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+
+    def update(self, x):
+        n = x.shape[0]
+        mean = x.mean(axis=0)
+        m2 = ((x - mean) ** 2).sum(axis=0)
+
+        # Chan et al. pairwise merge
+        total = self.n + n
+        delta = mean - self.mean
+        self.mean = self.mean + delta * n / total
+        self.m2 = self.m2 + m2 + delta**2 * self.n * n / total
+        self.n = total
+
+    @property
+    def std(self):
+        # Population std, matching np.std on the full sample
+        return np.sqrt(self.m2 / self.n)
+
+
+class QuantileHistogram:
+    """Per-time-step histograms giving approximate percentiles.
+
+    Bin ranges come from the first chunk, widened by its spread on both sides;
+    later values outside the range land in the edge bins.
+    """
+
+    def __init__(self, first_chunk, n_bins=N_BINS):
+        lo = first_chunk.min(axis=0)
+        hi = first_chunk.max(axis=0)
+        pad = np.maximum(hi - lo, 1e-8)
+
+        self.n_bins = n_bins
+        self.lo = lo - pad
+        self.width = (hi - lo + 2 * pad) / n_bins
+        self.counts = np.zeros((first_chunk.shape[1], n_bins), dtype=np.int64)
+
+    def update(self, x):
+        for start in range(0, x.shape[1], BIN_BLOCK):
+            stop = min(start + BIN_BLOCK, x.shape[1])
+            idx = ((x[:, start:stop] - self.lo[start:stop]) / self.width[start:stop]).astype(np.int64)
+            np.clip(idx, 0, self.n_bins - 1, out=idx)
+
+            # Offset each column into its own block of bins and count in one pass
+            idx += np.arange(stop - start) * self.n_bins
+            counts = np.bincount(idx.ravel(), minlength=(stop - start) * self.n_bins)
+            self.counts[start:stop] += counts.reshape(stop - start, self.n_bins)
+
+    def percentile(self, q):
+        rows = np.arange(self.counts.shape[0])
+        cum = np.cumsum(self.counts, axis=1)
+        target = q / 100 * cum[:, -1]
+
+        idx = np.minimum((cum < target[:, None]).sum(axis=1), self.n_bins - 1)
+        below = np.where(idx > 0, cum[rows, idx - 1], 0)
+        in_bin = self.counts[rows, idx]
+
+        # Linear interpolation inside the bin
+        frac = np.where(in_bin > 0, (target - below) / np.maximum(in_bin, 1), 0.5)
+        return self.lo + (idx + frac) * self.width
+
+
+class PathReservoir:
+    """Uniform reservoir sample of k paths across all chunks."""
+
+    def __init__(self, k, seed=None):
+        self.k = k
+        self.paths = None
+        self.seen = 0
+        self.rng = np.random.default_rng(seed)
+
+    def update(self, x):
+        if self.paths is None:
+            self.paths = x[: self.k].copy()
+            fill = len(self.paths)
+        else:
+            fill = 0
+
+        rest = np.arange(fill, x.shape[0])
+        if rest.size:
+            j = self.rng.integers(0, self.seen + rest + 1)
+            keep = j < self.k
+            self.paths[j[keep]] = x[rest[keep]]
+
+        self.seen += x.shape[0]
+
+
+class StreamingRun:
+    """One chunked simulation; advance it with chunks() and read result() at any point.
+
+    result() after the last chunk is the full answer; before that it summarises
+    the paths simulated so far, so callers can report converging estimates.
+    """
+
+    def __init__(
+        self,
+        model_name,
+        params,
+        pricing=None,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        n_sample_paths=20,
+        discount_dates=None,
+    ):
+        self.model_name = model_name
+        self.params = params
+        self.pricing = pricing
+        self.discount_dates = discount_dates
+        self.n_paths = params["n_paths"]
+        self.n_done = 0
+
+        self.sizes = [min(chunk_size, self.n_paths - start) for start in range(0, self.n_paths, chunk_size)]
+        self.seeds = spawn_seeds(params.get("seed"), len(self.sizes))
+
+        self.time_grid = None
+        self.rate_sum = None
+        self.bands = None
+        self.terminal = MomentAccumulator()
+        self.reservoir = PathReservoir(n_sample_paths, seed=params.get("seed"))
+
+        self.zcb_maturities = (pricing.zcb_maturities or []) if pricing else []
+        self.forward_pairs = (pricing.forward_pairs or []) if pricing else []
+        self.swap_maturities = (pricing.swap_maturities or []) if pricing else []
+
+        self.zcb_stats = MomentAccumulator(len(self.zcb_maturities))
+        self.forward_stats = MomentAccumulator(len(self.forward_pairs))
+        self.floating_sum = np.zeros(len(self.swap_maturities))
+        self.fixed_sum = np.zeros(len(self.swap_maturities))
+        self.discount_sum = None  # per time step; gathered on discount_dates in result()
+
+    def chunks(self, simulate=simulate_rates):
+        """Simulate chunk by chunk, yielding the number of paths done after each one.
+
+        `simulate(model_name, params)` produces each chunk, so callers can run the
+        chunks elsewhere (e.g. on the offload workers) and fold them here.
+        """
+        for size, seed in zip(self.sizes, self.seeds):
+            self._fold(simulate(self.model_name, {**self.params, "n_paths": size, "seed": seed}))
+            self.n_done += size
+            yield self.n_done
+
+    def _fold(self, simulation):
+        rates = simulation["rates"]
+        DF = simulation["discount_factors"]
+        self.time_grid = simulation["time_grid"]
+        dt = self.time_grid[1] - self.time_grid[0]
+
+        if self.rate_sum is None:
+            self.rate_sum = np.zeros(rates.shape[1])
+            self.bands = QuantileHistogram(rates)
+
+        self.rate_sum += rates.sum(axis=0)
+        self.bands.update(rates)
+        self.terminal.update(rates[:, -1])
+        self.reservoir.update(rates)
+
+        if self.zcb_maturities:
+            self.zcb_stats.update(zcb_block(DF, dt, self.zcb_maturities))
+
+        if self.forward_pairs:
+            T1s, T2s = np.array(self.forward_pairs, dtype=float).T
+            self.forward_stats.update(forward_rates(zcb_block(DF, dt, T1s), zcb_block(DF, dt, T2s), T1s, T2s))
+
+        for i, mat in enumerate(self.swap_maturities):
+            floating, fixed = swap_legs(DF, payment_schedule(mat, self.pricing.swap_frequency), mat, dt)
+            self.floating_sum[i] += floating.sum()
+            self.fixed_sum[i] += fixed.sum()
+
+        if self.discount_dates is not None:
+            if self.discount_sum is None:
+                self.discount_sum = np.zeros(DF.shape[1])
+            self.discount_sum += DF.sum(axis=0)
+
+    def result(self):
+        n = self.n_done
+        result = {
+            "time_grid": self.time_grid,
+            "n_steps": len(self.time_grid) - 1,
+            "n_paths_done": n,
+            "mean_rate": self.rate_sum / n,
+            "percentiles": {q: self.bands.percentile(q) for q in PERCENTILES},
+            "sample_paths": self.reservoir.paths,
+            "terminal_mean": float(self.terminal.mean),
+            "terminal_std": float(self.terminal.std),
+        }
+
+        if self.zcb_maturities:
+            result["zcb"] = list(zip(self.zcb_maturities, self.zcb_stats.mean, self.zcb_stats.std))
+        if self.forward_pairs:
+            result["forwards"] = list(zip(self.forward_pairs, self.forward_stats.mean, self.forward_stats.std))
+        if self.swap_maturities:
+            result["swaps"] = list(zip(self.swap_maturities, self.floating_sum / self.fixed_sum))
+        if self.discount_dates is not None:
+            dt = self.time_grid[1] - self.time_grid[0]
+            result["mean_discount"] = zcb_block(self.discount_sum[None, :] / n, dt, self.discount_dates)[0]
+
+        return result
+
+
+def simulate_streaming(
+    model_name,
+    params,
+    pricing=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    n_sample_paths=20,
+    discount_dates=None,
+):
+    """Simulate in chunks and return summary statistics (and prices) without holding every path.
+
+    If discount_dates is given, the mean discount factor on those dates is also
+    accumulated (used for book valuation).
+    """
+    run = StreamingRun(model_name, params, pricing, chunk_size, n_sample_paths, discount_dates)
+    for _ in run.chunks():
+        pass
+    return run.result()
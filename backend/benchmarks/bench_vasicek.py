@@ -0,0 +1,28 @@
+import time
+
+from models.vasicek import simulate_vasicek
+
+# Euler loop vs exact AR(1) filter at 10k paths x 30y daily. Both draw the same
+# shocks, so most of the daily cost is the RNG; the exact scheme's real win is
+# that it stays unbiased on a monthly grid.
+# Run from backend/: python -m benchmarks.bench_vasicek
+
+PARAMS = dict(r0=0.05, kappa=0.3, theta=0.04, sigma=0.01, T=30.0, dt=1 / 252, n_paths=10_000, seed=42)
+
+
+def bench(scheme, repeats=3, **overrides):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        simulate_vasicek(**{**PARAMS, **overrides}, scheme=scheme)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    euler = bench("euler")
+    exact = bench("exact")
+    monthly = bench("exact", dt=1 / 12)
+    print(f"euler daily:   {euler:.3f}s")
+    print(f"exact daily:   {exact:.3f}s ({euler / exact:.1f}x)")
+    print(f"exact monthly: {monthly:.3f}s ({euler / monthly:.1f}x)")
@@ -1,24 +1,20 @@
-from fredapi import Fred
-import pandas as pd
-import ssl, certifi
-import plotly.graph_objects as go
 import os
-from dotenv import load_dotenv
-from supabase import create_client
-
-# Creating SSL Context for FRED API
-ssl_context = ssl.create_default_context(cafile=certifi.where())
 
-# Initialising Supabase HTTPS connection
-load_dotenv()
-
-HOST = os.getenv("SUPABASE_HOST")
-fred = Fred(api_key=os.getenv("FRED_API_KEY"))
+import pandas as pd
+from dotenv import load_dotenv
 
-url = f"https://{HOST}"
-key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+from utils.fred import FredFetcher, refresh_window
+from utils.local_store import supabase_client
 
-supabase = create_client(url, key)
+# Macroeconomic indicators from FRED, upserted into the macro_indicators table.
+# Run from backend/ with
+#
+#   python -m indicators_pipeline.macro_data
+#
+# Incremental runs re-fetch a look-back window before the last stored date (see
+# utils/fred.py) plus the history the transforms need, then upsert just that window.
+TABLE = "macro_indicators"
+HISTORY_DAYS = 400  # 12-month CPI change and quarterly GDP change need a year of history before the window
 
 # Importing macroeconomic indicators from FRED API
 MACRO_INDICATORS = {
@@ -34,12 +30,29 @@ MACRO_INDICATORS = {
     "NBER": ("USRECD", "daily")
 }
 
-def download_fred_series(series_dict):
+# Renaming columns to match Supabase schema
+COLUMNS = {
+    "Date":"date",
+    "CPI_YoY":"cpi_yoy",
+    "CPI_MoM":"cpi_mom",
+    "PCE":"pce",
+    "PPI":"ppi",
+    "GDP":"gdp",
+    "UNEMPLOYMENT":"unemployment",
+    "CREDIT_SPREAD":"credit_spread",
+    "JOLTS":"jolts",
+    "HOUSING_STARTS":"housing_starts",
+    "NBER":"nber"
+}
+
+def download_fred_series(fred, series_dict, observation_start=None):
     df_list = []
 
+    # Each distinct series is fetched once, concurrently, and shared between columns
+    fetched = fred.get_many([series_id for series_id, _ in series_dict.values()], observation_start)
+
     for name, (series_id, freq) in series_dict.items():
-        series = fred.get_series(series_id=series_id)
-        series.index = pd.to_datetime(series.index)
+        series = fetched[series_id]
 
         s = pd.DataFrame(series, columns=[name])
         if name == "CPI_YoY":
@@ -65,35 +78,6 @@ def download_fred_series(series_dict):
     df = df.ffill()
     
     return df
-        
-df = download_fred_series(MACRO_INDICATORS)
-
-# Forward filling to today's date
-full_range = pd.date_range(
-    start=df.index.min(), 
-    end=pd.Timestamp.utcnow().normalize().replace(tzinfo=None), 
-    freq="D"
-)
-
-df = df.reindex(full_range).rename_axis("date").reset_index()
-
-df = df.ffill()
-
-# Renaming columns
-
-df = df.rename(columns={
-    "Date":"date",
-    "CPI_YoY":"cpi_yoy",
-    "CPI_MoM":"cpi_mom",
-    "PCE":"pce",
-    "PPI":"ppi",
-    "GDP":"gdp",
-    "UNEMPLOYMENT":"unemployment",
-    "CREDIT_SPREAD":"credit_spread",
-    "JOLTS":"jolts",
-    "HOUSING_STARTS":"housing_starts",
-    "NBER":"nber"
-})
 
 # Creating quarter column
 def month_to_quarter(date):
@@ -102,20 +86,49 @@ def month_to_quarter(date):
     quarter = (month - 1) // 3 + 1
     return f"Q{quarter} {year}"
 
-df["quarter"] = df["date"].apply(month_to_quarter)
+def to_records(df, window_start=None):
+    """Supabase rows from the downloaded indicators, forward filled to today."""
+    full_range = pd.date_range(
+        start=df.index.min(), 
+        end=pd.Timestamp.now("UTC").normalize().replace(tzinfo=None), 
+        freq="D"
+    )
+
+    df = df.reindex(full_range).rename_axis("date").reset_index()
+
+    df = df.ffill()
+
+    # Keeping only the window being (re)written
+    if window_start is not None:
+        df = df[df["date"] >= window_start]
+
+    df = df.rename(columns=COLUMNS)
+
+    df["quarter"] = df["date"].apply(month_to_quarter)
+
+    # Formatting date column
+    df["date"] = pd.to_datetime(df["date"]).dt.tz_localize("UTC")
+    df["date"] = df["date"].dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    df = df.dropna()
+
+    return df.to_dict(orient="records")
+
+def run(fred=None, client=None):
+    load_dotenv()
+    fred = fred or FredFetcher(api_key=os.getenv("FRED_API_KEY"))
+    client = client or supabase_client()
 
-# Formatting date column
-df["date"] = pd.to_datetime(df["date"]).dt.tz_localize("UTC")
-df["date"] = df["date"].dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+    window_start, observation_start = refresh_window(client, TABLE, MACRO_INDICATORS, HISTORY_DAYS)
+    data = to_records(download_fred_series(fred, MACRO_INDICATORS, observation_start), window_start)
 
-df = df.dropna()
+    # Full loads skip existing rows; incremental windows overwrite them with any revisions
+    print(f"Uploading {len(data)} rows")
+    client.table(TABLE).upsert(data,
+                               on_conflict="date",
+                               ignore_duplicates=window_start is None).execute()
+    print("Uploaded")
 
-# Uploading to Supabase
-data = df.to_dict(orient="records")
 
-# Uploading and skipping over duplicate values
-print("Uploading")
-supabase.table("macro_indicators").upsert(data,
-                                          on_conflict="date",
-                                          ignore_duplicates=True).execute()
-print("Uploaded")
\ No newline at end of file
+if __name__ == "__main__":
+    run()
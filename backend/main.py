@@ -1,11 +1,22 @@
-from fastapi import FastAPI, HTTPException
+import json
+from contextlib import asynccontextmanager
+from datetime import date
+from functools import partial
+
+from fastapi import FastAPI, Header, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 import numpy as np
+import pandas as pd
 
 from utils.requests import (
+    YieldCurveInput,
     SimulationRequest,
     PricingRequest,
     SimulateAndPriceRequest,
+    BookRequest,
+    ScenarioGridRequest,
 )
 from utils.responses import (
     SimulationResponse,
@@ -14,11 +25,34 @@ from utils.responses import (
     ZCBResult,
     ForwardResult,
     SwapResult,
+    BookResponse,
+    JobStatus,
+    ScenarioResult,
+    ScenarioGridResponse,
+    Sensitivities,
+    CalibrationResponse,
 )
 from api.simulate import simulate_rates
-from api.pricing import price_instruments
+from api.streaming import simulate_streaming, StreamingRun, percentile_bands, DEFAULT_CHUNK_SIZE, PERCENTILES
+from api.parallel import simulate_rates_parallel, fits_in_memory, shutdown as shutdown_parallel
+from api.cache import simulation_cache, simulation_key
+from api.offload import offloader
+from api.jobs import job_manager
+from api.scenarios import simulate_grid, scenario_grid, GRID_PARAMS, MAX_SCENARIOS
+from api.downsample import downsample_summary, minmax_buckets, SERIES
+from utils.encoding import ENCODERS, negotiate
+from models.shocks import MAX_SOBOL_DIM
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    yield
+    # The worker and parallel pools would otherwise keep the process alive on exit
+    offloader.shutdown()
+    shutdown_parallel()
+
 
 app = FastAPI(
+    lifespan=lifespan,
     title="Short-Rate Simulation API",
     description="Monte-Carlo short-rate models (Vasicek, CIR, Hull-White, Ho-Lee) with ZCB / forward / swap pricing.",
     version="0.1.0",
@@ -31,11 +65,36 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Simulation-Cache", "Retry-After"],
 )
 
 
 # ── helpers ──────────────────────────────────────────────────────────────
 
+# Discretisation schemes each model supports (the first is the default)
+MODEL_SCHEMES = {
+    "vasicek": ("euler", "exact"),
+    "cir": ("euler", "exact", "qe"),
+    "hull_white": ("euler", "exact"),
+    "ho_lee": ("euler",),
+}
+
+
+def _curve_arrays(curve: YieldCurveInput) -> tuple[np.ndarray, np.ndarray]:
+    maturities = np.array(curve.maturities, dtype=float)
+    zero_rates = np.array(curve.zero_rates, dtype=float)
+
+    if len(maturities) != len(zero_rates) or len(maturities) < 2:
+        raise HTTPException(
+            status_code=422,
+            detail="yield_curve needs at least two points and one zero rate per maturity.",
+        )
+    if maturities[0] < 0 or np.any(np.diff(maturities) <= 0):
+        raise HTTPException(status_code=422, detail="yield_curve maturities must be non-negative and increasing.")
+
+    return maturities, zero_rates
+
+
 def _build_model_params(req: SimulationRequest) -> dict:
     """Translate the flat request into the kwargs each model function expects."""
     common = dict(
@@ -45,8 +104,28 @@ def _build_model_params(req: SimulationRequest) -> dict:
         dt=req.dt,
         n_paths=req.n_paths,
         seed=req.seed,
+        sampling=req.sampling,
     )
 
+    if req.scheme not in MODEL_SCHEMES[req.model]:
+        raise HTTPException(
+            status_code=422,
+            detail=f"{req.model} supports schemes {list(MODEL_SCHEMES[req.model])}, got '{req.scheme}'.",
+        )
+    if req.scheme != "euler":
+        common["scheme"] = req.scheme
+
+    if req.sampling == "sobol" and int(req.T / req.dt) > MAX_SOBOL_DIM:
+        raise HTTPException(
+            status_code=422,
+            detail=f"sobol sampling supports at most {MAX_SOBOL_DIM} time steps.",
+        )
+    if req.model == "cir" and req.scheme == "exact" and req.sampling != "pseudo":
+        raise HTTPException(
+            status_code=422,
+            detail="cir's exact scheme samples the transition directly and only supports 'pseudo' sampling.",
+        )
+
     if req.model in ("vasicek", "cir"):
         if req.kappa is None or req.theta is None:
             raise HTTPException(
@@ -56,6 +135,14 @@ def _build_model_params(req: SimulationRequest) -> dict:
         common["kappa"] = req.kappa
         common["theta"] = req.theta
 
+        # The exact and QE transitions divide by kappa and sigma and need a non-negative rate
+        if req.model == "cir" and req.scheme != "euler":
+            if req.kappa <= 0 or req.theta <= 0 or req.sigma <= 0 or req.r0 < 0:
+                raise HTTPException(
+                    status_code=422,
+                    detail=f"cir's '{req.scheme}' scheme needs kappa, theta and sigma > 0 and r0 >= 0.",
+                )
+
     elif req.model == "hull_white":
         if req.alpha is None or req.yield_curve is None:
             raise HTTPException(
@@ -63,8 +150,7 @@ def _build_model_params(req: SimulationRequest) -> dict:
                 detail="hull_white requires 'alpha' and 'yield_curve'.",
             )
         common["alpha"] = req.alpha
-        common["maturities"] = np.array(req.yield_curve.maturities)
-        common["zero_rates"] = np.array(req.yield_curve.zero_rates)
+        common["maturities"], common["zero_rates"] = _curve_arrays(req.yield_curve)
 
     elif req.model == "ho_lee":
         if req.yield_curve is None:
@@ -72,111 +158,699 @@ def _build_model_params(req: SimulationRequest) -> dict:
                 status_code=422,
                 detail="ho_lee requires 'yield_curve'.",
             )
-        common["maturities"] = np.array(req.yield_curve.maturities)
-        common["zero_rates"] = np.array(req.yield_curve.zero_rates)
+        common["maturities"], common["zero_rates"] = _curve_arrays(req.yield_curve)
 
     return common
 
 
 N_SAMPLE_PATHS = 20  # how many individual paths to send to the frontend
+MAX_IN_MEMORY_PATHS = 10_000  # above this, serial runs are simulated in chunks
 
 
-def _summarise(simulation: dict, req: SimulationRequest) -> SimulationResponse:
-    """Condense the raw numpy arrays into JSON-friendly summary stats."""
+def _summarise(simulation: dict, req: SimulationRequest) -> dict:
+    """Condense the raw numpy arrays into summary stats (kept as arrays until encoding)."""
     rates = simulation["rates"]
     tg = simulation["time_grid"]
 
+    # Scenario grids hand in bands computed once for the whole grid
+    bands = simulation.get("percentile_bands")
+    if bands is None:
+        bands = percentile_bands(rates)
+
+    return {
+        "model": req.model,
+        "n_paths": req.n_paths,
+        "n_steps": rates.shape[1] - 1,
+        "T": req.T,
+        "dt": req.dt,
+        "time_grid": tg,
+        "mean_rate": rates.mean(axis=0),
+        **{f"percentile_{q}": band for q, band in zip(PERCENTILES, bands)},
+        "sample_paths": rates[:N_SAMPLE_PATHS],
+        "terminal_mean": float(rates[:, -1].mean()),
+        "terminal_std": float(rates[:, -1].std()),
+    }
+
+
+def _simulation_response(summary: dict) -> SimulationResponse:
+    """JSON form of a summary."""
     return SimulationResponse(
-        model=req.model,
-        n_paths=req.n_paths,
-        n_steps=rates.shape[1] - 1,
-        T=req.T,
-        dt=req.dt,
-        time_grid=tg.tolist(),
-        mean_rate=rates.mean(axis=0).tolist(),
-        percentile_5=np.percentile(rates, 5, axis=0).tolist(),
-        percentile_25=np.percentile(rates, 25, axis=0).tolist(),
-        percentile_50=np.percentile(rates, 50, axis=0).tolist(),
-        percentile_75=np.percentile(rates, 75, axis=0).tolist(),
-        percentile_95=np.percentile(rates, 95, axis=0).tolist(),
-        sample_paths=rates[:N_SAMPLE_PATHS].tolist(),
-        terminal_mean=float(rates[:, -1].mean()),
-        terminal_std=float(rates[:, -1].std()),
+        **{k: v.tolist() if isinstance(v, np.ndarray) else v for k, v in summary.items()}
+    )
+
+
+def _binary_response(summary: dict, media_type: str, response: Response, pricing: PricingResponse | None = None):
+    """Summary arrays as raw buffers in the negotiated binary format."""
+    extra = {"pricing": pricing.model_dump()} if pricing is not None else None
+    return Response(
+        content=ENCODERS[media_type](summary, extra),
+        media_type=media_type,
+        headers={CACHE_HEADER: response.headers.get(CACHE_HEADER, "bypass")},
     )
 
 
 def _price(simulation: dict, pr: PricingRequest) -> PricingResponse:
     """Price requested instruments from the simulation output."""
-    rates = simulation["rates"]
     DF = simulation["discount_factors"]
     dt = simulation["time_grid"][1] - simulation["time_grid"][0]
 
     resp = PricingResponse()
 
-    if pr.zcb_maturities:
-        from pricing.zero_coupon import zcb
+    # Control variates: the path integral of r has an exact mean for the Gaussian
+    # models. expected_integral[n] = E[sum of r*dt over the first n steps].
+    expected = simulation.get("expected_rates") if pr.control_variate else None
+    if expected is not None:
+        from pricing.control_variates import control_variate
+
+        expected_integral = np.concatenate(([0.0], np.cumsum(expected * dt)))
+
+    zcb_maturities = pr.zcb_maturities or []
+    forward_pairs = pr.forward_pairs or []
+
+    # Every maturity the ZCBs and forwards need is gathered from DF in one go
+    needed = sorted(set(zcb_maturities) | {T for pair in forward_pairs for T in pair})
+    if needed:
+        from pricing.zero_coupon import zcb_block
 
+        column = {T: i for i, T in enumerate(needed)}
+        P = zcb_block(DF, dt, needed)
+
+    if zcb_maturities:
         resp.zcb = []
-        for T in pr.zcb_maturities:
-            prices = zcb(rates, dt, T)
+        for T in zcb_maturities:
+            prices = P[:, column[T]]
+            analytic, reduction = None, None
+            if pr.control_variate:
+                analytic = float(simulation["analytic_zcb"](T))
+            if expected is not None:
+                # Maturities past the horizon are clamped the same way zcb_block clamps them
+                n_steps = min(int(T / dt), len(expected))
+                prices, reduction = control_variate(prices, -np.log(prices), expected_integral[n_steps])
             resp.zcb.append(
-                ZCBResult(maturity=T, mean_price=float(prices.mean()), std_price=float(prices.std()))
+                ZCBResult(
+                    maturity=T,
+                    mean_price=float(prices.mean()),
+                    std_price=float(prices.std()),
+                    std_error=float(prices.std() / np.sqrt(len(prices))),
+                    analytic_price=analytic,
+                    variance_reduction=reduction,
+                )
             )
 
-    if pr.forward_pairs:
+    if forward_pairs:
         from pricing.forwards import forward_rates
-        from pricing.zero_coupon import zcb
+
+        # All forwards at once from the gathered block
+        first = [column[T1] for T1, _ in forward_pairs]
+        second = [column[T2] for _, T2 in forward_pairs]
+        T1s, T2s = np.array(forward_pairs, dtype=float).T
+        fwd_block = forward_rates(P[:, first], P[:, second], T1s, T2s)
 
         resp.forwards = []
-        for T1, T2 in pr.forward_pairs:
-            P1 = zcb(rates, dt, T1)
-            P2 = zcb(rates, dt, T2)
-            fwds = forward_rates(P1, P2, T1, T2)
+        # No control variate here: per-path forwards are exactly the difference of
+        # the two path integrals, so regressing on those would just return their mean
+        for i, (T1, T2) in enumerate(forward_pairs):
+            fwds = fwd_block[:, i]
             resp.forwards.append(
-                ForwardResult(T1=T1, T2=T2, mean_forward=float(fwds.mean()), std_forward=float(fwds.std()))
+                ForwardResult(
+                    T1=T1,
+                    T2=T2,
+                    mean_forward=float(fwds.mean()),
+                    std_forward=float(fwds.std()),
+                    std_error=float(fwds.std() / np.sqrt(len(fwds))),
+                )
             )
 
     if pr.swap_maturities:
-        from pricing.swaps import par_swap_rate
+        from pricing.swaps import par_swap_rate, payment_schedule, swap_legs
 
         resp.swaps = []
         for mat in pr.swap_maturities:
-            payment_times = np.arange(pr.swap_frequency, mat + 1e-9, pr.swap_frequency).tolist()
-            rate = par_swap_rate(DF, payment_times, mat, dt)
+            payment_times = payment_schedule(mat, pr.swap_frequency)
+            if expected is None:
+                rate = par_swap_rate(DF, payment_times, mat, dt)
+            else:
+                # Each leg is corrected with the (weighted) path integrals behind its
+                # discount factors; DF[:, j] integrates r up to and including step j
+                floating, fixed = swap_legs(DF, payment_times, mat, dt)
+                payment_indices = (np.array(payment_times) / dt).astype(int)
+                maturity_index = int(mat / dt)
+                accruals = np.diff([0] + payment_times)
+
+                floating, _ = control_variate(
+                    floating, -np.log(DF[:, maturity_index]), expected_integral[maturity_index + 1]
+                )
+                fixed, _ = control_variate(
+                    fixed, -np.log(DF[:, payment_indices]) @ accruals, expected_integral[payment_indices + 1] @ accruals
+                )
+                rate = floating.mean() / fixed.mean()
             resp.swaps.append(SwapResult(maturity=mat, par_rate=float(rate)))
 
     return resp
 
 
+# Absolute bump sizes for the finite-difference sensitivities
+SENSITIVITY_BUMPS = {"r0": 1e-4, "sigma": 1e-4, "kappa": 1e-3, "alpha": 1e-3}
+POSITIVE_PARAMS = ("sigma", "kappa", "alpha")  # plus r0 for cir
+
+
+def _bumped_names(params: dict) -> list[str]:
+    return [name for name in SENSITIVITY_BUMPS if name in params]
+
+
+def _bump_points(model_name: str, params: dict) -> dict:
+    """(up, down) values per bumped parameter.
+
+    Central differences, except that a down bump which would reach zero on a
+    parameter that must stay positive is replaced by the unbumped value.
+    """
+    points = {}
+    for name in _bumped_names(params):
+        value, bump = params[name], SENSITIVITY_BUMPS[name]
+        positive = name in POSITIVE_PARAMS or (name == "r0" and model_name == "cir")
+        down = value if positive and value - bump <= 0 else value - bump
+        points[name] = (value + bump, down)
+    return points
+
+
+def _check_sensitivities(sim: SimulationRequest, pr: PricingRequest | None, streaming: bool = False):
+    if pr is None or not pr.sensitivities:
+        return
+    if streaming or _is_streaming(sim):
+        raise HTTPException(
+            status_code=422,
+            detail=f"sensitivities need an in-memory run (n_paths <= {MAX_IN_MEMORY_PATHS}, no chunk_size).",
+        )
+    if sim.model == "cir" and sim.scheme == "exact":
+        raise HTTPException(
+            status_code=422,
+            detail="sensitivities need shared shocks; cir's 'exact' scheme samples its transitions directly, use 'euler' or 'qe'.",
+        )
+
+
+def _instrument_values(resp: PricingResponse) -> np.ndarray:
+    return np.array(
+        [z.mean_price for z in resp.zcb or []]
+        + [f.mean_forward for f in resp.forwards or []]
+        + [s.par_rate for s in resp.swaps or []]
+    )
+
+
+def _add_sensitivities(resp: PricingResponse, model_name: str, params: dict, pr: PricingRequest) -> PricingResponse:
+    """Bump-and-revalue of every priced instrument, all bumps driven by the same shocks."""
+    points = _bump_points(model_name, params)
+    names = list(points)
+    bumped = [{**params, name: value} for name in names for value in points[name]]
+
+    plain = pr.model_copy(update={"sensitivities": False})
+    values = [None] * len(bumped)
+    for i, simulation in simulate_grid(model_name, bumped):
+        values[i] = _instrument_values(_price(simulation, plain))
+    slopes = {
+        name: (values[2 * i] - values[2 * i + 1]) / (points[name][0] - points[name][1])
+        for i, name in enumerate(names)
+    }
+    mean_reversion = slopes.get("kappa", slopes.get("alpha"))
+
+    results = (resp.zcb or []) + (resp.forwards or []) + (resp.swaps or [])
+    for i, result in enumerate(results):
+        result.sensitivities = Sensitivities(
+            delta=float(slopes["r0"][i]),
+            dv01=float(-slopes["r0"][i] * 1e-4),
+            vega=float(slopes["sigma"][i]),
+            mean_reversion=None if mean_reversion is None else float(mean_reversion[i]),
+        )
+    return resp
+
+
+def _price_in_memory(simulation: dict, model_name: str, params: dict, pr: PricingRequest) -> PricingResponse:
+    resp = _price(simulation, pr)
+    if pr.sensitivities:
+        _add_sensitivities(resp, model_name, params, pr)
+    return resp
+
+
+CACHE_HEADER = "X-Simulation-Cache"
+
+
+def _cache_key(req: SimulationRequest, params: dict) -> str | None:
+    engine = "parallel" if req.n_workers is not None else "serial"
+    return simulation_key(req.model, params, engine)
+
+
+def _simulate(req: SimulationRequest, params: dict) -> tuple[dict, str]:
+    """Run (or fetch from the cache) the in-memory simulation; also returns the cache status."""
+    key = _cache_key(req, params)
+
+    if key is not None:
+        simulation, status = simulation_cache.get(key)
+        if simulation is not None:
+            return simulation, status
+
+    if req.n_workers is not None:
+        simulation = simulate_rates_parallel(req.model, params, n_workers=req.n_workers)
+    else:
+        simulation = simulate_rates(req.model, params)
+
+    if key is not None:
+        simulation_cache.put(key, simulation)
+    return simulation, "miss" if key is not None else "bypass"
+
+
+def _is_streaming(req: SimulationRequest) -> bool:
+    if req.chunk_size is not None:
+        return True
+    # Parallel runs are meant for large simulations: they stay in memory while the paths fit
+    if req.n_workers is not None:
+        return not fits_in_memory(req.n_paths, int(req.T / req.dt))
+    return req.n_paths > MAX_IN_MEMORY_PATHS
+
+
+def _simulate_streaming(req: SimulationRequest, params: dict, pr: PricingRequest | None = None) -> dict:
+    # Chunked runs never materialise the paths, so there is nothing to cache
+    return simulate_streaming(
+        req.model,
+        params,
+        pricing=pr,
+        chunk_size=req.chunk_size or DEFAULT_CHUNK_SIZE,
+        n_sample_paths=N_SAMPLE_PATHS,
+    )
+
+
+def _summarise_stream(result: dict, req: SimulationRequest) -> dict:
+    """Same summary as _summarise, from the chunked accumulators (percentiles are histogram estimates)."""
+    bands = result["percentiles"]
+
+    return {
+        "model": req.model,
+        "n_paths": result["n_paths_done"],
+        "n_steps": result["n_steps"],
+        "T": req.T,
+        "dt": req.dt,
+        "time_grid": result["time_grid"],
+        "mean_rate": result["mean_rate"],
+        **{f"percentile_{q}": bands[q] for q in PERCENTILES},
+        "sample_paths": result["sample_paths"],
+        "terminal_mean": result["terminal_mean"],
+        "terminal_std": result["terminal_std"],
+    }
+
+
+def _price_stream(result: dict, pr: PricingRequest) -> PricingResponse:
+    resp = PricingResponse()
+    root_n = np.sqrt(result["n_paths_done"])
+
+    if "zcb" in result:
+        resp.zcb = [
+            ZCBResult(maturity=T, mean_price=float(mean), std_price=float(std), std_error=float(std / root_n))
+            for T, mean, std in result["zcb"]
+        ]
+
+    if "forwards" in result:
+        resp.forwards = [
+            ForwardResult(
+                T1=T1, T2=T2, mean_forward=float(mean), std_forward=float(std), std_error=float(std / root_n)
+            )
+            for (T1, T2), mean, std in result["forwards"]
+        ]
+
+    if "swaps" in result:
+        resp.swaps = [SwapResult(maturity=mat, par_rate=float(rate)) for mat, rate in result["swaps"]]
+
+    return resp
+
+
+def _book_columns(book) -> dict:
+    """The book's numeric columns with the optional ones defaulted."""
+    n = len(book.instrument_type)
+    return {
+        "notional": book.notional,
+        "maturity": book.maturity,
+        "start": book.start if book.start is not None else [0.0] * n,
+        "rate": book.rate if book.rate is not None else [0.0] * n,
+        "frequency": book.frequency if book.frequency is not None else [0.5] * n,
+    }
+
+
+def _check_book(req: BookRequest):
+    """Validate the columnar book (the cashflow matrix itself is built on the workers)."""
+    n = len(req.book.instrument_type)
+    columns = _book_columns(req.book)
+
+    for name, values in columns.items():
+        if len(values) != n:
+            raise HTTPException(
+                status_code=422,
+                detail=f"book column '{name}' has {len(values)} entries, expected {n}.",
+            )
+    if n and max(columns["maturity"]) > req.simulation.T:
+        raise HTTPException(
+            status_code=422,
+            detail="book maturities must not exceed the simulation horizon T.",
+        )
+    if any(m < s for m, s in zip(columns["maturity"], columns["start"])):
+        raise HTTPException(status_code=422, detail="book maturities must not precede their start dates.")
+    if any(f <= 0 for f in columns["frequency"]):
+        raise HTTPException(status_code=422, detail="book frequencies must be positive.")
+
+
+def _book_response(book, dates, W, mean_discount) -> BookResponse:
+    from pricing.book import value_book
+
+    values = value_book(mean_discount, W)
+    types = np.array(book.instrument_type)
+
+    return BookResponse(
+        n_instruments=len(values),
+        n_cashflow_dates=len(dates),
+        values=values.tolist(),
+        total=float(values.sum()),
+        totals_by_type={t: float(values[types == t].sum()) for t in np.unique(types)},
+    )
+
+
+def _grid_params(req: ScenarioGridRequest) -> tuple[list[dict], list[dict]]:
+    """Validate the grid and build the model params of every scenario."""
+    sim = req.simulation
+    allowed = GRID_PARAMS[sim.model]
+
+    unknown = sorted(set(req.grid) - set(allowed))
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"{sim.model} grids can vary {', '.join(allowed)}; got {', '.join(unknown)}.",
+        )
+    if any(len(values) == 0 for values in req.grid.values()):
+        raise HTTPException(status_code=422, detail="every grid axis needs at least one value.")
+
+    # Sensitivities re-simulate every scenario twice per bumped parameter
+    n_scenarios = int(np.prod([len(values) for values in req.grid.values()]))
+    n_runs = n_scenarios
+    if req.pricing is not None and req.pricing.sensitivities:
+        n_runs *= 1 + 2 * len(_bumped_names(_build_model_params(sim)))
+    if n_runs > MAX_SCENARIOS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"grid needs {n_runs} simulations ({n_scenarios} scenarios with their sensitivity bumps), "
+            f"at most {MAX_SCENARIOS} are allowed.",
+        )
+    if sim.chunk_size is not None or sim.n_workers is not None or sim.n_paths > MAX_IN_MEMORY_PATHS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"scenario grids run in memory: n_paths <= {MAX_IN_MEMORY_PATHS}, no chunk_size or n_workers.",
+        )
+
+    scenarios = scenario_grid(req.grid)
+    return scenarios, [_build_model_params(sim.model_copy(update=scenario)) for scenario in scenarios]
+
+
+# ── jobs (run on the offload workers; arguments are validated beforehand) ──
+
+def _display(summary: dict, req: SimulationRequest) -> dict:
+    if req.max_points is None:
+        return summary
+    return downsample_summary(summary, req.max_points)
+
+
+def _simulation_job(req: SimulationRequest, params: dict):
+    if _is_streaming(req):
+        return _display(_summarise_stream(_simulate_streaming(req, params), req), req), "bypass"
+    simulation, status = _simulate(req, params)
+    return _display(_summarise(simulation, req), req), status
+
+
+def _pricing_job(req: SimulateAndPriceRequest, params: dict):
+    if _is_streaming(req.simulation):
+        return _price_stream(_simulate_streaming(req.simulation, params, req.pricing), req.pricing), "bypass"
+    simulation, status = _simulate(req.simulation, params)
+    return _price_in_memory(simulation, req.simulation.model, params, req.pricing), status
+
+
+def _simulate_and_price_job(req: SimulateAndPriceRequest, params: dict):
+    if _is_streaming(req.simulation):
+        result = _simulate_streaming(req.simulation, params, req.pricing)
+        summary = _summarise_stream(result, req.simulation)
+        return (_display(summary, req.simulation), _price_stream(result, req.pricing)), "bypass"
+    simulation, status = _simulate(req.simulation, params)
+    summary = _display(_summarise(simulation, req.simulation), req.simulation)
+    return (summary, _price_in_memory(simulation, req.simulation.model, params, req.pricing)), status
+
+
+def _grid_job(req: ScenarioGridRequest, scenarios: list[dict], scenario_params: list[dict]):
+    model_name = req.simulation.model
+    results = [None] * len(scenarios)
+    for i, simulation in simulate_grid(model_name, scenario_params):
+        summary = _display(_summarise(simulation, req.simulation), req.simulation)
+        results[i] = ScenarioResult(
+            params=scenarios[i],
+            simulation=_simulation_response(summary),
+            pricing=_price_in_memory(simulation, model_name, scenario_params[i], req.pricing) if req.pricing is not None else None,
+        )
+    return ScenarioGridResponse(n_scenarios=len(results), scenarios=results), "bypass"
+
+
+def _price_book_job(req: BookRequest, params: dict):
+    from pricing.book import cashflow_matrix, mean_discount
+
+    dates, W = cashflow_matrix(req.book.instrument_type, **_book_columns(req.book))
+
+    if _is_streaming(req.simulation):
+        result = simulate_streaming(
+            req.simulation.model,
+            params,
+            chunk_size=req.simulation.chunk_size or DEFAULT_CHUNK_SIZE,
+            n_sample_paths=0,
+            discount_dates=dates,
+        )
+        return _book_response(req.book, dates, W, result["mean_discount"]), "bypass"
+
+    simulation, status = _simulate(req.simulation, params)
+    dt = simulation["time_grid"][1] - simulation["time_grid"][0]
+    P = mean_discount(simulation["discount_factors"], dt, dates)
+    return _book_response(req.book, dates, W, P), status
+
+
+def _runs_locally(req: SimulationRequest) -> bool:
+    """In-memory n_workers runs fan out to the shared parallel pool from this process, not a worker."""
+    return req.n_workers is not None and not _is_streaming(req)
+
+
+async def _offload(job, sim_req: SimulationRequest, params: dict, response: Response, *args):
+    """Run a job on the worker pool (sharded by cache key) and report the cache status."""
+    shard_key = None if _is_streaming(sim_req) else _cache_key(sim_req, params)
+    result, status = await offloader.run(job, *args, shard_key=shard_key, local=_runs_locally(sim_req))
+    response.headers[CACHE_HEADER] = status
+    return result
+
+
+def _background_job(req: SimulateAndPriceRequest, params: dict, progress) -> dict:
+    """Body of a /jobs run, driven from a job thread with the simulation work on the offload workers.
+
+    Chunked runs are offloaded chunk by chunk and folded here, reporting progress
+    (and honouring cancellation) after each one; in-memory runs are one offloaded call.
+    """
+    if _is_streaming(req.simulation):
+        run = StreamingRun(
+            req.simulation.model,
+            params,
+            pricing=req.pricing,
+            chunk_size=req.simulation.chunk_size or DEFAULT_CHUNK_SIZE,
+            n_sample_paths=N_SAMPLE_PATHS,
+        )
+        for n_done in run.chunks(simulate=partial(offloader.call, simulate_rates)):
+            progress(n_done / run.n_paths)
+        result = run.result()
+        summary = _display(_summarise_stream(result, req.simulation), req.simulation)
+        pricing = _price_stream(result, req.pricing)
+    else:
+        shard_key = _cache_key(req.simulation, params)
+        (summary, pricing), _ = offloader.call(
+            _simulate_and_price_job, req, params, shard_key=shard_key, local=_runs_locally(req.simulation)
+        )
+
+    return SimulateAndPriceResponse(simulation=_simulation_response(summary), pricing=pricing).model_dump()
+
+
+def _advance(run: StreamingRun, chunks):
+    """Simulate the next chunk; the running result, or None once every chunk is done."""
+    if next(chunks, None) is None:
+        return None
+    return run.result()
+
+
+PROGRESS_POINTS = 200  # plotted points per progress line when the request sets no max_points
+
+
+def _progress_bands(result: dict, req: SimulationRequest) -> dict:
+    """Downsampled mean and percentile bands of a running result."""
+    bands = result["percentiles"]
+    rows = np.stack([result["mean_rate"], *(bands[q] for q in PERCENTILES)])
+    time_grid, rows = minmax_buckets(result["time_grid"], rows, req.max_points or PROGRESS_POINTS)
+    return {"time_grid": time_grid.tolist(), **{name: row.tolist() for name, row in zip(SERIES, rows)}}
+
+
+async def _progress_lines(run: StreamingRun, req: SimulateAndPriceRequest):
+    """NDJSON progress lines after each chunk, then the full response.
+
+    Progress lines carry the running prices and downsampled bands only. Chunks
+    are simulated one at a time on the thread pool, so a client that disconnects
+    stops the simulation at the next chunk boundary. The slot is taken here, once
+    the response is being sent, so a stream that never starts cannot leak it.
+    """
+    try:
+        offloader.acquire(stream=True)
+    except HTTPException as exc:
+        yield json.dumps({"event": "error", "status": exc.status_code, "detail": exc.detail}) + "\n"
+        return
+
+    try:
+        chunks = run.chunks()
+        while (result := await run_in_threadpool(_advance, run, chunks)) is not None:
+            pricing = _price_stream(result, req.pricing)
+            if result["n_paths_done"] < run.n_paths:
+                message = {
+                    "event": "progress",
+                    "n_paths_done": result["n_paths_done"],
+                    "bands": _progress_bands(result, req.simulation),
+                    "pricing": pricing.model_dump(),
+                }
+            else:
+                summary = _display(_summarise_stream(result, req.simulation), req.simulation)
+                response = SimulateAndPriceResponse(simulation=_simulation_response(summary), pricing=pricing)
+                message = {"event": "result", **response.model_dump()}
+            yield json.dumps({"n_paths": run.n_paths, **message}) + "\n"
+    finally:
+        offloader.release(stream=True)
+
+
 # ── routes ───────────────────────────────────────────────────────────────
 
 @app.post("/simulate", response_model=SimulationResponse)
-def run_simulation(req: SimulationRequest):
-    """Run a short-rate Monte-Carlo simulation and return summary statistics."""
+async def run_simulation(req: SimulationRequest, response: Response, accept: str | None = Header(None)):
+    """Run a short-rate Monte-Carlo simulation and return summary statistics.
+
+    JSON by default; Arrow stream or msgpack when requested via Accept.
+    """
     params = _build_model_params(req)
-    simulation = simulate_rates(req.model, params)
-    return _summarise(simulation, req)
+    summary = await _offload(_simulation_job, req, params, response, req, params)
+
+    media_type = negotiate(accept)
+    if media_type is not None:
+        return _binary_response(summary, media_type, response)
+    return _simulation_response(summary)
 
 
 @app.post("/price", response_model=PricingResponse)
-def run_pricing(req: SimulateAndPriceRequest):
+async def run_pricing(req: SimulateAndPriceRequest, response: Response):
     """Simulate then price instruments in a single request."""
     params = _build_model_params(req.simulation)
-    simulation = simulate_rates(req.simulation.model, params)
-    return _price(simulation, req.pricing)
+    _check_sensitivities(req.simulation, req.pricing)
+    return await _offload(_pricing_job, req.simulation, params, response, req, params)
 
 
 @app.post("/simulate-and-price", response_model=SimulateAndPriceResponse)
-def simulate_and_price(req: SimulateAndPriceRequest):
+async def simulate_and_price(req: SimulateAndPriceRequest, response: Response, accept: str | None = Header(None)):
     """Full pipeline: simulate → summarise → price → return everything."""
     params = _build_model_params(req.simulation)
-    simulation = simulate_rates(req.simulation.model, params)
-    return SimulateAndPriceResponse(
-        simulation=_summarise(simulation, req.simulation),
-        pricing=_price(simulation, req.pricing),
+    _check_sensitivities(req.simulation, req.pricing)
+    summary, pricing = await _offload(_simulate_and_price_job, req.simulation, params, response, req, params)
+
+    media_type = negotiate(accept)
+    if media_type is not None:
+        return _binary_response(summary, media_type, response, pricing)
+    return SimulateAndPriceResponse(simulation=_simulation_response(summary), pricing=pricing)
+
+
+@app.post("/simulate-and-price/stream")
+async def simulate_and_price_stream(req: SimulateAndPriceRequest):
+    """Progressive /simulate-and-price, one NDJSON line per finished chunk of paths.
+
+    Progress lines are {"event": "progress", "n_paths", "n_paths_done", "bands",
+    "pricing"} with bands downsampled to max_points (default 200). The last line,
+    {"event": "result", "n_paths", "simulation", "pricing"}, matches /simulate-and-price.
+    A full queue after the response has started gives a single "error" line.
+    """
+    params = _build_model_params(req.simulation)
+    _check_sensitivities(req.simulation, req.pricing, streaming=True)
+    run = StreamingRun(
+        req.simulation.model,
+        params,
+        pricing=req.pricing,
+        chunk_size=req.simulation.chunk_size or DEFAULT_CHUNK_SIZE,
+        n_sample_paths=N_SAMPLE_PATHS,
+    )
+
+    offloader.check(stream=True)
+    return StreamingResponse(_progress_lines(run, req), media_type="application/x-ndjson")
+
+
+@app.post("/price-book", response_model=BookResponse)
+async def price_book(req: BookRequest, response: Response):
+    """Value a columnar book of ZCBs, bonds, FRAs and swaps with one matrix product."""
+    params = _build_model_params(req.simulation)
+    _check_book(req)
+    return await _offload(_price_book_job, req.simulation, params, response, req, params)
+
+
+@app.post("/simulate-grid", response_model=ScenarioGridResponse)
+async def simulate_grid_route(req: ScenarioGridRequest, response: Response):
+    """Simulate (and optionally price) every scenario of a parameter grid on common random numbers."""
+    scenarios, scenario_params = _grid_params(req)
+    _check_sensitivities(req.simulation, req.pricing)
+    return await _offload(_grid_job, req.simulation, scenario_params[0], response, req, scenarios, scenario_params)
+
+
+@app.post("/jobs", response_model=JobStatus, status_code=202)
+def submit_job(req: SimulateAndPriceRequest):
+    """Queue a /simulate-and-price run in the background and return its job id."""
+    params = _build_model_params(req.simulation)
+    _check_sensitivities(req.simulation, req.pricing)
+    job_id = job_manager.submit(_background_job, req, params)
+    return job_manager.status(job_id)
+
+
+@app.get("/jobs/{job_id}", response_model=JobStatus)
+def job_status(job_id: str):
+    return job_manager.status(job_id)
+
+
+@app.get("/jobs/{job_id}/result", response_model=SimulateAndPriceResponse)
+def job_result(job_id: str):
+    job = job_manager.status(job_id, with_result=True)
+    if job["status"] != "done":
+        raise HTTPException(status_code=409, detail=f"Job '{job_id}' is {job['status']}, not done.")
+    return job["result"]
+
+
+@app.delete("/jobs/{job_id}", response_model=JobStatus)
+def cancel_job(job_id: str):
+    """Cancel a queued job, or stop a running chunked job after its current chunk."""
+    return job_manager.cancel(job_id)
+
+
+@app.get("/calibration/{model}", response_model=CalibrationResponse)
+def calibration(model: str, as_of: date | None = None):
+    """Rolling MLE parameters for vasicek or cir from the window ending on or before as_of (default: latest)."""
+    from models.calibration import MODELS, calibrated_params
+
+    if model not in MODELS:
+        raise HTTPException(status_code=404, detail=f"No calibration for '{model}'; available: {', '.join(MODELS)}.")
+    try:
+        end = None if as_of is None else pd.Timestamp(as_of)
+    except pd.errors.OutOfBoundsDatetime:
+        raise HTTPException(status_code=422, detail=f"as_of {as_of} is outside the supported date range.")
+
+    params = calibrated_params(model, end)
+    if params is None:
+        raise HTTPException(status_code=404, detail=f"No calibration window ends on or before {as_of}.")
+
+    return CalibrationResponse(
+        model=model,
+        as_of=params.pop("as_of").isoformat(),
+        **{k: (v if np.isfinite(v) else None) for k, v in params.items()},
     )
 
 
 @app.get("/health")
 def health():
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok", "in_flight": offloader.in_flight, "jobs_in_flight": job_manager.in_flight}
@@ -0,0 +1,151 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from models.market_data import calibration_provider
+from utils.local_store import local_store
+
+# Rolling calibration of the mean-reverting short-rate models over the whole
+# history of yield_curve_data. Every window is fitted at once from running sums
+# (one cumsum per statistic, differenced `window` rows apart), so there is no
+# Python loop over windows.
+#
+#   vasicek  exact AR(1) MLE: r(t+1) = a + b*r(t) + e, kappa = -log(b)/dt,
+#            theta = a/(1-b), sigma^2 = var(e) * 2*kappa/(1-b^2)
+#   cir      least squares on the Euler transition scaled by sqrt(r(t)):
+#            dr/sqrt(r) = kappa*theta*dt/sqrt(r) - kappa*dt*sqrt(r) + sigma*sqrt(dt)*e
+#
+# Parameters are in the units of the rate column, like the other defaults.
+# Windows where a model does not mean-revert (b outside (0, 1)) give NaN.
+# Results are stored in the local store as the "calibration" table, indexed by
+# the last date of each window, and refitted whenever the yield data moves on.
+
+TABLE = "calibration"
+SHORT_RATE = "fed_funds"
+WINDOW_YEARS = float(os.getenv("CALIBRATION_WINDOW_YEARS", 5))
+DAYS_PER_YEAR = 365  # yield_curve_data has one (forward-filled) row per calendar day
+
+MODELS = ("vasicek", "cir")
+PARAMS = ("kappa", "theta", "sigma")
+
+
+def _rolling_sum(values, window):
+    running = np.concatenate(([0.0], np.cumsum(values)))
+    return running[window:] - running[:-window]
+
+
+def _row_dt(dates) -> float:
+    """Year fraction between consecutive rows (median spacing)."""
+    step = np.median(np.diff(dates.values.astype("datetime64[s]")).astype(float))
+    return step / (DAYS_PER_YEAR * 86_400)
+
+
+def vasicek_mle(rates, dt, window) -> dict:
+    """Closed-form AR(1) MLE of (kappa, theta, sigma) for every window of transitions."""
+    # Centre first so the second-moment differences do not cancel catastrophically
+    centre = np.nanmean(rates)
+    x, y = rates[:-1] - centre, rates[1:] - centre
+    valid = np.isfinite(x) & np.isfinite(y)
+    x, y = np.where(valid, x, 0.0), np.where(valid, y, 0.0)
+
+    n = _rolling_sum(valid.astype(float), window)
+    sx, sy = _rolling_sum(x, window), _rolling_sum(y, window)
+    sxx, sxy, syy = _rolling_sum(x * x, window), _rolling_sum(x * y, window), _rolling_sum(y * y, window)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        b = (n * sxy - sx * sy) / (n * sxx - sx**2)
+        a = (sy - b * sx) / n
+        residual = (syy - 2 * a * sy - 2 * b * sxy + n * a**2 + 2 * a * b * sx + b**2 * sxx) / n
+
+        b = np.where((b > 0) & (b < 1), b, np.nan)
+        kappa = -np.log(b) / dt
+        theta = centre + a / (1 - b)
+        sigma = np.sqrt(np.maximum(residual, 0.0) * 2 * kappa / (1 - b**2))
+
+    return {"kappa": kappa, "theta": theta, "sigma": sigma}
+
+
+def cir_estimates(rates, dt, window) -> dict:
+    """Least-squares (kappa, theta, sigma) of the square-root transition for every window."""
+    x, step = rates[:-1], np.diff(rates)
+    valid = np.isfinite(x) & np.isfinite(step) & (x > 0)
+    x, step = np.where(valid, x, 1.0), np.where(valid, step, 0.0)
+    w = valid.astype(float)
+
+    n = _rolling_sum(w, window)
+    s11 = _rolling_sum(w / x, window)
+    s22 = _rolling_sum(w * x, window)
+    s1y = _rolling_sum(step / x, window)
+    s2y = _rolling_sum(step, window)
+    syy = _rolling_sum(step**2 / x, window)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        det = s11 * s22 - n**2
+        c1 = (s22 * s1y - n * s2y) / det  # kappa * theta * dt
+        c2 = (s11 * s2y - n * s1y) / det  # -kappa * dt
+        residual = syy - c1 * s1y - c2 * s2y
+
+        kappa = np.where(c2 < 0, -c2 / dt, np.nan)
+        theta = -c1 / c2
+        sigma = np.sqrt(np.maximum(residual, 0.0) / (n * dt))
+
+    # Windows without mean reversion have no meaningful theta or sigma either
+    fitted = np.isfinite(kappa)
+    return {"kappa": kappa, "theta": np.where(fitted, theta, np.nan), "sigma": np.where(fitted, sigma, np.nan)}
+
+
+def calibrate_history(df: pd.DataFrame, column=SHORT_RATE, window_years=WINDOW_YEARS) -> pd.DataFrame:
+    """Rolling Vasicek and CIR parameters for every date with a full window behind it."""
+    rates = df[column].to_numpy(dtype=float)
+    dt = _row_dt(df.index)
+    window = int(round(window_years / dt))
+    if len(rates) <= window:
+        return pd.DataFrame(columns=[f"{m}_{p}" for m in MODELS for p in PARAMS] + ["r0"])
+
+    fits = {"vasicek": vasicek_mle(rates, dt, window), "cir": cir_estimates(rates, dt, window)}
+
+    out = pd.DataFrame(
+        {f"{model}_{name}": fits[model][name] for model in MODELS for name in PARAMS},
+        index=df.index[window:],
+    )
+    out["r0"] = rates[window:]
+    return out
+
+
+_lock = threading.Lock()
+
+
+def _ensure_current():
+    """Refit and store the calibration table if it is missing or behind the yield data."""
+    latest = calibration_provider.frame().index[-1]
+    stored = local_store.max_date(TABLE)
+    if stored is not None and stored >= latest:
+        return
+
+    with _lock:
+        stored = local_store.max_date(TABLE)
+        if stored is None or stored < latest:
+            local_store.write_frame(TABLE, calibrate_history(calibration_provider.frame()))
+
+
+def calibrated_params(model: str, as_of=None) -> dict | None:
+    """Parameters from the last window ending on or before `as_of` (default: latest)."""
+    _ensure_current()
+
+    columns = [f"{model}_{name}" for name in PARAMS] + ["r0"]
+    data = local_store.read(TABLE, columns, end=as_of)
+    if len(data["date"]) == 0:
+        return None
+
+    params = {name: float(data[f"{model}_{name}"][-1]) for name in PARAMS}
+    params["r0"] = float(data["r0"][-1])
+    params["as_of"] = pd.Timestamp(data["date"][-1])
+    return params
+
+
+if __name__ == "__main__":
+    history = calibrate_history(calibration_provider.frame())
+    local_store.write_frame(TABLE, history)
+    print(history.tail())
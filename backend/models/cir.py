@@ -1,41 +1,45 @@
-import pandas as pd
-import os
-from dotenv import load_dotenv
-from supabase import create_client
 import numpy as np
-import matplotlib.pyplot as plt
+from scipy.special import ndtr
 
-# Initialising Supabase HTTPS connection
-load_dotenv()
+from models.market_data import calibration_provider
+from models.shocks import make_rng, normal_shocks
 
-HOST = os.getenv("SUPABASE_HOST")
-KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+# Exact transition: r(t+dt) = c * noncentral chi-square(df, r(t) * e^(-kappa*dt) / c)
+def _exact_step(rt, kappa, theta, sigma, dt, rng):
+    decay = np.exp(-kappa * dt)
+    c = sigma**2 * (1 - decay) / (4 * kappa)
+    df = 4 * kappa * theta / sigma**2
 
-supabase = create_client(f"https://{HOST}", KEY)
+    return c * rng.noncentral_chisquare(df, rt * decay / c)
 
-# Selecting table
-rows = []
-offset = 0
-page_size = 1000
 
-while True:
-    response = supabase.table("yield_curve_data").select("*").range(offset, offset + page_size - 1).execute()
-    if not response.data:
-        break
-    rows.extend(response.data)
-    offset += page_size
-df = pd.DataFrame(rows)
+# Andersen's quadratic-exponential step, driven by the pre-drawn normal shocks
+def _qe_step(rt, kappa, theta, sigma, dt, z, psi_c=1.5):
+    decay = np.exp(-kappa * dt)
+    m = theta + (rt - theta) * decay
+    s2 = rt * sigma**2 * decay * (1 - decay) / kappa + theta * sigma**2 * (1 - decay) ** 2 / (2 * kappa)
+    psi = s2 / m**2
 
-df.set_index("date", inplace=True)
-df = df.sort_index()
+    out = np.empty_like(rt)
 
-# Assigning parameters for Vasicek mode
-r0 = df['fed_funds'].iloc[-1] # Short Rate
-theta = df['y_10y'].tail(252).mean() # 10Y Treasury Yield Annual Trading Day Average
-sigma = (df['fed_funds'].diff().dropna().std()) * np.sqrt(252) # Annual Trading Day Interest Rate Volatility
-kappa = 0.3 # Mean Reversion Speed
+    # Low variance: moment-matched squared Gaussian
+    quad = psi <= psi_c
+    inv = 2 / psi[quad]
+    b2 = inv - 1 + np.sqrt(inv) * np.sqrt(inv - 1)
+    a = m[quad] / (1 + b2)
+    out[quad] = a * (np.sqrt(b2) + z[quad]) ** 2
 
-# Simulating Vasicek Paths
+    # High variance: point mass at zero plus an exponential tail
+    tail = ~quad
+    p = (psi[tail] - 1) / (psi[tail] + 1)
+    beta = (1 - p) / m[tail]
+    u = ndtr(z[tail])
+    out[tail] = np.where(u <= p, 0.0, np.log((1 - p) / np.maximum(1 - u, 1e-300)) / beta)
+
+    return out
+
+
+# Simulating CIR Paths
 def simulate_cir(
         r0: float,
         kappa: float,
@@ -45,10 +49,11 @@ def simulate_cir(
         dt: float,
         n_paths: int,
         seed: int | None = None,
+        sampling: str = "pseudo",
+        scheme: str = "euler",
 ):
     
-    if seed is not None:
-        np.random.seed(seed)
+    rng = make_rng(seed)
 
     n_steps = int(T / dt)
 
@@ -56,8 +61,19 @@ def simulate_cir(
     rates = np.zeros((n_paths, n_steps + 1))
     rates[:, 0] = r0
 
+    if scheme == "exact":
+        # Loop over steps only; each step is one vectorised draw across paths
+        for t in range(n_steps):
+            rates[:, t + 1] = _exact_step(rates[:, t], kappa, theta, sigma, dt, rng)
+        return rates
+
     # Random shocks
-    Z = np.random.normal(0.0, 1.0, size=(n_paths, n_steps))
+    Z = normal_shocks(n_paths, n_steps, rng, sampling)
+
+    if scheme == "qe":
+        for t in range(n_steps):
+            rates[:, t + 1] = _qe_step(rates[:, t], kappa, theta, sigma, dt, Z[:, t])
+        return rates
 
     for t in range(n_steps):
         rt = np.maximum(rates[:, t], 0.0)
@@ -67,17 +83,22 @@ def simulate_cir(
 
         rates[:, t + 1] = rt + drift + diffusion
 
-    return rates 
+    return rates
+
+
+if __name__ == "__main__":
+    # Demo run calibrated to the latest Supabase data
+    defaults = calibration_provider.defaults()
 
-rates = simulate_cir(
-    r0=r0,
-    kappa=kappa,
-    theta=theta,
-    sigma=sigma,
-    T=5,
-    dt=1/252,
-    n_paths=50,
-    seed=42
-)
+    rates = simulate_cir(
+        r0=defaults["r0"],
+        kappa=defaults["kappa"],
+        theta=defaults["theta"],
+        sigma=defaults["sigma"],
+        T=5,
+        dt=1/252,
+        n_paths=50,
+        seed=42
+    )
 
-time = np.linspace(0, 5, rates.shape[1])
\ No newline at end of file
+    time = np.linspace(0, 5, rates.shape[1])
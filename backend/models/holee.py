@@ -1,55 +1,19 @@
-import pandas as pd
-import os
-from dotenv import load_dotenv
-from supabase import create_client
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.interpolate import interp1d, CubicSpline
-
-# Initialising Supabase HTTPS connection
-load_dotenv()
-
-HOST = os.getenv("SUPABASE_HOST")
-KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-
-supabase = create_client(f"https://{HOST}", KEY)
-
-# Selecting table
-rows = []
-offset = 0
-page_size = 1000
-
-while True:
-    response = supabase.table("yield_curve_data").select("*").range(offset, offset + page_size - 1).execute()
-    if not response.data:
-        break
-    rows.extend(response.data)
-    offset += page_size
-df = pd.DataFrame(rows)
-
-df.set_index("date", inplace=True)
-df = df.sort_index()
-
-# Assigning parameters for Hull-White model
-r0 = df['fed_funds'].iloc[-1] # Short Rate
-sigma = 0.1
-
-# Hull-White estimates drift using today's yield curve
-maturities = np.array([0.25, 0.5, 1, 2, 3, 5, 7, 10, 20, 30])
-zero_rates = np.array([
-    df['y_3m'].iloc[-1],
-    df['y_6m'].iloc[-1],
-    df['y_1y'].iloc[-1],
-    df['y_2y'].iloc[-1],
-    df['y_3y'].iloc[-1],
-    df['y_5y'].iloc[-1],
-    df['y_7y'].iloc[-1],
-    df['y_10y'].iloc[-1],
-    df['y_20y'].iloc[-1],
-    df['y_30y'].iloc[-1],
-])
-
-yield_curve = (maturities, zero_rates)
+
+from models.market_data import calibration_provider
+from models.shocks import make_rng, normal_shocks
+from models.yield_curve import yield_curve
+
+
+# Cumulative theta drift on the simulation grid, starting at 0 (theta = df/dt)
+def _cumulative_drift(maturities, zero_rates, T, dt):
+    n_steps = int(T / dt)
+    time_grid = np.linspace(0, T, n_steps + 1)
+
+    theta_t = yield_curve(maturities, zero_rates).dforward(time_grid[:-1])
+
+    return np.concatenate(([0.0], np.cumsum(theta_t * dt)))
+
 
 def simulate_ho_lee(
     r0,
@@ -59,58 +23,59 @@ def simulate_ho_lee(
     T,
     dt,
     n_paths,
-    seed=None
+    seed=None,
+    sampling="pseudo",
+    return_integral=False
 ):
-    if seed is not None:
-        np.random.seed(seed)
+    rng = make_rng(seed)
 
     n_steps = int(T / dt)
-    time_grid = np.linspace(0, T, n_steps + 1)
-
-    # Allocating array
-    rates = np.zeros((n_paths, n_steps + 1))
-    rates[:, 0] = r0
 
     # Random shocks
-    Z = np.random.normal(0, 1, size=(n_paths, n_steps))
+    Z = normal_shocks(n_paths, n_steps, rng, sampling)
 
-    # Discount factors from zero rates to translate yields into bond prices
-    discount_factors = np.exp(-zero_rates * maturities)
+    # Additive dynamics: r(t) = r0 + sum of theta drifts + sigma*sqrt(dt) * sum of shocks,
+    # so the whole path matrix is two cumulative sums instead of a per-step loop
+    drift = _cumulative_drift(maturities, zero_rates, T, dt)
 
-    # Instantaneous forward rates f(0,t)
-    log_df = np.log(discount_factors)
-    fwd_rates = -np.gradient(log_df, maturities)
+    rates = np.empty((n_paths, n_steps + 1))
+    rates[:, 0] = 0.0
+    np.cumsum(Z, axis=1, out=rates[:, 1:])
+    rates *= sigma * np.sqrt(dt)
 
-    # Time derivative of forward rates
-    theta_t = np.gradient(fwd_rates, maturities)
+    if return_integral:
+        # Running integral of r up to and including each step (same convention as
+        # simulate_rates), built from the cumulative shocks plus a 1-D drift term
+        steps = np.arange(n_steps + 1)
+        integral = np.cumsum(rates, axis=1)
+        integral += (steps + 1) * r0 + np.cumsum(drift)
+        integral *= dt
 
-    # Interpolating theta t to align with simulation grid
-    theta_fn = interp1d(
-    maturities,
-    theta_t,
-    kind="linear",
-    fill_value="extrapolate")
+    rates += r0 + drift
 
-    # Euler simulation for short-rate paths
-    for t in range(n_steps):
-        rt = rates[:, t]
+    if return_integral:
+        return rates, integral
+    return rates
 
-        drift = theta_fn(time_grid[t]) * dt
-        diffusion = sigma * np.sqrt(dt) * Z[:, t]
 
-        rates[:, t + 1] = rt + drift + diffusion
+# Exact mean of the simulated rates on the grid
+def expected_ho_lee(r0, sigma, maturities, zero_rates, T, dt, **_):
+    return r0 + _cumulative_drift(maturities, zero_rates, T, dt)
 
-    return rates
 
-rates = simulate_ho_lee(
-    r0=r0,
-    sigma=sigma,
-    maturities=maturities,
-    zero_rates=zero_rates,
-    T=5.0,
-    dt=1/252,
-    n_paths=50,
-    seed=42
-)
-
-time = np.linspace(0, 5, rates.shape[1])
\ No newline at end of file
+if __name__ == "__main__":
+    # Demo run fitted to today's yield curve
+    defaults = calibration_provider.defaults()
+
+    rates = simulate_ho_lee(
+        r0=defaults["r0"],
+        sigma=defaults["curve_sigma"],
+        maturities=defaults["maturities"],
+        zero_rates=defaults["zero_rates"],
+        T=5.0,
+        dt=1/252,
+        n_paths=50,
+        seed=42
+    )
+
+    time = np.linspace(0, 5, rates.shape[1])
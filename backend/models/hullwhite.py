@@ -1,56 +1,34 @@
-import pandas as pd
-import os
-from dotenv import load_dotenv
-from supabase import create_client
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.interpolate import interp1d, CubicSpline
-
-# Initialising Supabase HTTPS connection
-load_dotenv()
-
-HOST = os.getenv("SUPABASE_HOST")
-KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-
-supabase = create_client(f"https://{HOST}", KEY)
-
-# Selecting table
-rows = []
-offset = 0
-page_size = 1000
-
-while True:
-    response = supabase.table("yield_curve_data").select("*").range(offset, offset + page_size - 1).execute()
-    if not response.data:
-        break
-    rows.extend(response.data)
-    offset += page_size
-df = pd.DataFrame(rows)
-
-df.set_index("date", inplace=True)
-df = df.sort_index()
-
-# Assigning parameters for Hull-White model
-r0 = df['fed_funds'].iloc[-1] # Short Rate
-alpha = 0.05 # Mean Reversion Speed
-sigma = 0.1
-
-# Hull-White estimates drift using today's yield curve
-maturities = np.array([0.25, 0.5, 1, 2, 3, 5, 7, 10, 20, 30])
-zero_rates = np.array([
-    df['y_3m'].iloc[-1],
-    df['y_6m'].iloc[-1],
-    df['y_1y'].iloc[-1],
-    df['y_2y'].iloc[-1],
-    df['y_3y'].iloc[-1],
-    df['y_5y'].iloc[-1],
-    df['y_7y'].iloc[-1],
-    df['y_10y'].iloc[-1],
-    df['y_20y'].iloc[-1],
-    df['y_30y'].iloc[-1],
-])
-
-yield_curve = (maturities, zero_rates)
+
+from models.market_data import calibration_provider
+from models.shocks import make_rng, normal_shocks
+from models.recursion import ar1_paths
+from models.yield_curve import yield_curve
+
+
+# AR(1) coefficients on the simulation grid: r(t+1) = decay * r(t) + drift(t) + scale * Z(t)
+def _ar1_coefficients(alpha, sigma, maturities, zero_rates, T, dt, scheme):
+    n_steps = int(T / dt)
+    time_grid = np.linspace(0, T, n_steps + 1)
+    curve = yield_curve(maturities, zero_rates)
+
+    # theta(t) = df/dt + alpha * f + sigma^2 / (2 alpha) * (1 - e^(-2 alpha t)), straight off the curve
+    def theta(t):
+        return curve.dforward(t) + alpha * curve.forward(t) + (sigma**2 / (2 * alpha)) * (1 - np.exp(-2 * alpha * t))
+
+    if scheme == "exact":
+        # Exact OU transition with theta held at each step's midpoint
+        decay = np.exp(-alpha * dt)
+        drift = theta(time_grid[:-1] + dt / 2) * (1 - decay) / alpha
+        scale = sigma * np.sqrt((1 - decay**2) / (2 * alpha))
+    else:
+        # Euler, with theta evaluated on the whole grid in one call
+        decay = 1 - alpha * dt
+        drift = theta(time_grid[:-1]) * dt
+        scale = sigma * np.sqrt(dt)
+
+    return decay, drift, scale
+
 
 def simulate_hull_white(
     r0,
@@ -61,62 +39,49 @@ def simulate_hull_white(
     T,
     dt,
     n_paths,
-    seed=None
+    seed=None,
+    sampling="pseudo",
+    scheme="euler"
 ):
-    if seed is not None:
-        np.random.seed(seed)
+    rng = make_rng(seed)
 
     n_steps = int(T / dt)
-    time_grid = np.linspace(0, T, n_steps + 1)
-
-    # Allocating array
-    rates = np.zeros((n_paths, n_steps + 1))
-    rates[:, 0] = r0
 
     # Random shocks
-    Z = np.random.normal(0, 1, size=(n_paths, n_steps))
+    Z = normal_shocks(n_paths, n_steps, rng, sampling)
 
-    # Discount factors from zero rates to translate yields into bond prices
-    discount_factors = np.exp(-zero_rates * maturities)
+    decay, drift, scale = _ar1_coefficients(alpha, sigma, maturities, zero_rates, T, dt, scheme)
 
-    # Instantaneous forward rates f(0,t)
-    log_df = np.log(discount_factors)
-    fwd_rates = -np.gradient(log_df, maturities)
+    innovations = scale * Z
+    innovations += drift
 
-    # Time derivative of forward rates
-    dfdt = np.gradient(fwd_rates, maturities)
+    # Recursion run as a filter rather than a per-step loop
+    rates = ar1_paths(r0, decay, innovations)
 
-    # Finding the drift 
-    theta_t = dfdt + alpha * fwd_rates + (sigma**2 / (2 * alpha)) * (1 - np.exp(-2 * alpha * maturities))
+    return rates
 
-    # Interpolating theta t to align with simulation grid
-    theta_fn = interp1d(
-    maturities,
-    theta_t,
-    kind="cubic",
-    fill_value="extrapolate")
 
-    # Euler simulation for short-rate paths
-    for t in range(n_steps):
-        rt = rates[:, t]
+# Exact mean of the simulated rates on the grid (the shock-free recursion)
+def expected_hull_white(r0, alpha, sigma, maturities, zero_rates, T, dt, scheme="euler", **_):
+    decay, drift, _scale = _ar1_coefficients(alpha, sigma, maturities, zero_rates, T, dt, scheme)
 
-        drift = (theta_fn(time_grid[t]) - alpha * rt) * dt
-        diffusion = sigma * np.sqrt(dt) * Z[:, t]
+    return ar1_paths(r0, decay, drift[None, :])[0]
 
-        rates[:, t + 1] = rt + drift + diffusion
 
-    return rates
+if __name__ == "__main__":
+    # Demo run fitted to today's yield curve
+    defaults = calibration_provider.defaults()
+
+    rates = simulate_hull_white(
+        r0=defaults["r0"],
+        alpha=defaults["alpha"],
+        sigma=defaults["curve_sigma"],
+        maturities=defaults["maturities"],
+        zero_rates=defaults["zero_rates"],
+        T=5.0,
+        dt=1/252,
+        n_paths=50,
+        seed=42
+    )
 
-rates = simulate_hull_white(
-    r0=r0,
-    alpha=alpha,
-    sigma=sigma,
-    maturities=maturities,
-    zero_rates=zero_rates,
-    T=5.0,
-    dt=1/252,
-    n_paths=50,
-    seed=42
-)
-
-time = np.linspace(0, 5, rates.shape[1])
\ No newline at end of file
+    time = np.linspace(0, 5, rates.shape[1])
@@ -0,0 +1,119 @@
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.local_store import local_store
+
+# Calibration data shared by every short-rate model. Nothing is fetched at import
+# time: the table is synced into the local store on first use, held in memory,
+# and refreshed in a background thread once it is older than the TTL.
+
+TABLE = "yield_curve_data"
+TTL_SECONDS = float(os.getenv("CALIBRATION_TTL_SECONDS", 6 * 60 * 60))
+
+# Tenor (years) -> column name, used to build today's yield curve
+CURVE_COLUMNS = {
+    0.25: "y_3m",
+    0.5: "y_6m",
+    1: "y_1y",
+    2: "y_2y",
+    3: "y_3y",
+    5: "y_5y",
+    7: "y_7y",
+    10: "y_10y",
+    20: "y_20y",
+    30: "y_30y",
+}
+
+TRADING_DAYS = 252
+KAPPA = 0.3  # Mean Reversion Speed (Vasicek, CIR)
+ALPHA = 0.05  # Mean Reversion Speed (Hull-White)
+CURVE_SIGMA = 0.1  # Volatility used by the curve-fitted models (Hull-White, Ho-Lee)
+
+
+def load_yield_curve_data() -> pd.DataFrame:
+    """Sync the local Arrow mirror of yield_curve_data and read it back as a frame."""
+    try:
+        local_store.sync(TABLE)
+    except Exception:
+        # Offline: fall back to whatever is already cached
+        if not local_store.exists(TABLE):
+            raise
+    return local_store.frame(TABLE)
+
+
+def derive_defaults(df: pd.DataFrame) -> dict:
+    """Model defaults derived from the historical yield table."""
+    return {
+        "r0": float(df["fed_funds"].iloc[-1]),  # Short Rate
+        "theta": float(df["y_10y"].tail(TRADING_DAYS).mean()),  # 10Y Treasury Yield Annual Trading Day Average
+        "sigma": float(df["fed_funds"].diff().dropna().std() * np.sqrt(TRADING_DAYS)),  # Annualised Rate Volatility
+        "kappa": KAPPA,
+        "alpha": ALPHA,
+        "curve_sigma": CURVE_SIGMA,
+        "maturities": np.array(list(CURVE_COLUMNS), dtype=float),
+        "zero_rates": df[list(CURVE_COLUMNS.values())].iloc[-1].to_numpy(dtype=float),
+        "as_of": df.index[-1],
+    }
+
+
+class CalibrationProvider:
+    """Loads calibration data once on demand and keeps it fresh with a TTL."""
+
+    def __init__(self, loader=load_yield_curve_data, ttl: float = TTL_SECONDS, clock=time.monotonic):
+        self._loader = loader
+        self._ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._df = None
+        self._defaults = None
+        self._loaded_at = 0.0
+        self._refreshing = False
+
+    def _load(self):
+        df = self._loader()
+        defaults = derive_defaults(df)
+        with self._lock:
+            self._df, self._defaults = df, defaults
+            self._loaded_at = self._clock()
+
+    def _background_refresh(self):
+        try:
+            self._load()
+        finally:
+            self._refreshing = False
+
+    def _ensure_loaded(self):
+        if self._df is None:
+            with self._load_lock:
+                if self._df is None:
+                    self._load()
+            return
+
+        # Stale data is still served while a single refresh runs in the background
+        if self._clock() - self._loaded_at > self._ttl:
+            with self._lock:
+                if self._refreshing:
+                    return
+                self._refreshing = True
+            threading.Thread(target=self._background_refresh, daemon=True).start()
+
+    def frame(self) -> pd.DataFrame:
+        self._ensure_loaded()
+        return self._df
+
+    def defaults(self) -> dict:
+        self._ensure_loaded()
+        return self._defaults
+
+    def refresh(self):
+        """Force a synchronous reload."""
+        with self._load_lock:
+            self._load()
+
+
+calibration_provider = CalibrationProvider()
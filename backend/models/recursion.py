@@ -0,0 +1,17 @@
+import numpy as np
+from scipy.signal import lfilter
+
+
+# Runs r(t+1) = a * r(t) + x(t) for every path at once as a first-order IIR filter
+# along the time axis, so no per-step Python loop is needed
+def ar1_paths(r0: float, a: float, innovations: np.ndarray) -> np.ndarray:
+    n_paths, n_steps = innovations.shape
+
+    zi = np.full((n_paths, 1), a * r0)
+    stepped, _ = lfilter([1.0], [1.0, -a], innovations, axis=1, zi=zi)
+
+    rates = np.empty((n_paths, n_steps + 1))
+    rates[:, 0] = r0
+    rates[:, 1:] = stepped
+
+    return rates
@@ -0,0 +1,81 @@
+import warnings
+
+import numpy as np
+from scipy.special import ndtri
+from scipy.stats import qmc
+
+# Shared shock generation for all short-rate models. Each call owns its own
+# np.random.Generator, so concurrent requests never share RNG state.
+#
+#   pseudo      plain pseudo-random normals
+#   antithetic  paths come in (Z, -Z) pairs
+#   sobol       scrambled Sobol points with a Brownian-bridge construction, so the
+#               best-distributed leading dimensions drive the coarse path shape
+
+SAMPLING_METHODS = ("pseudo", "antithetic", "sobol")
+MAX_SOBOL_DIM = 21_201  # scipy's Sobol direction numbers
+
+
+def make_rng(seed=None) -> np.random.Generator:
+    return np.random.default_rng(seed)
+
+
+def _bridge_levels(n_steps):
+    """Bisection order for the Brownian bridge, grouped into vectorisable levels.
+
+    Each level is (mid, left, right) index arrays; every point in a level only
+    depends on points fixed in earlier levels.
+    """
+    levels = []
+    intervals = [(0, n_steps)]
+    while intervals:
+        intervals = [(l, r) for l, r in intervals if r - l > 1]
+        if not intervals:
+            break
+        left = np.array([l for l, _ in intervals])
+        right = np.array([r for _, r in intervals])
+        mid = (left + right) // 2
+        levels.append((mid, left, right))
+        intervals = [iv for l, m, r in zip(left, mid, right) for iv in ((l, m), (m, r))]
+    return levels
+
+
+def brownian_bridge(normals: np.ndarray) -> np.ndarray:
+    """Turn (n_paths, n_steps) normals in bridge order into per-step N(0, 1) increments."""
+    n_paths, n_steps = normals.shape
+
+    # Brownian motion in units of one step's variance
+    W = np.zeros((n_paths, n_steps + 1))
+    W[:, -1] = np.sqrt(n_steps) * normals[:, 0]
+
+    used = 1
+    for mid, left, right in _bridge_levels(n_steps):
+        span = right - left
+        weight_left = (right - mid) / span
+        weight_right = (mid - left) / span
+        sd = np.sqrt((mid - left) * (right - mid) / span)
+
+        z = normals[:, used:used + len(mid)]
+        W[:, mid] = weight_left * W[:, left] + weight_right * W[:, right] + sd * z
+        used += len(mid)
+
+    return np.diff(W, axis=1)
+
+
+def normal_shocks(n_paths, n_steps, rng: np.random.Generator, method="pseudo") -> np.ndarray:
+    """Standard normal shock matrix of shape (n_paths, n_steps)."""
+    if method == "antithetic":
+        half = rng.standard_normal(((n_paths + 1) // 2, n_steps))
+        return np.concatenate([half, -half])[:n_paths]
+
+    if method == "sobol":
+        sampler = qmc.Sobol(d=n_steps, scramble=True, seed=rng)
+        # Path counts need not be powers of two; the points are still scrambled QMC
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", message="The balance properties of Sobol", category=UserWarning)
+            points = sampler.random(n_paths)
+        # Keep the inverse CDF finite at the unit cube's edges
+        normals = ndtri(np.clip(points, 1e-12, 1 - 1e-12))
+        return brownian_bridge(normals)
+
+    return rng.standard_normal((n_paths, n_steps))
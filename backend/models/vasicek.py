@@ -1,39 +1,24 @@
-import pandas as pd
-import os
-from dotenv import load_dotenv
-from supabase import create_client
 import numpy as np
-import matplotlib.pyplot as plt
 
-# Initialising Supabase HTTPS connection
-load_dotenv()
+from models.market_data import calibration_provider
+from models.shocks import make_rng, normal_shocks
+from models.recursion import ar1_paths
 
-HOST = os.getenv("SUPABASE_HOST")
-KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+# Exact Gaussian transition: r(t+dt) = a*r(t) + theta*(1-a) + s*Z with a = exp(-kappa*dt)
+def _exact_coefficients(kappa, sigma, dt):
+    a = np.exp(-kappa * dt)
+    var = sigma**2 * dt if kappa == 0 else sigma**2 * (1 - a**2) / (2 * kappa)
+    return a, np.sqrt(var)
 
-supabase = create_client(f"https://{HOST}", KEY)
 
-# Selecting table
-rows = []
-offset = 0
-page_size = 1000
+def _exact_paths(r0, kappa, theta, sigma, dt, Z):
+    a, s = _exact_coefficients(kappa, sigma, dt)
 
-while True:
-    response = supabase.table("yield_curve_data").select("*").range(offset, offset + page_size - 1).execute()
-    if not response.data:
-        break
-    rows.extend(response.data)
-    offset += page_size
-df = pd.DataFrame(rows)
+    innovations = s * Z
+    innovations += theta * (1 - a)
 
-df.set_index("date", inplace=True)
-df = df.sort_index()
+    return ar1_paths(r0, a, innovations)
 
-# Assigning parameters for Vasicek mode
-r0 = df['fed_funds'].iloc[-1] # Short Rate
-theta = df['y_10y'].tail(252).mean() # 10Y Treasury Yield Annual Trading Day Average
-sigma = (df['fed_funds'].diff().dropna().std()) * np.sqrt(252) # Annual Trading Day Interest Rate Volatility
-kappa = 0.3 # Mean Reversion Speed
 
 # Simulating Vasicek Paths
 def simulate_vasicek(
@@ -45,20 +30,24 @@ def simulate_vasicek(
         dt: float,
         n_paths: int,
         seed: int | None = None,
+        sampling: str = "pseudo",
+        scheme: str = "euler",
 ):
     
-    if seed is not None:
-        np.random.seed(seed)
+    rng = make_rng(seed)
 
     n_steps = int(T / dt)
 
+    # Random shocks
+    Z = normal_shocks(n_paths, n_steps, rng, sampling)
+
+    if scheme == "exact":
+        return _exact_paths(r0, kappa, theta, sigma, dt, Z)
+
     # Allocating array
     rates = np.zeros((n_paths, n_steps + 1))
     rates[:, 0] = r0
 
-    # Random shocks
-    Z = np.random.normal(0.0, 1.0, size=(n_paths, n_steps))
-
     for t in range(n_steps):
         rt = rates[:, t]
 
@@ -67,17 +56,30 @@ def simulate_vasicek(
 
         rates[:, t + 1] = rt + drift + diffusion
 
-    return rates 
+    return rates
+
+
+# Exact mean of the simulated rates on the grid, for either scheme
+def expected_vasicek(r0, kappa, theta, sigma, T, dt, scheme="euler", **_):
+    n_steps = int(T / dt)
+    a = np.exp(-kappa * dt) if scheme == "exact" else 1 - kappa * dt
+
+    return theta + (r0 - theta) * a ** np.arange(n_steps + 1)
+
+
+if __name__ == "__main__":
+    # Demo run calibrated to the latest Supabase data
+    defaults = calibration_provider.defaults()
 
-rates = simulate_vasicek(
-    r0=r0,
-    kappa=kappa,
-    theta=theta,
-    sigma=sigma,
-    T=5,
-    dt=1/252,
-    n_paths=50,
-    seed=42
-)
+    rates = simulate_vasicek(
+        r0=defaults["r0"],
+        kappa=defaults["kappa"],
+        theta=defaults["theta"],
+        sigma=defaults["sigma"],
+        T=5,
+        dt=1/252,
+        n_paths=50,
+        seed=42
+    )
 
-time = np.linspace(0, 5, rates.shape[1])
\ No newline at end of file
+    time = np.linspace(0, 5, rates.shape[1])
@@ -0,0 +1,67 @@
+from functools import lru_cache
+
+import numpy as np
+from scipy.interpolate import PchipInterpolator
+
+# Today's term structure, shared by the curve-fitted models (Hull-White, Ho-Lee)
+# and the analytic pricing references. The log discount factor log P(0, t) is
+# interpolated with a monotone cubic (PCHIP) through (0, 0) and the input
+# tenors, so discount factors, zero rates, instantaneous forwards and their
+# slope all come from one smooth, shape-preserving curve. Past the last tenor
+# the forward rate is held flat.
+#
+# Curves are memoised on their exact (maturities, zero_rates) values, so each
+# distinct curve is built once however many requests send it.
+
+
+class YieldCurve:
+    def __init__(self, maturities, zero_rates):
+        maturities = np.asarray(maturities, dtype=float)
+        zero_rates = np.asarray(zero_rates, dtype=float)
+
+        knots = np.concatenate(([0.0], maturities)) if maturities[0] > 0 else maturities
+        log_df = np.concatenate(([0.0], -zero_rates * maturities)) if maturities[0] > 0 else -zero_rates * maturities
+
+        self.maturities = maturities
+        self.zero_rates = zero_rates
+        self.last = knots[-1]
+
+        self._log_df = PchipInterpolator(knots, log_df, extrapolate=False)
+        self._slope = self._log_df.derivative()
+        self._curvature = self._log_df.derivative(2)
+        self._last_log_df = log_df[-1]
+        self._last_forward = -float(self._slope(self.last))
+
+    def log_discount(self, t):
+        t = np.asarray(t, dtype=float)
+        inside = self._log_df(np.minimum(t, self.last))
+        return np.where(t <= self.last, inside, self._last_log_df - self._last_forward * (t - self.last))
+
+    def discount(self, t):
+        return np.exp(self.log_discount(t))
+
+    def zero(self, t):
+        t = np.asarray(t, dtype=float)
+        safe = np.where(t > 0, t, 1.0)
+        return np.where(t > 0, -self.log_discount(t) / safe, self.forward(0.0))
+
+    def forward(self, t):
+        """Instantaneous forward rate f(0, t)."""
+        return -self._slope(np.minimum(np.asarray(t, dtype=float), self.last))
+
+    def dforward(self, t):
+        """Slope of the forward curve, df(0, t)/dt (zero on the flat extrapolation)."""
+        t = np.asarray(t, dtype=float)
+        return np.where(t <= self.last, -self._curvature(np.minimum(t, self.last)), 0.0)
+
+
+@lru_cache(maxsize=64)
+def _cached_curve(maturities: bytes, zero_rates: bytes) -> YieldCurve:
+    return YieldCurve(np.frombuffer(maturities), np.frombuffer(zero_rates))
+
+
+def yield_curve(maturities, zero_rates) -> YieldCurve:
+    """The memoised curve for these tenors and zero rates."""
+    maturities = np.ascontiguousarray(maturities, dtype=np.float64)
+    zero_rates = np.ascontiguousarray(zero_rates, dtype=np.float64)
+    return _cached_curve(maturities.tobytes(), zero_rates.tobytes())
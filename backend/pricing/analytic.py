@@ -0,0 +1,40 @@
+import numpy as np
+
+from models.yield_curve import yield_curve
+
+# Closed-form zero-coupon bond prices P(0, maturity). Extra simulation kwargs are
+# accepted and ignored so these can be called with the model's parameter dict.
+
+def vasicek_zcb(maturity, r0, kappa, theta, sigma, **_):
+    if kappa == 0:
+        # No mean reversion: r is r0 plus Brownian motion, B(T) = T
+        return np.exp(-r0 * maturity + sigma**2 * maturity**3 / 6)
+
+    B = (1 - np.exp(-kappa * maturity)) / kappa
+    A = np.exp((theta - sigma**2 / (2 * kappa**2)) * (B - maturity) - sigma**2 * B**2 / (4 * kappa))
+
+    return A * np.exp(-B * r0)
+
+
+def cir_zcb(maturity, r0, kappa, theta, sigma, **_):
+    gamma = np.sqrt(kappa**2 + 2 * sigma**2)
+    growth = np.exp(gamma * maturity) - 1
+    denom = (gamma + kappa) * growth + 2 * gamma
+
+    A = (2 * gamma * np.exp((kappa + gamma) * maturity / 2) / denom) ** (2 * kappa * theta / sigma**2)
+    B = 2 * growth / denom
+
+    return A * np.exp(-B * r0)
+
+
+# Hull-White and Ho-Lee are fitted to today's curve, so their bonds reprice it
+def curve_zcb(maturity, maturities, zero_rates, **_):
+    return yield_curve(maturities, zero_rates).discount(maturity)
+
+
+ANALYTIC_ZCB = {
+    "vasicek": vasicek_zcb,
+    "cir": cir_zcb,
+    "hull_white": curve_zcb,
+    "ho_lee": curve_zcb,
+}
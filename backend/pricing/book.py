@@ -0,0 +1,89 @@
+import numpy as np
+from scipy import sparse
+
+from pricing.zero_coupon import zcb_block
+
+# Book valuation: every instrument is reduced to signed cashflow weights on a
+# shared set of dates, giving a sparse (instrument x date) matrix W. With the
+# mean simulated discount factor P on those dates, values = W @ P. Each row
+# only has entries on its own schedule, so W stays small however many
+# instruments share the date axis.
+#
+#   zcb   receive notional at maturity
+#   bond  receive notional * rate * accrual on each coupon date, plus notional at maturity
+#   fra   receive floating over [start, maturity], pay rate * accrual
+#   swap  receive floating over [start, maturity], pay rate on the fixed schedule
+#
+# Negative notionals flip the side. Coupon schedules run back from maturity in
+# steps of `frequency`, with any short stub at the front.
+
+
+def _schedules(start, maturity, frequency):
+    """Coupon dates and accruals for many instruments at once, as flat arrays."""
+    counts = np.maximum(np.ceil((maturity - start) / frequency - 1e-9).astype(int), 1)
+    rows = np.repeat(np.arange(len(start)), counts)
+
+    # Position of each coupon counted back from maturity (0 = the maturity date itself)
+    from_end = np.repeat(np.cumsum(counts), counts) - np.arange(counts.sum()) - 1
+    times = maturity[rows] - from_end * frequency[rows]
+    accruals = np.minimum(frequency[rows], times - start[rows])
+
+    return rows, times, accruals
+
+
+def cashflow_matrix(instrument_type, notional, start, maturity, rate, frequency):
+    """Sorted unique dates and the sparse (n_instruments x n_dates) CSR cashflow weights."""
+    instrument_type = np.asarray(instrument_type)
+    notional, start, maturity, rate, frequency = (
+        np.asarray(x, dtype=float) for x in (notional, start, maturity, rate, frequency)
+    )
+    idx = np.arange(len(notional))
+
+    rows, dates, weights = [], [], []
+
+    def add(r, t, w):
+        rows.append(r)
+        dates.append(t)
+        weights.append(w)
+
+    # Principal at maturity: +N for bonds and zero-coupons, -N closing the floating leg of FRAs and swaps
+    principal = np.where(np.isin(instrument_type, ["zcb", "bond"]), 1.0, -1.0)
+    add(idx, maturity, principal * notional)
+
+    # Floating legs open with +N at the start date
+    floating = np.isin(instrument_type, ["fra", "swap"])
+    add(idx[floating], start[floating], notional[floating])
+
+    # FRAs pay their fixed rate once over the whole period
+    fra = instrument_type == "fra"
+    add(idx[fra], maturity[fra], -notional[fra] * rate[fra] * (maturity[fra] - start[fra]))
+
+    # Coupon schedules: received on bonds, paid on swaps
+    coupon = np.isin(instrument_type, ["bond", "swap"])
+    if coupon.any():
+        sub = idx[coupon]
+        r, t, accrual = _schedules(start[sub], maturity[sub], frequency[sub])
+        sign = np.where(instrument_type[sub][r] == "bond", 1.0, -1.0)
+        add(sub[r], t, sign * notional[sub][r] * rate[sub][r] * accrual)
+
+    rows, dates, weights = (np.concatenate(x) for x in (rows, dates, weights))
+
+    unique_dates, columns = np.unique(dates, return_inverse=True)
+    # Duplicate (instrument, date) entries are summed by the conversion
+    W = sparse.coo_matrix((weights, (rows, columns)), shape=(len(notional), len(unique_dates))).tocsr()
+
+    return unique_dates, W
+
+
+def value_book(mean_discount, W):
+    """Per-instrument values from the mean discount factor on each cashflow date."""
+    return W @ mean_discount
+
+
+def mean_discount(discount_factors, dt, dates):
+    """Mean simulated discount factor on each date, in the zcb_block convention.
+
+    The path mean is taken once over the time grid and the dates are gathered
+    from that vector, so no (paths x dates) block is built.
+    """
+    return zcb_block(discount_factors.mean(axis=0)[None, :], dt, dates)[0]
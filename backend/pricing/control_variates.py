@@ -0,0 +1,17 @@
+# Regression control variate: y - beta * (x - E[x]) keeps the mean of y while
+# removing the part of its noise explained by x. Returns the adjusted samples
+# and the variance reduction factor var(y) / var(adjusted).
+def control_variate(samples, control, control_mean):
+    dx = control - control.mean()
+    var_x = dx @ dx
+    if var_x == 0:
+        return samples, None
+
+    beta = ((samples - samples.mean()) @ dx) / var_x
+    adjusted = samples - beta * (control - control_mean)
+
+    var_adjusted = adjusted.var()
+    if var_adjusted == 0:
+        return adjusted, None
+
+    return adjusted, float(samples.var() / var_adjusted)
@@ -1,6 +1,7 @@
 import numpy as np
 
-def par_swap_rate(DF, payment_times, maturity, dt):
+# Per-path floating and fixed (annuity) legs of a payer swap
+def swap_legs(DF, payment_times, maturity, dt):
     payment_indices = (np.array(payment_times) / dt).astype(int)
     maturity_index = int(maturity / dt)
 
@@ -9,4 +10,15 @@ def par_swap_rate(DF, payment_times, maturity, dt):
     fixed_leg = np.sum(alpha * DF[:, payment_indices], axis=1)
     floating_leg = 1 - DF[:, maturity_index]
 
+    return floating_leg, fixed_leg
+
+
+def par_swap_rate(DF, payment_times, maturity, dt):
+    floating_leg, fixed_leg = swap_legs(DF, payment_times, maturity, dt)
+
     return np.mean(floating_leg) / np.mean(fixed_leg)
+
+
+# Fixed-leg payment times from the first period up to and including maturity
+def payment_schedule(maturity, frequency):
+    return np.arange(frequency, maturity + 1e-9, frequency).tolist()
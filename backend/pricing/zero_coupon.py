@@ -9,4 +9,18 @@ def zcb(rates, dt, maturity):
 
     prices = np.exp(-integral)
 
-    return prices
\ No newline at end of file
+    return prices
+
+# Prices for many maturities at once from the cumulative discount factors that
+# simulate_rates already computes: DF[:, n - 1] = exp(-sum of r*dt over the first
+# n steps), i.e. exactly zcb(rates, dt, T) with n = int(T / dt). One fancy-index
+# gather instead of a sum over the path matrix per maturity.
+def zcb_block(discount_factors, dt, maturities):
+
+    n_steps = np.minimum((np.asarray(maturities) / dt).astype(int), discount_factors.shape[1])
+
+    prices = np.ones((discount_factors.shape[0], len(n_steps)))
+    held = n_steps > 0
+    prices[:, held] = discount_factors[:, n_steps[held] - 1]
+
+    return prices
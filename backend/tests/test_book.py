@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+from api.simulate import simulate_rates
+from api.streaming import StreamingRun
+from pricing.book import cashflow_matrix, mean_discount, value_book
+from pricing.zero_coupon import zcb_block
+
+PARAMS = dict(r0=0.03, kappa=0.5, theta=0.04, sigma=0.01, T=6.0, dt=1 / 52, n_paths=400, seed=5)
+
+
+def discount(t):
+    return np.exp(-0.03 * t - 0.002 * t**2)
+
+
+def coupon_dates(start, maturity, frequency):
+    """Schedule run back from maturity, short stub at the front, as (date, accrual) pairs."""
+    dates = []
+    t = maturity
+    while t > start + 1e-9:
+        dates.append(t)
+        t -= frequency
+    dates = dates[::-1]
+    return [(d, d - max(d - frequency, start)) for d in dates]
+
+
+def price_one(kind, notional, start, maturity, rate, frequency):
+    if kind == "zcb":
+        return notional * discount(maturity)
+    if kind == "fra":
+        return notional * (discount(start) - discount(maturity) - rate * (maturity - start) * discount(maturity))
+
+    coupons = sum(notional * rate * accrual * discount(d) for d, accrual in coupon_dates(start, maturity, frequency))
+    if kind == "bond":
+        return coupons + notional * discount(maturity)
+    return notional * (discount(start) - discount(maturity)) - coupons
+
+
+def random_book(n, seed=0):
+    rng = np.random.default_rng(seed)
+    kind = rng.choice(["zcb", "bond", "fra", "swap"], n)
+    start = np.where(np.isin(kind, ["fra", "swap"]), rng.choice([0.0, 0.25, 0.5, 1.0], n), 0.0)
+    maturity = start + rng.choice([0.25, 0.5, 1.0, 1.3, 2.0, 3.75, 5.0], n)
+    notional = rng.choice([-1.0, 1.0], n) * rng.uniform(1e5, 1e7, n)
+    rate = rng.uniform(0.0, 0.06, n)
+    frequency = rng.choice([0.25, 0.5, 1.0], n)
+    return kind, notional, start, maturity, rate, frequency
+
+
+def test_book_values_match_pricing_each_instrument():
+    book = random_book(300)
+    dates, W = cashflow_matrix(*book)
+
+    assert sparse.issparse(W) and W.shape == (300, len(dates))
+    assert np.all(np.diff(dates) > 0)
+
+    values = value_book(discount(dates), W)
+    expected = [price_one(*instrument) for instrument in zip(*book)]
+    np.testing.assert_allclose(values, expected, rtol=1e-10, atol=1e-6)
+
+
+def test_cashflow_rows_only_touch_their_own_schedule():
+    dates, W = cashflow_matrix(["zcb", "bond", "swap"], [1, 1, 1], [0, 0, 1], [2, 2, 2], [0, 0.05, 0.04], [1, 0.5, 0.5])
+    W = W.toarray()
+    np.testing.assert_array_equal(dates, [0.5, 1.0, 1.5, 2.0])
+
+    np.testing.assert_allclose(W[0], [0, 0, 0, 1])
+    np.testing.assert_allclose(W[1], [0.025, 0.025, 0.025, 1.025])
+    np.testing.assert_allclose(W[2], [0, 1, -0.02, -1.02])
+
+
+def test_bond_at_par_on_a_flat_curve():
+    rate = np.expm1(0.04 / 2) * 2  # semi-annual par coupon for 4% continuous
+    dates, W = cashflow_matrix(["bond"], [100.0], [0.0], [5.0], [rate], [0.5])
+    assert value_book(np.exp(-0.04 * dates), W)[0] == pytest.approx(100.0)
+
+
+def test_mean_discount_matches_the_full_block():
+    simulation = simulate_rates("vasicek", PARAMS)
+    DF, dt = simulation["discount_factors"], PARAMS["dt"]
+    dates = np.array([0.0, 0.01, 0.25, 1.0, 2.7, 6.0])
+
+    np.testing.assert_allclose(mean_discount(DF, dt, dates), zcb_block(DF, dt, dates).mean(axis=0), rtol=1e-13)
+
+
+def test_streaming_mean_discount_matches_the_chunks():
+    dates = np.array([0.0, 0.5, 1.0, 3.0, 6.0])
+    run = StreamingRun("vasicek", PARAMS, chunk_size=150, n_sample_paths=0, discount_dates=dates)
+
+    seen = []
+
+    def simulate(model_name, params):
+        seen.append(simulate_rates(model_name, params))
+        return seen[-1]
+
+    list(run.chunks(simulate))
+    DF = np.vstack([s["discount_factors"] for s in seen])
+
+    np.testing.assert_allclose(run.result()["mean_discount"], zcb_block(DF, PARAMS["dt"], dates).mean(axis=0), rtol=1e-13)
@@ -0,0 +1,80 @@
+import os
+
+import numpy as np
+import pytest
+
+from api.cache import SimulationCache, simulation_key
+
+
+def make_simulation(value, n=1_000):
+    return {"rates": np.full(n, value, dtype=float), "time_grid": np.linspace(0, 1, n), "model": "vasicek"}
+
+
+def test_simulation_key_is_canonical_and_needs_a_seed():
+    params = {"r0": 0.04, "seed": 1, "curve": np.array([0.01, 0.02])}
+    assert simulation_key("vasicek", params) == simulation_key("vasicek", dict(reversed(params.items())))
+    assert simulation_key("vasicek", params) != simulation_key("cir", params)
+    assert simulation_key("vasicek", params) != simulation_key("vasicek", params, engine="parallel")
+    assert simulation_key("vasicek", {**params, "seed": None}) is None
+
+
+def test_put_get_hit_and_miss():
+    cache = SimulationCache(max_bytes=10**6)
+    simulation = make_simulation(1.0)
+    cache.put("a", simulation)
+
+    hit, status = cache.get("a")
+    assert status == "hit"
+    assert hit is simulation
+    assert not hit["rates"].flags.writeable
+    assert cache.get("b") == (None, "miss")
+
+
+def test_lru_eviction_without_spill_dir():
+    cache = SimulationCache(max_bytes=2 * 16_000, spill_dir=None)
+    cache.put("a", make_simulation(1.0))
+    cache.put("b", make_simulation(2.0))
+    cache.get("a")
+    cache.put("c", make_simulation(3.0))
+
+    assert cache.get("b") == (None, "miss")
+    assert cache.get("a")[1] == "hit"
+    assert cache.get("c")[1] == "hit"
+
+
+def test_spill_round_trip(tmp_path):
+    cache = SimulationCache(max_bytes=16_000, spill_dir=str(tmp_path))
+    first = make_simulation(1.0)
+    cache.put("a", first)
+    cache.put("b", make_simulation(2.0))
+
+    spilled, status = cache.get("a")
+    assert status == "spill-hit"
+    assert spilled["model"] == "vasicek"
+    for name in ("rates", "time_grid"):
+        assert isinstance(spilled[name], np.memmap)
+        np.testing.assert_array_equal(spilled[name], first[name])
+        with pytest.raises(ValueError):
+            spilled[name][0] = 0.0
+
+
+def test_spill_tier_is_bounded_and_cleared(tmp_path):
+    cache = SimulationCache(max_bytes=16_000, spill_dir=str(tmp_path), spill_bytes=16_000)
+    for i, key in enumerate("abc"):
+        cache.put(key, make_simulation(float(i)))
+
+    assert cache.get("a") == (None, "miss")
+    assert cache.get("b")[1] == "spill-hit"
+    root = cache._root()
+    assert len(os.listdir(root)) == 1
+
+    cache.clear()
+    assert cache.get("b") == (None, "miss")
+    assert cache.get("c") == (None, "miss")
+    assert os.listdir(root) == []
+
+
+def test_oversized_entries_skip_memory(tmp_path):
+    cache = SimulationCache(max_bytes=1_000, spill_dir=str(tmp_path), spill_bytes=1_000)
+    cache.put("a", make_simulation(1.0))
+    assert cache.get("a") == (None, "miss")
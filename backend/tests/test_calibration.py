@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from models.calibration import MODELS, PARAMS, calibrate_history, cir_estimates, vasicek_mle
+
+DT = 1 / 365
+
+
+def vasicek_series(n, kappa=0.5, theta=0.04, sigma=0.01, r0=0.02, seed=0):
+    rng = np.random.default_rng(seed)
+    b = np.exp(-kappa * DT)
+    sd = sigma * np.sqrt((1 - b**2) / (2 * kappa))
+    rates = np.empty(n)
+    rates[0] = r0
+    for t, z in enumerate(rng.standard_normal(n - 1)):
+        rates[t + 1] = theta + (rates[t] - theta) * b + sd * z
+    return rates
+
+
+def cir_series(n, kappa=0.5, theta=0.04, sigma=0.05, r0=0.03, seed=0):
+    rng = np.random.default_rng(seed)
+    rates = np.empty(n)
+    rates[0] = r0
+    for t, z in enumerate(rng.standard_normal(n - 1)):
+        r = rates[t]
+        rates[t + 1] = max(r + kappa * (theta - r) * DT + sigma * np.sqrt(r * DT) * z, 1e-6)
+    return rates
+
+
+def test_vasicek_mle_matches_per_window_regression():
+    rates = vasicek_series(2_000)
+    rates[700] = np.nan
+    window = 500
+    fit = vasicek_mle(rates, DT, window)
+
+    assert len(fit["kappa"]) == len(rates) - window
+    for start in (0, 450, 1_499):
+        x, y = rates[start:start + window], rates[start + 1:start + window + 1]
+        keep = np.isfinite(x) & np.isfinite(y)
+        b, a = np.polyfit(x[keep], y[keep], 1)
+        residual = y[keep] - (a + b * x[keep])
+        kappa = -np.log(b) / DT
+        assert fit["kappa"][start] == pytest.approx(kappa, rel=1e-6)
+        assert fit["theta"][start] == pytest.approx(a / (1 - b), rel=1e-6)
+        assert fit["sigma"][start] == pytest.approx(np.sqrt(residual.var() * 2 * kappa / (1 - b**2)), rel=1e-6)
+
+
+def test_vasicek_mle_recovers_parameters():
+    rates = vasicek_series(365 * 400, seed=1)
+    fit = vasicek_mle(rates, DT, len(rates) - 1)
+    assert fit["kappa"][0] == pytest.approx(0.5, abs=0.15)
+    assert fit["theta"][0] == pytest.approx(0.04, abs=0.003)
+    assert fit["sigma"][0] == pytest.approx(0.01, rel=0.02)
+
+
+def test_cir_estimates_recover_parameters():
+    rates = cir_series(365 * 400, seed=2)
+    fit = cir_estimates(rates, DT, len(rates) - 1)
+    assert fit["kappa"][0] == pytest.approx(0.5, abs=0.15)
+    assert fit["theta"][0] == pytest.approx(0.04, abs=0.005)
+    assert fit["sigma"][0] == pytest.approx(0.05, rel=0.03)
+
+
+def test_windows_without_mean_reversion_are_nan():
+    growing = 0.01 * 1.001 ** np.arange(1_000)
+    for fit in (vasicek_mle(growing, DT, 200), cir_estimates(growing, DT, 200)):
+        for name in PARAMS:
+            assert np.isnan(fit[name]).all()
+
+
+def test_calibrate_history_layout():
+    dates = pd.date_range("2000-01-01", periods=3 * 365, freq="D")
+    df = pd.DataFrame({"fed_funds": cir_series(len(dates), seed=3)}, index=dates)
+
+    out = calibrate_history(df, window_years=1)
+
+    assert list(out.columns) == [f"{m}_{p}" for m in MODELS for p in PARAMS] + ["r0"]
+    assert out.index[0] == dates[365]
+    assert len(out) == len(dates) - 365
+    np.testing.assert_array_equal(out["r0"], df["fed_funds"].iloc[365:])
+    assert calibrate_history(df.iloc[:100], window_years=1).empty
+
+
+@pytest.mark.parametrize("fit, expected", [
+    ({"kappa": 0.4, "theta": 0.03, "sigma": 0.01, "r0": 0.05}, {"kappa": 0.4, "theta": 0.03, "sigma": 0.01, "r0": 0.05}),
+    ({"kappa": np.nan, "theta": np.nan, "sigma": np.nan, "r0": np.nan}, {"kappa": None, "theta": None, "sigma": None, "r0": None}),
+])
+def test_calibration_route_maps_non_finite_values_to_null(monkeypatch, fit, expected):
+    from fastapi.testclient import TestClient
+
+    import main
+    import models.calibration as calibration
+
+    seen = []
+
+    def calibrated_params(model, as_of=None):
+        seen.append(as_of)
+        return {**fit, "as_of": pd.Timestamp("2024-03-01")}
+
+    monkeypatch.setattr(calibration, "calibrated_params", calibrated_params)
+    client = TestClient(main.app)
+
+    response = client.get("/calibration/cir", params={"as_of": "2024-03-05"})
+    assert response.status_code == 200
+    assert response.json() == {"model": "cir", "as_of": "2024-03-01T00:00:00", **expected}
+    assert seen == [pd.Timestamp("2024-03-05")]
+
+    assert client.get("/calibration/hull_white").status_code == 404
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from fastapi import HTTPException
+
+from models.cir import _exact_step, _qe_step, simulate_cir
+
+N = 200_000
+
+
+def _transition_moments(r, kappa, theta, sigma, dt):
+    decay = np.exp(-kappa * dt)
+    mean = theta + (r - theta) * decay
+    var = r * sigma**2 * decay * (1 - decay) / kappa + theta * sigma**2 * (1 - decay) ** 2 / (2 * kappa)
+    return mean, var
+
+
+@pytest.mark.parametrize(
+    "r, kappa, theta, sigma, dt",
+    [
+        (0.04, 0.5, 0.03, 0.1, 0.25),  # moderate variance
+        (0.001, 0.2, 0.02, 0.3, 1.0),  # near zero with a high volatility
+    ],
+)
+def test_exact_step_matches_the_transition_moments(r, kappa, theta, sigma, dt):
+    rng = np.random.default_rng(1)
+    x = _exact_step(np.full(N, r), kappa, theta, sigma, dt, rng)
+    mean, var = _transition_moments(r, kappa, theta, sigma, dt)
+
+    assert x.min() >= 0
+    assert abs(x.mean() - mean) < 4 * np.sqrt(var / N)
+    assert x.var() == pytest.approx(var, rel=0.03)
+
+
+@pytest.mark.parametrize(
+    "r, kappa, theta, sigma, dt",
+    [
+        (0.04, 0.5, 0.03, 0.1, 0.25),  # psi small: squared-Gaussian branch
+        (0.001, 0.2, 0.02, 0.3, 1.0),  # psi large: exponential branch with a mass at zero
+    ],
+)
+def test_qe_step_matches_the_transition_moments(r, kappa, theta, sigma, dt):
+    z = np.random.default_rng(2).standard_normal(N)
+    x = _qe_step(np.full(N, r), kappa, theta, sigma, dt, z)
+    mean, var = _transition_moments(r, kappa, theta, sigma, dt)
+
+    assert x.min() >= 0
+    assert abs(x.mean() - mean) < 4 * np.sqrt(var / N)
+    assert x.var() == pytest.approx(var, rel=0.03)
+
+
+@pytest.mark.parametrize("scheme", ["exact", "qe"])
+def test_paths_keep_the_long_run_mean(scheme):
+    params = dict(r0=0.05, kappa=0.6, theta=0.03, sigma=0.08, T=10.0, dt=0.5, n_paths=20_000, seed=3)
+    rates = simulate_cir(**params, scheme=scheme)
+
+    expected = 0.03 + (0.05 - 0.03) * np.exp(-0.6 * 10.0)
+    assert rates.min() >= 0
+    assert rates[:, -1].mean() == pytest.approx(expected, rel=0.02)
+
+
+@pytest.mark.parametrize("bad", [{"kappa": 0.0}, {"sigma": 0.0}, {"theta": 0.0}, {"r0": -0.01}])
+def test_exact_and_qe_reject_degenerate_parameters(bad):
+    from main import _build_model_params
+    from utils.requests import SimulationRequest
+
+    base = dict(model="cir", r0=0.04, kappa=0.3, theta=0.04, sigma=0.05)
+    for scheme in ("exact", "qe"):
+        with pytest.raises(HTTPException) as exc:
+            _build_model_params(SimulationRequest(**{**base, **bad, "scheme": scheme}))
+        assert exc.value.status_code == 422
+
+    # Euler floors the rate and steps these without trouble
+    _build_model_params(SimulationRequest(**{**base, **bad}))
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from api.simulate import simulate_rates
+from main import _build_model_params, _price
+from models.holee import expected_ho_lee
+from models.hullwhite import expected_hull_white
+from models.vasicek import expected_vasicek
+from pricing.analytic import vasicek_zcb
+from pricing.control_variates import control_variate
+from pricing.zero_coupon import zcb, zcb_block
+from utils.requests import PricingRequest, SimulationRequest, YieldCurveInput
+
+CURVE = YieldCurveInput(maturities=[0.25, 1, 2, 5, 10], zero_rates=[0.03, 0.032, 0.035, 0.038, 0.04])
+
+
+def simulate(**fields):
+    req = SimulationRequest(**{"T": 2.0, "dt": 1 / 52, "n_paths": 2_000, "seed": 7, **fields})
+    params = _build_model_params(req)
+    return simulate_rates(req.model, params), params
+
+
+def test_control_variate_keeps_the_mean_and_cuts_variance():
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal(50_000)
+    y = 2.0 + 3.0 * x + 0.1 * rng.standard_normal(50_000)
+
+    adjusted, reduction = control_variate(y, x, 0.0)
+    assert adjusted.mean() == pytest.approx(2.0, abs=0.002)
+    assert reduction == pytest.approx(901, rel=0.05)
+
+    samples, reduction = control_variate(y[:10], np.ones(10), 1.0)
+    np.testing.assert_array_equal(samples, y[:10])
+    assert reduction is None
+
+
+def test_zcb_block_matches_the_per_maturity_sum():
+    simulation, params = simulate(model="vasicek", r0=0.03, kappa=0.5, theta=0.04, sigma=0.01)
+    rates, DF, dt = simulation["rates"], simulation["discount_factors"], params["dt"]
+    maturities = [0.0, 0.01, 0.5, 1.0, 2.0]
+
+    block = zcb_block(DF, dt, maturities)
+    for i, T in enumerate(maturities):
+        np.testing.assert_allclose(block[:, i], zcb(rates, dt, T), rtol=1e-12)
+
+    # Past the horizon the last discount factor is used
+    np.testing.assert_array_equal(zcb_block(DF, dt, [5.0])[:, 0], DF[:, -1])
+
+
+@pytest.mark.parametrize("fields, expected", [
+    (dict(model="vasicek", r0=0.02, kappa=0.8, theta=0.05, sigma=0.02), expected_vasicek),
+    (dict(model="vasicek", r0=0.02, kappa=0.8, theta=0.05, sigma=0.02, scheme="exact"), expected_vasicek),
+    (dict(model="hull_white", r0=0.03, alpha=0.1, sigma=0.01, yield_curve=CURVE), expected_hull_white),
+    (dict(model="hull_white", r0=0.03, alpha=0.1, sigma=0.01, yield_curve=CURVE, scheme="exact"), expected_hull_white),
+    (dict(model="ho_lee", r0=0.03, sigma=0.01, yield_curve=CURVE), expected_ho_lee),
+])
+def test_expected_paths_match_the_simulated_mean(fields, expected):
+    simulation, params = simulate(**{**fields, "n_paths": 20_000})
+    rates = simulation["rates"]
+    mean = expected(**params)
+
+    assert mean.shape == (rates.shape[1],)
+    np.testing.assert_array_equal(simulation["expected_rates"], mean)
+    stderr = rates.std(axis=0)[1:] / np.sqrt(len(rates))
+    assert np.all(np.abs(rates.mean(axis=0)[1:] - mean[1:]) < 5 * stderr)
+    assert mean[0] == params["r0"]
+
+
+def test_control_variate_prices_agree_with_the_analytic_bond():
+    simulation, _ = simulate(model="vasicek", r0=0.03, kappa=0.5, theta=0.04, sigma=0.01)
+    plain = _price(simulation, PricingRequest(zcb_maturities=[1.0, 2.0]))
+    adjusted = _price(simulation, PricingRequest(zcb_maturities=[1.0, 2.0], control_variate=True))
+
+    for before, after in zip(plain.zcb, adjusted.zcb):
+        assert before.analytic_price is None
+        assert after.variance_reduction > 100
+        assert after.std_error < before.std_error
+        assert after.mean_price == pytest.approx(after.analytic_price, abs=5e-4)
+
+
+def test_maturities_past_the_horizon_are_clamped():
+    simulation, _ = simulate(model="vasicek", r0=0.03, kappa=0.5, theta=0.04, sigma=0.01)
+    resp = _price(simulation, PricingRequest(zcb_maturities=[2.0, 3.0], control_variate=True))
+
+    plain = _price(simulation, PricingRequest(zcb_maturities=[3.0]))
+    assert resp.zcb[1].maturity == 3.0
+    assert resp.zcb[1].mean_price == pytest.approx(plain.zcb[0].mean_price, abs=3 * plain.zcb[0].std_error)
+    assert resp.zcb[1].analytic_price == pytest.approx(vasicek_zcb(3.0, 0.03, 0.5, 0.04, 0.01))
+
+
+def test_vasicek_without_mean_reversion():
+    assert vasicek_zcb(5.0, 0.03, 0.0, 0.04, 0.02) == pytest.approx(vasicek_zcb(5.0, 0.03, 1e-4, 0.04, 0.02), rel=1e-4)
+
+    simulation, _ = simulate(model="vasicek", r0=0.03, kappa=0.0, theta=0.04, sigma=0.01)
+    resp = _price(simulation, PricingRequest(zcb_maturities=[1.0, 2.0], swap_maturities=[2.0], control_variate=True))
+
+    for result in resp.zcb:
+        assert np.isfinite(result.analytic_price)
+        assert result.mean_price == pytest.approx(result.analytic_price, abs=5e-4)
+    assert np.isfinite(resp.swaps[0].par_rate)
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from yield_pipeline.curve_fitting import NS_COLUMNS, SV_COLUMNS, TENORS, _records, fit_curves
+
+M = np.array(list(TENORS.values()))
+
+
+def loadings(m, tau):
+    x = m / tau
+    L1 = (1 - np.exp(-x)) / x
+    return L1, L1 - np.exp(-x)
+
+
+def nelson_siegel(m, b0, b1, b2, tau):
+    L1, L2 = loadings(m, tau)
+    return b0 + b1 * L1 + b2 * L2
+
+
+def svensson(m, b0, b1, b2, b3, tau1, tau2):
+    return nelson_siegel(m, b0, b1, b2, tau1) + b3 * loadings(m, tau2)[1]
+
+
+NS_TRUE = [(4.5, -2.0, 1.5, 1.8), (3.0, 1.0, -2.5, 0.7), (5.2, -4.0, 3.0, 4.0)]
+SV_TRUE = [(4.0, -1.5, 2.0, -3.0, 1.0, 8.0), (5.0, -3.0, -2.0, 4.0, 0.5, 5.0), (4.0, -1.0, -1.0, 2.0, 0.8, 6.0)]
+
+
+def yield_frame(curves):
+    dates = pd.date_range("2024-01-01", periods=len(curves), freq="D")
+    return pd.DataFrame(np.array(curves), index=dates, columns=list(TENORS))
+
+
+def test_recovers_nelson_siegel_parameters():
+    fits = fit_curves(yield_frame([nelson_siegel(M, *p) for p in NS_TRUE]))
+
+    np.testing.assert_allclose(fits[NS_COLUMNS].to_numpy(), NS_TRUE, rtol=1e-4, atol=1e-4)
+    assert (fits["ns_rmse"] < 1e-6).all()
+    assert (fits["sv_rmse"] <= fits["ns_rmse"] + 1e-9).all()
+
+
+def test_recovers_svensson_parameters():
+    curves = [svensson(M, *p) for p in SV_TRUE]
+    fits = fit_curves(yield_frame(curves))
+
+    assert (fits["sv_rmse"] < 1e-6).all()
+    assert (fits["sv_rmse"] < fits["ns_rmse"]).all()
+    for (_, row), true in zip(fits.iterrows(), SV_TRUE):
+        np.testing.assert_allclose(row[SV_COLUMNS], true, rtol=1e-4, atol=1e-4)
+
+
+def test_missing_tenors_are_ignored():
+    curve = nelson_siegel(M, *NS_TRUE[0])
+    curve[[0, 4, 9]] = np.nan
+    fits = fit_curves(yield_frame([curve]))
+    np.testing.assert_allclose(fits[NS_COLUMNS].iloc[0], NS_TRUE[0], rtol=1e-4, atol=1e-4)
+
+
+def test_dates_with_too_few_yields_have_no_fit():
+    full = nelson_siegel(M, *NS_TRUE[0])
+    five = np.where(np.isin(np.arange(len(M)), [1, 3, 5, 7, 9]), full, np.nan)
+    three = np.where(np.isin(np.arange(len(M)), [2, 6, 8]), full, np.nan)
+
+    fits = fit_curves(yield_frame([full, five, three]))
+
+    assert np.isfinite(fits.iloc[0]).all()
+    assert np.isfinite(fits.iloc[1][NS_COLUMNS + ["ns_rmse"]]).all()
+    assert fits.iloc[1][SV_COLUMNS + ["sv_rmse"]].isna().all()
+    assert fits.iloc[2].isna().all()
+
+
+def test_warm_start_from_previous_fit():
+    previous = dict(zip(NS_COLUMNS, NS_TRUE[1]))
+    previous.update(zip(SV_COLUMNS, (*NS_TRUE[1][:3], 0.0, NS_TRUE[1][3], 10.0)))
+
+    fits = fit_curves(yield_frame([nelson_siegel(M, *NS_TRUE[1])]), previous)
+    assert fits["ns_tau"].iloc[0] == pytest.approx(NS_TRUE[1][3], rel=1e-4)
+
+
+def test_records_keep_the_fit_that_succeeded():
+    full = nelson_siegel(M, *NS_TRUE[0])
+    five = np.where(np.isin(np.arange(len(M)), [1, 3, 5, 7, 9]), full, np.nan)
+    three = np.where(np.isin(np.arange(len(M)), [2, 6, 8]), full, np.nan)
+    fits = fit_curves(yield_frame([full, five, three]).rename_axis("date"))
+
+    records = _records(fits)
+
+    assert [r["date"] for r in records] == list(fits.index[:2])
+    assert all(isinstance(records[0][c], float) for c in NS_COLUMNS + SV_COLUMNS)
+    assert records[1]["ns_beta0"] == pytest.approx(NS_TRUE[0][0], abs=1e-4)
+    assert all(records[1][c] is None for c in SV_COLUMNS + ["sv_rmse"])
+
+
+def test_previous_fit_stored_as_nulls_is_not_a_warm_start():
+    previous = dict(zip(NS_COLUMNS, NS_TRUE[1]))
+    previous.update({c: None for c in SV_COLUMNS})
+
+    fits = fit_curves(yield_frame([nelson_siegel(M, *NS_TRUE[1])]), previous)
+    assert np.isfinite(fits.to_numpy()).all()
+    assert fits["sv_rmse"].iloc[0] < 1e-6
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from api.downsample import SERIES, downsample_summary, minmax_buckets
+
+
+def make_series(n_points, n_series=3, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.linspace(0, 10, n_points), rng.standard_normal((n_series, n_points)).cumsum(axis=1)
+
+
+def test_short_series_pass_through():
+    time_grid, series = make_series(50)
+    out_time, out_series = minmax_buckets(time_grid, series, 50)
+    assert out_time is time_grid
+    assert out_series is series
+
+
+@pytest.mark.parametrize("n_points, max_points", [(1_001, 100), (1_000, 101), (5_000, 7), (53, 52)])
+def test_buckets_keep_endpoints_and_extremes(n_points, max_points):
+    time_grid, series = make_series(n_points)
+    out_time, out_series = minmax_buckets(time_grid, series, max_points)
+
+    assert len(out_time) <= max_points
+    assert out_series.shape == (len(series), len(out_time))
+    assert np.all(np.diff(out_time) >= 0)
+    assert out_time[0] == time_grid[0] and out_time[-1] == time_grid[-1]
+    np.testing.assert_array_equal(out_series[:, 0], series[:, 0])
+    np.testing.assert_array_equal(out_series[:, -1], series[:, -1])
+    np.testing.assert_array_equal(out_series.min(axis=1), series.min(axis=1))
+    np.testing.assert_array_equal(out_series.max(axis=1), series.max(axis=1))
+    assert np.isin(out_series, series).all()
+
+
+def test_spike_survives():
+    time_grid = np.arange(10_001, dtype=float)
+    series = np.zeros((1, 10_001))
+    series[0, 4_321] = 5.0
+    _, out_series = minmax_buckets(time_grid, series, 20)
+    assert out_series.max() == 5.0
+
+
+def test_downsample_summary():
+    n_points = 2_001
+    time_grid, rows = make_series(n_points, n_series=len(SERIES) + 4)
+    summary = {name: row for name, row in zip(SERIES, rows)}
+    summary.update(
+        time_grid=time_grid,
+        sample_paths=rows[len(SERIES):],
+        terminal_mean=0.04,
+        n_paths=4,
+    )
+
+    out = downsample_summary(summary, 200)
+
+    assert len(out["time_grid"]) <= 200
+    assert out["terminal_mean"] == 0.04 and out["n_paths"] == 4
+    assert out["sample_paths"].shape == (4, len(out["time_grid"]))
+    for name in SERIES:
+        assert len(out[name]) == len(out["time_grid"])
+        assert out[name].max() == summary[name].max()
+    assert len(summary["time_grid"]) == n_points
@@ -0,0 +1,60 @@
+import json
+
+import numpy as np
+import pytest
+
+from utils.encoding import ARROW_STREAM, MSGPACK, encode_arrow, encode_msgpack, negotiate
+
+SUMMARY = {
+    "time_grid": np.linspace(0, 1, 5),
+    "mean_path": np.array([0.04, 0.041, 0.042, 0.043, 0.044]),
+    "sample_paths": np.arange(10, dtype=float).reshape(2, 5) / 100,
+    "model": "vasicek",
+    "n_paths": 2,
+}
+
+
+@pytest.mark.parametrize("accept, expected", [
+    (None, None),
+    ("", None),
+    ("application/json", None),
+    ("*/*", None),
+    (ARROW_STREAM, ARROW_STREAM),
+    (f"{MSGPACK}, application/json", MSGPACK),
+    (f"application/json, {MSGPACK}", None),
+    (f"application/json;q=0.5, {MSGPACK}", MSGPACK),
+    (f"{ARROW_STREAM};q=0.2, {MSGPACK};q=0.9", MSGPACK),
+    (f"{ARROW_STREAM}, {MSGPACK}", ARROW_STREAM),
+    (f"{MSGPACK};q=0", None),
+    (f"{MSGPACK};q=oops, application/json;q=0.1", None),
+    (f"text/html, {ARROW_STREAM};q=0.5", ARROW_STREAM),
+    ("Application/X-Msgpack ; Q=0.8", MSGPACK),
+])
+def test_negotiate(accept, expected):
+    assert negotiate(accept) == expected
+
+
+def test_arrow_round_trip():
+    pa = pytest.importorskip("pyarrow")
+
+    body = encode_arrow(SUMMARY, {"pricing": {"bond": 0.95}})
+    table = pa.ipc.open_stream(body).read_all()
+
+    meta = json.loads(table.schema.metadata[b"summary"])
+    assert meta == {"model": "vasicek", "n_paths": 2, "pricing": {"bond": 0.95}}
+    np.testing.assert_array_equal(table.column("time_grid").to_numpy(), SUMMARY["time_grid"])
+    np.testing.assert_array_equal(table.column("mean_path").to_numpy(), SUMMARY["mean_path"])
+    for i, row in enumerate(SUMMARY["sample_paths"]):
+        np.testing.assert_array_equal(table.column(f"sample_paths_{i}").to_numpy(), row)
+
+
+def test_msgpack_round_trip():
+    msgpack = pytest.importorskip("msgpack")
+
+    decoded = msgpack.unpackb(encode_msgpack(SUMMARY, {"pricing": None}), raw=False)
+
+    assert decoded["meta"] == {"model": "vasicek", "n_paths": 2, "pricing": None}
+    for name in ("time_grid", "mean_path", "sample_paths"):
+        packed = decoded["arrays"][name]
+        values = np.frombuffer(packed["data"], dtype=packed["dtype"]).reshape(packed["shape"])
+        np.testing.assert_allclose(values, SUMMARY[name], rtol=1e-6)
@@ -0,0 +1,119 @@
+import threading
+
+import pandas as pd
+import pytest
+
+import utils.fred as fred
+from utils.fred import FredFetcher, refresh_window
+
+
+class FakeFred:
+    """Stands in for fredapi.Fred: counts calls and fails the first `failures` of each series."""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get_series(self, series_id, observation_start=None):
+        with self._lock:
+            self.calls.append((series_id, observation_start))
+            if self.calls.count((series_id, observation_start)) <= self.failures:
+                raise ConnectionError("boom")
+        dates = pd.date_range("2024-01-01", periods=10, freq="D")
+        series = pd.Series(range(10), index=dates.strftime("%Y-%m-%d"), dtype=float)
+        return series[series.index >= (observation_start or "")]
+
+
+class FakeTable:
+    def __init__(self, dates):
+        self.dates = dates
+
+    def select(self, *_):
+        return self
+
+    def order(self, *_, **__):
+        return self
+
+    def limit(self, *_):
+        return self
+
+    def execute(self):
+        return type("Response", (), {"data": [{"date": d} for d in sorted(self.dates, reverse=True)[:1]]})
+
+
+class FakeSupabase:
+    def __init__(self, dates):
+        self.dates = dates
+
+    def table(self, _):
+        return FakeTable(self.dates)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(fred, "BACKOFF_SECONDS", 0.0)
+
+
+def fetcher(tmp_path, client=None, **kwargs):
+    return FredFetcher(cache_dir=str(tmp_path), rate=0, client=client, **kwargs)
+
+
+def test_get_many_fetches_each_series_once(tmp_path):
+    client = FakeFred()
+    result = fetcher(tmp_path, client).get_many(["DGS10", "DGS2", "DGS10", "DGS2"], "2024-01-03")
+
+    assert list(result) == ["DGS10", "DGS2"]
+    assert sorted(client.calls) == [("DGS10", "2024-01-03"), ("DGS2", "2024-01-03")]
+    assert result["DGS10"].index[0] == pd.Timestamp("2024-01-03")
+    assert isinstance(result["DGS10"].index, pd.DatetimeIndex)
+
+
+def test_failed_requests_are_retried(tmp_path):
+    client = FakeFred(failures=2)
+    series = fetcher(tmp_path, client, retries=2).get_series("DGS10")
+    assert len(series) == 10
+    assert len(client.calls) == 3
+
+    with pytest.raises(ConnectionError):
+        fetcher(tmp_path, FakeFred(failures=3), retries=2).get_series("DGS10")
+
+
+def test_offline_replays_the_cache(tmp_path):
+    online = fetcher(tmp_path, FakeFred()).get_many(["DGS10", "FEDFUNDS"])
+
+    offline = fetcher(tmp_path, offline=True)
+    pd.testing.assert_series_equal(offline.get_series("DGS10"), online["DGS10"], check_freq=False)
+
+    # A later start is served from the full-history fetch, trimmed
+    trimmed = offline.get_series("FEDFUNDS", "2024-01-05")
+    pd.testing.assert_series_equal(trimmed, online["FEDFUNDS"]["2024-01-05":], check_freq=False)
+
+    with pytest.raises(LookupError):
+        offline.get_series("GDP")
+
+
+def test_offline_does_not_serve_a_later_start(tmp_path):
+    fetcher(tmp_path, FakeFred()).get_series("DGS10", "2024-01-05")
+    offline = fetcher(tmp_path, offline=True)
+
+    assert len(offline.get_series("DGS10", "2024-01-06")) == 5
+    with pytest.raises(LookupError):
+        offline.get_series("DGS10", "2024-01-01")
+    with pytest.raises(LookupError):
+        offline.get_series("DGS10")
+
+
+def test_refresh_window():
+    series = {"ten_year": ("DGS10", "daily"), "gdp": ("GDP", "quarterly")}
+    supabase = FakeSupabase(["2024-06-01", "2024-06-30T00:00:00+00:00"])
+
+    window_start, observation_start = refresh_window(supabase, "macro", series, history_days=365)
+    assert window_start == pd.Timestamp("2024-06-30") - pd.Timedelta(days=fred.LOOKBACK_DAYS["quarterly"])
+    assert observation_start == window_start - pd.Timedelta(days=365)
+
+    daily_only = refresh_window(supabase, "macro", {"ten_year": ("DGS10", "daily")}, history_days=0)
+    assert daily_only[0] == pd.Timestamp("2024-06-30") - pd.Timedelta(days=fred.LOOKBACK_DAYS["daily"])
+
+    assert refresh_window(FakeSupabase([]), "macro", series, 365) == (None, None)
+    assert refresh_window(supabase, "macro", series, 365, full_refresh=True) == (None, None)
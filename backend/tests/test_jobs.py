@@ -0,0 +1,202 @@
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from api.jobs import JobManager, MemoryJobStore, SQLiteJobStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryJobStore()
+    return SQLiteJobStore(str(tmp_path / "jobs.db"))
+
+
+def wait_for(manager, job_id, *statuses):
+    for _ in range(500):
+        job = manager.status(job_id)
+        if job["status"] in statuses:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job stuck in {job['status']}")
+
+
+class Steps:
+    """A job that reports progress one step at a time, as the test allows."""
+
+    def __init__(self, n=4):
+        self.n = n
+        self.allowed = threading.Semaphore(0)
+        self.reported = []
+
+    def __call__(self, payload, progress):
+        for i in range(1, self.n + 1):
+            assert self.allowed.acquire(timeout=5)
+            progress(i / self.n)
+            self.reported.append(i / self.n)
+        return {"payload": payload, "values": [1.5, 2.5]}
+
+
+def test_submit_progress_and_result(store):
+    manager = JobManager(store=store, workers=1)
+    job = Steps()
+    job_id = manager.submit(job, "abc")
+
+    job.allowed.release()
+    wait_for(manager, job_id, "running")
+    for _ in range(500):
+        if manager.status(job_id)["progress"] == 0.25:
+            break
+        time.sleep(0.01)
+    assert manager.status(job_id)["progress"] == 0.25
+    assert manager.in_flight == 1
+
+    for _ in range(3):
+        job.allowed.release()
+    done = wait_for(manager, job_id, "done")
+    assert done["progress"] == 1.0 and done["error"] is None
+    assert "result" not in done
+
+    result = manager.status(job_id, with_result=True)["result"]
+    assert result == {"payload": "abc", "values": [1.5, 2.5]}
+    for _ in range(500):
+        if manager.in_flight == 0:
+            break
+        time.sleep(0.01)
+    assert manager.in_flight == 0
+
+
+def test_failed_jobs_record_the_error(store):
+    manager = JobManager(store=store, workers=1)
+
+    def broken(progress):
+        raise ValueError("bad curve")
+
+    job = wait_for(manager, manager.submit(broken), "failed")
+    assert job["error"] == "ValueError: bad curve"
+
+
+def test_cancel_running_job_at_its_next_progress_report(store):
+    manager = JobManager(store=store, workers=1)
+    job = Steps()
+    job_id = manager.submit(job, None)
+    job.allowed.release()
+    wait_for(manager, job_id, "running")
+
+    assert manager.cancel(job_id)["status"] in ("running", "cancelled")
+    for _ in range(job.n):
+        job.allowed.release()
+    assert wait_for(manager, job_id, "cancelled", "done")["status"] == "cancelled"
+    assert len(job.reported) < job.n
+    assert manager.status(job_id, with_result=True)["result"] is None
+
+
+def test_cancel_queued_job_at_once(store):
+    manager = JobManager(store=store, workers=1)
+    blocker = Steps(n=1)
+    first = manager.submit(blocker, None)
+    second = manager.submit(Steps(n=1), None)
+
+    assert manager.cancel(second)["status"] == "cancelled"
+    blocker.allowed.release()
+    wait_for(manager, first, "done")
+    assert manager.status(second)["status"] == "cancelled"
+
+    # Cancelling a finished job changes nothing
+    assert manager.cancel(first)["status"] == "done"
+
+
+def test_unknown_job_is_404(store):
+    manager = JobManager(store=store)
+    with pytest.raises(HTTPException) as exc:
+        manager.status("nope")
+    assert exc.value.status_code == 404
+    with pytest.raises(HTTPException):
+        manager.cancel("nope")
+
+
+def test_queue_limit_rejects_with_retry_after(store):
+    manager = JobManager(store=store, workers=1, queue_limit=2)
+    jobs = [Steps(n=1), Steps(n=1)]
+    ids = [manager.submit(job, None) for job in jobs]
+
+    with pytest.raises(HTTPException) as exc:
+        manager.submit(Steps(n=1), None)
+    assert exc.value.status_code == 503
+    assert "Retry-After" in exc.value.headers
+
+    for job in jobs:
+        job.allowed.release()
+    for job_id in ids:
+        wait_for(manager, job_id, "done")
+    for _ in range(500):
+        if manager.in_flight == 0:
+            break
+        time.sleep(0.01)
+    assert manager.submit(lambda progress: {}) is not None
+
+
+def test_finished_jobs_expire_after_the_ttl(store):
+    manager = JobManager(store=store, workers=1, ttl=0.05)
+    finished = manager.submit(lambda progress: {"ok": True})
+    wait_for(manager, finished, "done")
+
+    running = Steps(n=1)
+    active = manager.submit(running, None)
+    time.sleep(0.1)
+
+    # Purging happens on submit and only drops jobs that are no longer active
+    manager.submit(lambda progress: {})
+    with pytest.raises(HTTPException):
+        manager.status(finished)
+    assert manager.status(active)["status"] in ("queued", "running")
+
+    running.allowed.release()
+    wait_for(manager, active, "done")
+
+
+def test_sqlite_store_survives_a_restart(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    manager = JobManager(store=SQLiteJobStore(path), workers=1)
+    job_id = manager.submit(lambda progress: {"price": 0.97})
+    wait_for(manager, job_id, "done")
+
+    reopened = JobManager(store=SQLiteJobStore(path))
+    job = reopened.status(job_id, with_result=True)
+    assert job["status"] == "done"
+    assert job["result"] == {"price": 0.97}
+
+
+def test_jobs_routes(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    import main
+
+    monkeypatch.setattr(main.offloader, "workers", 0)
+    monkeypatch.setattr(main, "job_manager", JobManager(store=MemoryJobStore(), workers=1))
+    body = {
+        "simulation": {"model": "vasicek", "r0": 0.03, "kappa": 0.5, "theta": 0.04, "sigma": 0.01,
+                       "T": 1.0, "dt": 1 / 52, "n_paths": 2_000, "chunk_size": 500},
+        "pricing": {"zcb_maturities": [1.0]},
+    }
+
+    with TestClient(main.app) as client:
+        submitted = client.post("/jobs", json=body)
+        assert submitted.status_code == 202
+        job_id = submitted.json()["job_id"]
+
+        for _ in range(500):
+            job = client.get(f"/jobs/{job_id}").json()
+            if job["status"] == "done":
+                break
+            time.sleep(0.01)
+        assert job["status"] == "done" and job["progress"] == 1.0
+
+        result = client.get(f"/jobs/{job_id}/result").json()
+        assert result["simulation"]["n_paths"] == 2_000
+        assert result["pricing"]["zcb"][0]["mean_price"] == pytest.approx(0.97, abs=0.01)
+
+        assert client.get("/jobs/missing").status_code == 404
+        assert client.delete(f"/jobs/{job_id}").json()["status"] == "done"
@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.local_store import LocalStore
+
+
+def _rows(dates, start=0.0):
+    return [{"date": f"{d}T00:00:00Z", "y_10y": start + i, "fed_funds": 0.05} for i, d in enumerate(dates)]
+
+
+class FakeSupabase:
+    """Stands in for fetch_rows: serves rows newer than the requested date."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def __call__(self, table, newer_than=None):
+        self.calls.append(newer_than)
+        if newer_than is None:
+            return list(self.rows)
+        return [r for r in self.rows if pd.Timestamp(r["date"]) > newer_than]
+
+
+def test_sync_is_incremental(tmp_path):
+    source = FakeSupabase(_rows(["2024-01-01", "2024-01-02", "2024-01-03"]))
+    store = LocalStore(root=str(tmp_path), fetch=source, revision_days={})
+
+    assert store.max_date("yield_curve_data") is None
+    assert store.sync("yield_curve_data") == 3
+
+    source.rows += _rows(["2024-01-04", "2024-01-05"], start=3.0)
+    assert store.sync("yield_curve_data") == 2
+    assert store.sync("yield_curve_data") == 0
+
+    assert source.calls[0] is None
+    assert source.calls[1] == pd.Timestamp("2024-01-03", tz="UTC")
+    assert store.max_date("yield_curve_data") == pd.Timestamp("2024-01-05", tz="UTC")
+
+
+@pytest.mark.parametrize("first, later", [(0.5, 3), (1, 2.5)])
+def test_sync_unifies_integer_and_float_batches(tmp_path, first, later):
+    source = FakeSupabase([{"date": "2024-01-01T00:00:00Z", "y_10y": first, "fed_funds": 0}])
+    store = LocalStore(root=str(tmp_path), fetch=source, revision_days={})
+    store.sync("yield_curve_data")
+
+    source.rows.append({"date": "2024-01-02T00:00:00Z", "y_10y": later, "fed_funds": 1})
+    assert store.sync("yield_curve_data") == 1
+
+    data = store.read("yield_curve_data", ["y_10y", "fed_funds"])
+    assert data["y_10y"].dtype == np.float64
+    np.testing.assert_array_equal(data["y_10y"], [first, later])
+    np.testing.assert_array_equal(data["fed_funds"], [0.0, 1.0])
+
+
+def test_sync_replaces_revised_rows_in_the_window(tmp_path):
+    dates = [str(d.date()) for d in pd.date_range("2024-01-01", periods=10)]
+    source = FakeSupabase(_rows(dates))
+    store = LocalStore(root=str(tmp_path), fetch=source, revision_days={"yield_curve_data": 3})
+    store.sync("yield_curve_data")
+
+    # The pipeline rewrote the last days with revised values and added one more day
+    source.rows = _rows(dates[:7]) + _rows(dates[7:], start=107.0) + _rows(["2024-01-11"], start=110.0)
+    assert store.sync("yield_curve_data") == 4
+    assert source.calls[1] == pd.Timestamp("2024-01-07", tz="UTC")
+
+    data = store.read("yield_curve_data", ["y_10y"])
+    np.testing.assert_array_equal(data["y_10y"], [0, 1, 2, 3, 4, 5, 6, 107, 108, 109, 110])
+    assert len(np.unique(data["date"])) == 11
+
+    # Tables without a revision window only fetch new dates
+    fits = FakeSupabase(_rows(dates))
+    store = LocalStore(root=str(tmp_path / "fits"), fetch=fits, revision_days={"yield_curve_data": 3})
+    store.sync("yield_curve_fits")
+    assert store.sync("yield_curve_fits") == 0
+    assert fits.calls[1] == pd.Timestamp("2024-01-10", tz="UTC")
+
+
+def test_read_returns_date_range_views(tmp_path):
+    dates = [str(d.date()) for d in pd.date_range("2024-01-01", periods=10)]
+    store = LocalStore(root=str(tmp_path), fetch=FakeSupabase(_rows(dates)))
+    store.sync("yield_curve_data")
+
+    data = store.read("yield_curve_data", ["y_10y"], start="2024-01-03", end="2024-01-05")
+
+    np.testing.assert_array_equal(data["y_10y"], [2.0, 3.0, 4.0])
+    assert data["date"][0] == np.datetime64("2024-01-03")
+    # Null-free numeric columns come straight from the memory map
+    assert not data["y_10y"].flags.owndata
+
+
+def test_write_frame_round_trip(tmp_path):
+    store = LocalStore(root=str(tmp_path), fetch=FakeSupabase([]))
+    index = pd.date_range("2020-01-01", periods=4, name="date")
+    df = pd.DataFrame({"kappa": [0.1, 0.2, np.nan, 0.4], "r0": [0.01, 0.02, 0.03, 0.04]}, index=index)
+
+    store.write_frame("calibration", df)
+    back = store.frame("calibration")
+
+    np.testing.assert_array_equal(back["kappa"].to_numpy(), df["kappa"].to_numpy())
+    np.testing.assert_array_equal(back["r0"].to_numpy(), df["r0"].to_numpy())
+    assert back.index[-1] == pd.Timestamp("2020-01-04", tz="UTC")
+    assert store.max_date("calibration") == pd.Timestamp("2020-01-04", tz="UTC")
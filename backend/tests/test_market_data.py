@@ -0,0 +1,114 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from models.market_data import CURVE_COLUMNS, CalibrationProvider
+
+
+def yield_frame(level):
+    dates = pd.date_range("2024-01-01", periods=30, freq="D")
+    columns = {"fed_funds": level + np.linspace(0, 0.5, 30), "y_10y": np.full(30, level + 1.0)}
+    columns.update({name: np.full(30, level + tenor / 10) for tenor, name in CURVE_COLUMNS.items()})
+    return pd.DataFrame(columns, index=dates)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeLoader:
+    """Returns frames at levels 1, 2, 3, ...; later loads block until released."""
+
+    def __init__(self):
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls > 1:
+            self.started.set()
+            assert self.release.wait(5)
+        return yield_frame(float(self.calls))
+
+
+def wait_for_refresh(provider):
+    for _ in range(500):
+        if not provider._refreshing:
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError("refresh did not finish")
+
+
+def test_loads_lazily_once():
+    loader = FakeLoader()
+    provider = CalibrationProvider(loader=loader, ttl=60, clock=Clock())
+    assert loader.calls == 0
+
+    assert provider.defaults()["theta"] == 2.0
+    provider.frame()
+    provider.defaults()
+    assert loader.calls == 1
+
+
+def test_stale_data_is_served_during_the_background_refresh():
+    loader, clock = FakeLoader(), Clock()
+    provider = CalibrationProvider(loader=loader, ttl=60, clock=clock)
+    first = provider.frame()
+
+    clock.now = 30.0
+    assert provider.frame() is first
+    assert loader.calls == 1
+
+    clock.now = 61.0
+    assert provider.frame() is first  # starts the refresh and returns at once
+    assert loader.started.wait(5)
+    assert provider.frame() is first  # still loading: stale data, no second refresh
+    assert provider.defaults()["theta"] == 2.0
+    assert loader.calls == 2
+
+    loader.release.set()
+    wait_for_refresh(provider)
+
+    assert provider.defaults()["theta"] == 3.0
+    assert provider.frame()["fed_funds"].iloc[0] == 2.0
+
+    # Fresh again from the refresh time, so no further load
+    clock.now = 100.0
+    provider.frame()
+    assert loader.calls == 2
+
+
+def test_failed_refresh_keeps_the_old_data_and_retries(monkeypatch):
+    errors = []
+    monkeypatch.setattr(threading, "excepthook", lambda args: errors.append(args.exc_value))
+    clock = Clock()
+    outcomes = [yield_frame(1.0), RuntimeError("offline"), yield_frame(5.0)]
+
+    def loader():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    provider = CalibrationProvider(loader=loader, ttl=60, clock=clock)
+    first = provider.frame()
+    clock.now = 61.0
+    assert provider.frame() is first
+    wait_for_refresh(provider)
+    assert provider._df is first
+    for _ in range(500):
+        if errors:
+            break
+        threading.Event().wait(0.01)
+    assert isinstance(errors[0], RuntimeError)
+
+    # Still stale, so the next read tries again
+    provider.frame()
+    wait_for_refresh(provider)
+    assert provider.defaults()["theta"] == 6.0
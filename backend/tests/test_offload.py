@@ -0,0 +1,67 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import HTTPException
+
+from api.offload import LOCAL, Offloader
+
+
+def whoami():
+    return os.getpid(), threading.current_thread().name
+
+
+def test_local_jobs_run_in_this_process():
+    offloader = Offloader(workers=2, queue_limit=4)
+    try:
+        pid, thread = offloader.call(whoami, local=True)
+        assert pid == os.getpid()
+        assert thread != threading.current_thread().name
+        assert isinstance(offloader._pools[LOCAL], ThreadPoolExecutor)
+        assert list(offloader._pools) == [LOCAL]  # no worker process was started
+        assert offloader.in_flight == 0
+    finally:
+        offloader.shutdown()
+
+
+def test_pools_are_created_once_under_concurrency():
+    offloader = Offloader(workers=0, queue_limit=4)
+    barrier = threading.Barrier(8)
+    pools = []
+
+    def grab():
+        barrier.wait()
+        pools.append(offloader._pool(0))
+
+    threads = [threading.Thread(target=grab) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len({id(pool) for pool in pools}) == 1
+    offloader.shutdown()
+
+
+def test_queue_limit_and_shutdown():
+    offloader = Offloader(workers=0, queue_limit=1)
+    release = threading.Event()
+    future, _ = offloader.submit(release.wait, 5)
+
+    with pytest.raises(HTTPException) as exc:
+        offloader.submit(whoami, local=True)
+    assert exc.value.status_code == 503
+
+    release.set()
+    future.result()
+    while offloader.in_flight:  # the slot is released by a done callback
+        threading.Event().wait(0.01)
+    assert asyncio.run(offloader.run(whoami))[0] == os.getpid()
+
+    offloader.shutdown()
+    assert offloader._pools == {}
+    # A fresh pool is started on the next submit
+    assert offloader.call(whoami)[0] == os.getpid()
+    offloader.shutdown()
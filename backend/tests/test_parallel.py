@@ -0,0 +1,29 @@
+import numpy as np
+
+import api.parallel as parallel
+from api.parallel import block_layout, fits_in_memory, simulate_rates_parallel
+
+PARAMS = dict(r0=0.04, kappa=0.3, theta=0.04, sigma=0.01, T=1.0, dt=1 / 52, n_paths=2_500, seed=11)
+
+
+def test_block_layout_covers_every_path_once():
+    blocks = block_layout(2_500, 1_000)
+    assert blocks == [(0, 1_000), (1_000, 2_000), (2_000, 2_500)]
+
+
+def test_results_do_not_depend_on_the_worker_count(monkeypatch):
+    monkeypatch.setattr(parallel, "MAX_WORKERS", 2)
+    serial = simulate_rates_parallel("vasicek", PARAMS, n_workers=1)
+    pooled = simulate_rates_parallel("vasicek", PARAMS, n_workers=2)
+    clamped = simulate_rates_parallel("vasicek", PARAMS, n_workers=64)
+
+    for other in (pooled, clamped):
+        np.testing.assert_array_equal(serial["rates"], other["rates"])
+        np.testing.assert_array_equal(serial["discount_factors"], other["discount_factors"])
+    assert parallel._pool()._max_workers == 2
+
+
+def test_fits_in_memory(monkeypatch):
+    monkeypatch.setattr(parallel, "MAX_RESULT_BYTES", 2 * 100 * 11 * 8)
+    assert fits_in_memory(100, 10)
+    assert not fits_in_memory(101, 10)
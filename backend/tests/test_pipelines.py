@@ -0,0 +1,118 @@
+import importlib
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import utils.local_store as local_store
+from indicators_pipeline import macro_data
+from utils.fred import FredFetcher, refresh_window
+from yield_pipeline import yield_data
+
+PIPELINES = [
+    (yield_data, yield_data.DATA),
+    (macro_data, macro_data.MACRO_INDICATORS),
+]
+
+
+class FakeFred:
+    """Stands in for fredapi.Fred: every series is a slow daily ramp over 2022-2024."""
+
+    def get_series(self, series_id, observation_start=None):
+        dates = pd.date_range("2022-01-01", "2024-06-30", freq="D")
+        series = pd.Series(100 + 0.01 * np.arange(len(dates)), index=dates.strftime("%Y-%m-%d"))
+        return series[series.index >= (observation_start or "")]
+
+
+class FakeTable:
+    def __init__(self, db):
+        self.db = db
+
+    def select(self, *_):
+        return self
+
+    def order(self, *_, **__):
+        return self
+
+    def limit(self, *_):
+        return self
+
+    def upsert(self, data, **kwargs):
+        self.db.upserts.append((data, kwargs))
+        return self
+
+    def execute(self):
+        return type("Response", (), {"data": [{"date": d} for d in self.db.dates[-1:]]})
+
+
+class FakeSupabase:
+    """Reports `dates` as already stored and records every upsert."""
+
+    def __init__(self, dates=()):
+        self.dates = list(dates)
+        self.upserts = []
+
+    def table(self, _):
+        return FakeTable(self)
+
+
+def offline_fetcher(tmp_path, series_dict):
+    # A full-history online fetch leaves every series in the cache; the pipeline then replays it
+    ids = [series_id for series_id, _ in series_dict.values()]
+    FredFetcher(cache_dir=str(tmp_path), rate=0, client=FakeFred()).get_many(ids)
+    return FredFetcher(cache_dir=str(tmp_path), rate=0, offline=True)
+
+
+def today():
+    return pd.Timestamp.now("UTC").normalize().strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+@pytest.mark.parametrize("module", [yield_data, macro_data])
+def test_import_has_no_side_effects(monkeypatch, module):
+    def fail():
+        raise AssertionError("Supabase client created at import")
+
+    monkeypatch.setattr(local_store, "supabase_client", fail)
+    importlib.reload(module)
+    monkeypatch.undo()
+    importlib.reload(module)
+
+
+@pytest.mark.parametrize("module, series_dict", PIPELINES)
+def test_full_load_from_the_offline_cache(tmp_path, module, series_dict):
+    client = FakeSupabase()
+    module.run(fred=offline_fetcher(tmp_path, series_dict), client=client)
+
+    [(data, kwargs)] = client.upserts
+    assert kwargs == {"on_conflict": "date", "ignore_duplicates": True}
+
+    df = pd.DataFrame(data)
+    expected = set(module.COLUMNS.values()) | ({"quarter"} if module is macro_data else set())
+    assert set(df.columns) == expected
+    assert df["date"].is_unique and df["date"].is_monotonic_increasing
+    assert df["date"].iloc[-1] == today()
+    assert not df.isna().any().any()
+
+    # The 12-month CPI change needs a year of monthly history; everything else starts at once
+    first = "2022-01-13" if module is macro_data else "2022-01-01"
+    assert df["date"].iloc[0] == f"{first}T00:00:00Z"
+
+
+@pytest.mark.parametrize("module, series_dict", PIPELINES)
+def test_incremental_run_matches_the_full_load(tmp_path, module, series_dict):
+    fred = offline_fetcher(tmp_path, series_dict)
+    full = FakeSupabase()
+    module.run(fred=fred, client=full)
+
+    incremental = FakeSupabase(["2024-06-01T00:00:00Z"])
+    module.run(fred=fred, client=incremental)
+
+    [(data, kwargs)] = incremental.upserts
+    assert kwargs == {"on_conflict": "date", "ignore_duplicates": False}
+
+    window_start, _ = refresh_window(incremental, module.TABLE, series_dict, module.HISTORY_DAYS)
+    assert data[0]["date"] == window_start.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    # The window is recomputed from its own history exactly as the full load computed it
+    full_rows = [row for row in full.upserts[0][0] if row["date"] >= data[0]["date"]]
+    assert data == full_rows
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from models.recursion import ar1_paths
+
+
+def _loop(r0, a, innovations):
+    rates = np.empty((innovations.shape[0], innovations.shape[1] + 1))
+    rates[:, 0] = r0
+    for t in range(innovations.shape[1]):
+        rates[:, t + 1] = a * rates[:, t] + innovations[:, t]
+    return rates
+
+
+@pytest.mark.parametrize("a", [0.0, 0.5, 0.999, 1.0])
+def test_matches_the_step_by_step_recursion(a):
+    innovations = np.random.default_rng(0).standard_normal((50, 300)) * 0.01
+    np.testing.assert_allclose(ar1_paths(0.03, a, innovations), _loop(0.03, a, innovations), atol=1e-12)
+
+
+def test_constant_innovations_converge_to_the_fixed_point():
+    a, c = 0.9, 0.004
+    rates = ar1_paths(0.1, a, np.full((3, 400), c))
+    t = np.arange(401)
+    np.testing.assert_allclose(rates[0], c / (1 - a) + (0.1 - c / (1 - a)) * a**t, atol=1e-12)
+
+
+def test_unit_response_variance():
+    # With unit shocks the stationary variance of X(t+1) = a X(t) + Z is 1 / (1 - a^2)
+    a = 0.8
+    rates = ar1_paths(0.0, a, np.random.default_rng(1).standard_normal((100_000, 40)))
+    assert rates[:, -1].var() == pytest.approx(1 / (1 - a**2), rel=0.02)
+    assert abs(rates[:, -1].mean()) < 4 * np.sqrt(1 / (1 - a**2) / 100_000)
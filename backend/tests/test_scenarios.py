@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from api.scenarios import scenario_grid, simulate_grid
+from api.simulate import simulate_rates
+from api.streaming import PERCENTILES, percentile_bands
+
+BASE = dict(r0=0.03, theta=0.04, T=2.0, dt=1 / 52, n_paths=500, seed=3)
+
+
+def test_scenario_grid_is_row_major():
+    assert scenario_grid({"kappa": [0.1, 0.2], "sigma": [1, 2, 3]}) == [
+        {"kappa": 0.1, "sigma": 1}, {"kappa": 0.1, "sigma": 2}, {"kappa": 0.1, "sigma": 3},
+        {"kappa": 0.2, "sigma": 1}, {"kappa": 0.2, "sigma": 2}, {"kappa": 0.2, "sigma": 3},
+    ]
+
+
+@pytest.mark.parametrize("n_paths", [1, 2, 101, 1_000])
+def test_percentile_bands_match_numpy(n_paths):
+    rates = np.random.default_rng(n_paths).standard_normal((n_paths, 30))
+    np.testing.assert_allclose(percentile_bands(rates), np.percentile(rates, PERCENTILES, axis=0), rtol=0, atol=1e-15)
+
+
+@pytest.mark.parametrize("model_name, sigmas, scheme", [
+    ("vasicek", [0.01, 0.02], "euler"),
+    ("vasicek", [0.01, 0.02], "exact"),
+    ("cir", [0.05, 0.1], "euler"),
+    ("cir", [0.05, 0.1], "qe"),
+])
+def test_grid_matches_single_runs(model_name, sigmas, scheme):
+    scenario_params = [
+        {**BASE, "scheme": scheme, **scenario}
+        for scenario in scenario_grid({"kappa": [0.2, 0.5, 0.2], "sigma": sigmas})
+    ]
+
+    seen = []
+    for i, simulation in simulate_grid(model_name, scenario_params):
+        single = simulate_rates(model_name, scenario_params[i])
+        np.testing.assert_allclose(simulation["rates"], single["rates"], rtol=0, atol=1e-14)
+        np.testing.assert_allclose(simulation["discount_factors"], single["discount_factors"], rtol=1e-13)
+        np.testing.assert_array_equal(simulation["time_grid"], single["time_grid"])
+        if "percentile_bands" in simulation:
+            np.testing.assert_allclose(simulation["percentile_bands"], percentile_bands(single["rates"]), atol=1e-14)
+        seen.append(i)
+
+    assert sorted(seen) == list(range(len(scenario_params)))
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from api.simulate import simulate_rates
+from main import _bump_points, _build_model_params, _price_in_memory
+from pricing.analytic import cir_zcb, vasicek_zcb
+from utils.requests import PricingRequest, SimulationRequest
+
+VASICEK = dict(model="vasicek", r0=0.03, kappa=0.5, theta=0.04, sigma=0.02, scheme="exact")
+FELLER = np.sqrt(2 * 0.5 * 0.04)  # sigma with 2 kappa theta = sigma^2
+H = 1e-5
+
+
+def price(maturities=(1.0, 5.0), **fields):
+    req = SimulationRequest(**{"T": 5.0, "dt": 1 / 52, "n_paths": 4_000, "seed": 1, **fields})
+    params = _build_model_params(req)
+    pr = PricingRequest(zcb_maturities=list(maturities), control_variate=True, sensitivities=True)
+    return _price_in_memory(simulate_rates(req.model, params), req.model, params, pr), params
+
+
+def derivative(zcb, T, params, name):
+    up, down = dict(params), dict(params)
+    up[name] += H
+    down[name] -= H
+    return (zcb(T, **up) - zcb(T, **down)) / (2 * H)
+
+
+def test_vasicek_sensitivities_match_the_analytic_bond():
+    resp, params = price(**VASICEK)
+
+    for z in resp.zcb:
+        s = z.sensitivities
+        assert s.delta == pytest.approx(derivative(vasicek_zcb, z.maturity, params, "r0"), rel=0.01)
+        assert s.dv01 == pytest.approx(-s.delta * 1e-4)
+        assert s.vega == pytest.approx(derivative(vasicek_zcb, z.maturity, params, "sigma"), rel=0.05)
+        assert s.mean_reversion == pytest.approx(derivative(vasicek_zcb, z.maturity, params, "kappa"), rel=0.02)
+
+
+def test_common_random_numbers_keep_the_greeks_stable_across_seeds():
+    greeks = [price(maturities=[5.0], **VASICEK, seed=seed)[0].zcb[0].sensitivities for seed in (1, 2, 3)]
+
+    deltas = [g.delta for g in greeks]
+    vegas = [g.vega for g in greeks]
+    assert np.std(deltas) < 1e-3 * abs(np.mean(deltas))
+    assert np.std(vegas) < 0.05 * abs(np.mean(vegas))
+
+
+def test_bumps_are_central_away_from_the_bounds():
+    _, params = price(**VASICEK)
+    points = _bump_points("vasicek", params)
+
+    assert set(points) == {"r0", "sigma", "kappa"}
+    for name, (up, down) in points.items():
+        assert up - params[name] == pytest.approx(params[name] - down)
+
+    # Vasicek rates may go negative, so r0 is bumped both ways even at zero
+    assert _bump_points("vasicek", {**params, "r0": 0.0})["r0"] == (1e-4, -1e-4)
+
+
+def test_sigma_near_zero_is_bumped_one_sided():
+    resp, params = price(**{**VASICEK, "sigma": 5e-5})
+    assert _bump_points("vasicek", params)["sigma"] == (pytest.approx(1.5e-4), 5e-5)
+
+    s = resp.zcb[1].sensitivities
+    one_sided = (vasicek_zcb(5.0, **{**params, "sigma": 1.5e-4}) - vasicek_zcb(5.0, **params)) / 1e-4
+    assert np.isfinite(s.vega)
+    assert s.vega == pytest.approx(one_sided, abs=2e-3)
+    assert s.delta == pytest.approx(derivative(vasicek_zcb, 5.0, params, "r0"), rel=0.01)
+
+
+def test_cir_at_the_feller_edge():
+    resp, params = price(model="cir", r0=0.03, kappa=0.5, theta=0.04, sigma=FELLER, scheme="qe")
+
+    for z in resp.zcb:
+        s = z.sensitivities
+        assert all(np.isfinite([s.delta, s.vega, s.mean_reversion]))
+        assert s.delta == pytest.approx(derivative(cir_zcb, z.maturity, params, "r0"), rel=0.02)
+    assert resp.zcb[1].sensitivities.vega == pytest.approx(derivative(cir_zcb, 5.0, params, "sigma"), rel=0.1)
+
+
+def test_cir_short_rate_near_zero_is_bumped_one_sided():
+    resp, params = price(model="cir", r0=5e-5, kappa=0.5, theta=0.04, sigma=FELLER, scheme="qe")
+    assert _bump_points("cir", params)["r0"] == (pytest.approx(1.5e-4), 5e-5)
+
+    # Weekly QE steps next to zero carry a little discretisation bias
+    s = resp.zcb[1].sensitivities
+    assert s.delta == pytest.approx(derivative(cir_zcb, 5.0, {**params, "r0": 1e-4}, "r0"), rel=0.05)
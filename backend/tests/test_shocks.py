@@ -0,0 +1,60 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from models.shocks import SAMPLING_METHODS, brownian_bridge, make_rng, normal_shocks
+
+
+@pytest.mark.parametrize("n_steps", [1, 2, 7, 16, 52])
+def test_brownian_bridge_increments_are_iid_standard_normal(n_steps):
+    normals = make_rng(0).standard_normal((100_000, n_steps))
+    dW = brownian_bridge(normals)
+
+    assert dW.shape == normals.shape
+    np.testing.assert_allclose(dW.mean(axis=0), 0.0, atol=0.02)
+    np.testing.assert_allclose(np.atleast_2d(np.cov(dW, rowvar=False)), np.eye(n_steps), atol=0.03)
+
+
+def test_brownian_bridge_terminal_value_uses_the_first_normal():
+    normals = make_rng(1).standard_normal((10, 9))
+    dW = brownian_bridge(normals)
+    np.testing.assert_allclose(dW.sum(axis=1), 3.0 * normals[:, 0])
+
+
+@pytest.mark.parametrize("method", SAMPLING_METHODS)
+@pytest.mark.parametrize("n_paths", [4_096, 5_000])
+def test_shock_moments(method, n_paths):
+    Z = normal_shocks(n_paths, 12, make_rng(2), method)
+
+    assert Z.shape == (n_paths, 12)
+    assert np.isfinite(Z).all()
+    np.testing.assert_allclose(Z.mean(axis=0), 0.0, atol=0.05)
+    np.testing.assert_allclose(Z.var(axis=0), 1.0, atol=0.08)
+
+
+def test_antithetic_paths_come_in_pairs():
+    Z = normal_shocks(7, 5, make_rng(3), "antithetic")
+    np.testing.assert_array_equal(Z[:3], -Z[4:7])
+
+
+def test_sobol_mean_error_beats_pseudo_random():
+    errors = {}
+    for method in ("pseudo", "sobol"):
+        Z = normal_shocks(4_096, 8, make_rng(4), method)
+        errors[method] = np.abs(Z.sum(axis=1).mean())
+    assert errors["sobol"] < errors["pseudo"]
+
+
+def test_same_seed_gives_same_shocks():
+    for method in SAMPLING_METHODS:
+        np.testing.assert_array_equal(
+            normal_shocks(100, 10, make_rng(5), method),
+            normal_shocks(100, 10, make_rng(5), method),
+        )
+
+
+def test_sobol_does_not_change_global_warning_filters():
+    before = list(warnings.filters)
+    normal_shocks(100, 4, make_rng(6), "sobol")
+    assert warnings.filters == before
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from api.streaming import MomentAccumulator, PathReservoir, QuantileHistogram, simulate_streaming
+
+
+def test_moment_accumulator_matches_the_full_sample():
+    x = np.random.default_rng(0).normal(3.0, 2.0, size=(10_000, 4))
+    acc = MomentAccumulator(4)
+    for chunk in np.array_split(x, 7):
+        acc.update(chunk)
+
+    np.testing.assert_allclose(acc.mean, x.mean(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(acc.std, x.std(axis=0), rtol=1e-10)
+
+
+def test_histogram_percentiles_are_within_a_bin():
+    rng = np.random.default_rng(2)
+    chunks = [rng.standard_normal((2_000, 5)) for _ in range(10)]
+    hist = QuantileHistogram(chunks[0])
+    for chunk in chunks:
+        hist.update(chunk)
+
+    exact = np.percentile(np.vstack(chunks), 50, axis=0)
+    assert np.all(np.abs(hist.percentile(50) - exact) < hist.width)
+
+
+def test_reservoir_keeps_k_distinct_paths():
+    reservoir = PathReservoir(20, seed=3)
+    for start in range(0, 1_000, 100):
+        reservoir.update(np.arange(start, start + 100, dtype=float)[:, None])
+
+    assert reservoir.paths.shape == (20, 1)
+    assert len(np.unique(reservoir.paths)) == 20
+    assert reservoir.paths.max() >= 100  # later chunks are sampled too
+
+
+def test_chunked_run_converges_to_the_model_mean():
+    params = dict(r0=0.05, kappa=0.5, theta=0.03, sigma=0.01, T=2.0, dt=1 / 12, n_paths=20_000, seed=4)
+    result = simulate_streaming("vasicek", params, chunk_size=3_000)
+
+    t = result["time_grid"]
+    expected = 0.03 + 0.02 * (1 - 0.5 / 12) ** np.arange(len(t))
+    assert result["n_paths_done"] == 20_000
+    assert result["terminal_mean"] == pytest.approx(expected[-1], abs=4 * result["terminal_std"] / np.sqrt(20_000))
+    np.testing.assert_allclose(result["mean_rate"], expected, atol=2e-4)
@@ -0,0 +1,43 @@
+import numpy as np
+
+from models.vasicek import expected_vasicek, simulate_vasicek
+
+PARAMS = dict(r0=0.05, kappa=0.8, theta=0.03, sigma=0.02, T=5.0, n_paths=40_000, seed=7)
+
+
+def test_exact_scheme_matches_transition_moments_on_a_coarse_grid():
+    # The exact transition is right for any step, so half-year steps must still hit the closed form
+    rates = simulate_vasicek(**PARAMS, dt=0.5, scheme="exact")
+    kappa, theta, sigma, r0 = PARAMS["kappa"], PARAMS["theta"], PARAMS["sigma"], PARAMS["r0"]
+    t = np.arange(rates.shape[1]) * 0.5
+
+    mean = theta + (r0 - theta) * np.exp(-kappa * t)
+    var = sigma**2 * (1 - np.exp(-2 * kappa * t)) / (2 * kappa)
+
+    se = np.sqrt(var[1:] / PARAMS["n_paths"])
+    assert np.all(np.abs(rates[:, 1:].mean(axis=0) - mean[1:]) < 4 * se)
+    np.testing.assert_allclose(rates[:, 1:].var(axis=0), var[1:], rtol=0.03)
+    assert rates[:, 0].tolist() == [r0] * PARAMS["n_paths"]
+
+
+def test_exact_scheme_has_the_right_autocorrelation():
+    rates = simulate_vasicek(**PARAMS, dt=0.25, scheme="exact")
+    a = np.exp(-PARAMS["kappa"] * 0.25)
+
+    x, y = rates[:, 8], rates[:, 9]
+    slope = np.cov(x, y)[0, 1] / x.var(ddof=1)
+    assert abs(slope - a) < 0.02
+
+
+def test_expected_rates_match_both_schemes():
+    for scheme in ("euler", "exact"):
+        rates = simulate_vasicek(**PARAMS, dt=1 / 12, scheme=scheme)
+        expected = expected_vasicek(**PARAMS, dt=1 / 12, scheme=scheme)
+        se = rates.std(axis=0)[1:] / np.sqrt(PARAMS["n_paths"])
+        assert np.all(np.abs(rates.mean(axis=0)[1:] - expected[1:]) < 5 * se)
+
+
+def test_seeded_runs_are_reproducible():
+    a = simulate_vasicek(**PARAMS, dt=0.5, scheme="exact")
+    b = simulate_vasicek(**PARAMS, dt=0.5, scheme="exact")
+    np.testing.assert_array_equal(a, b)
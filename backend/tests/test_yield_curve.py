@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from models.yield_curve import YieldCurve, _cached_curve, yield_curve
+
+MATURITIES = np.array([0.25, 0.5, 1, 2, 3, 5, 7, 10, 20, 30], dtype=float)
+ZERO_RATES = np.array([0.052, 0.051, 0.049, 0.045, 0.043, 0.041, 0.041, 0.042, 0.045, 0.044])
+T = np.linspace(0.01, 40, 2_000)
+
+
+@pytest.fixture
+def curve():
+    return YieldCurve(MATURITIES, ZERO_RATES)
+
+
+def test_reprices_the_input_tenors(curve):
+    np.testing.assert_allclose(curve.zero(MATURITIES), ZERO_RATES, rtol=1e-12)
+    np.testing.assert_allclose(curve.discount(MATURITIES), np.exp(-ZERO_RATES * MATURITIES), rtol=1e-12)
+    assert curve.discount(0.0) == pytest.approx(1.0)
+
+
+def test_discount_zero_and_forward_are_consistent(curve):
+    np.testing.assert_allclose(curve.discount(T), np.exp(-curve.zero(T) * T), rtol=1e-12)
+
+    # f = -d log P / dt, checked by central differences
+    h = 1e-5
+    numeric = -(curve.log_discount(T + h) - curve.log_discount(T - h)) / (2 * h)
+    inside = np.abs(T - np.round(T / 0.25) * 0.25) > 1e-3  # away from the knots
+    np.testing.assert_allclose(curve.forward(T)[inside], numeric[inside], atol=1e-7)
+
+    # log P(0, t) = -integral of f over [0, t]
+    grid = np.linspace(0, 10, 100_001)
+    integral = np.concatenate(([0.0], np.cumsum((curve.forward(grid[1:]) + curve.forward(grid[:-1])) / 2 * np.diff(grid))))
+    np.testing.assert_allclose(-integral[::10_000], curve.log_discount(grid[::10_000]), atol=1e-8)
+
+
+def test_dforward_matches_finite_differences(curve):
+    h = 1e-6
+    t = np.linspace(0.05, 29.9, 500)
+    knots = np.concatenate(([0.0], MATURITIES))
+    smooth = np.min(np.abs(t[:, None] - knots[None, :]), axis=1) > 1e-3
+    numeric = (curve.forward(t + h) - curve.forward(t - h)) / (2 * h)
+    np.testing.assert_allclose(curve.dforward(t)[smooth], numeric[smooth], rtol=1e-4, atol=1e-6)
+
+
+def test_flat_forward_beyond_the_last_tenor(curve):
+    beyond = np.array([30.0, 31.0, 45.0, 100.0])
+    last_forward = curve.forward(30.0)
+
+    np.testing.assert_allclose(curve.forward(beyond), last_forward)
+    np.testing.assert_array_equal(curve.dforward(beyond[1:]), 0.0)
+    np.testing.assert_allclose(
+        curve.log_discount(beyond), curve.log_discount(30.0) - last_forward * (beyond - 30.0), rtol=1e-12
+    )
+    # The discount curve is continuous across the last tenor
+    assert curve.discount(30.0 + 1e-9) == pytest.approx(curve.discount(30.0 - 1e-9), rel=1e-9)
+
+
+def test_curve_starting_at_zero():
+    curve = YieldCurve([0.0, 1.0, 5.0], [0.03, 0.035, 0.04])
+    np.testing.assert_allclose(curve.zero([1.0, 5.0]), [0.035, 0.04])
+    assert curve.discount(0.0) == 1.0
+    assert np.isfinite(curve.zero(0.0))
+
+
+def test_monotone_log_discount_for_positive_rates(curve):
+    assert np.all(np.diff(curve.log_discount(T)) < 0)
+
+
+def test_curves_are_memoised_on_their_values():
+    _cached_curve.cache_clear()
+    first = yield_curve(MATURITIES, ZERO_RATES)
+
+    assert yield_curve(MATURITIES.tolist(), list(ZERO_RATES)) is first
+    assert yield_curve(MATURITIES.astype(np.float32).astype(np.float64), ZERO_RATES) is first
+    assert yield_curve(MATURITIES, ZERO_RATES + 1e-4) is not first
+
+    info = _cached_curve.cache_info()
+    assert (info.hits, info.misses) == (2, 2)
+    np.testing.assert_array_equal(first.zero_rates, ZERO_RATES)
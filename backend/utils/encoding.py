@@ -0,0 +1,95 @@
+import json
+
+import numpy as np
+
+# Binary encodings of the simulation summary, chosen from the Accept header.
+# Arrays go out as raw buffers; scalars and any pricing results travel as JSON
+# metadata alongside them.
+#
+#   application/vnd.apache.arrow.stream  one float64 record batch, one column per
+#                                        series and per sample path; metadata under
+#                                        the "summary" schema key
+#   application/x-msgpack                {"meta": {...}, "arrays": {name: {"dtype",
+#                                        "shape", "data"}}} with float32 buffers
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+MSGPACK = "application/x-msgpack"
+BINARY_MEDIA_TYPES = (ARROW_STREAM, MSGPACK)
+SUPPORTED = BINARY_MEDIA_TYPES + ("application/json", "application/*", "*/*")
+
+
+def _weighted(accept: str):
+    """(q, media type) for each entry of an Accept header; malformed q-values count as 0."""
+    for part in accept.split(","):
+        media_type, *params = (piece.strip() for piece in part.split(";"))
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        yield q, media_type.lower()
+
+
+def negotiate(accept: str | None) -> str | None:
+    """The binary media type the client prefers, or None for the JSON default.
+
+    The supported type with the highest q-value wins (the first listed on ties);
+    JSON and wildcards mean JSON.
+    """
+    if not accept:
+        return None
+    best_q, best = 0.0, None
+    for q, media_type in _weighted(accept):
+        if media_type in SUPPORTED and q > best_q:
+            best_q, best = q, media_type
+    return best if best in BINARY_MEDIA_TYPES else None
+
+
+def _split(summary: dict):
+    arrays = {k: v for k, v in summary.items() if isinstance(v, np.ndarray)}
+    meta = {k: v for k, v in summary.items() if not isinstance(v, np.ndarray)}
+    return arrays, meta
+
+
+def encode_arrow(summary: dict, extra_meta: dict | None = None) -> bytes:
+    import pyarrow as pa
+
+    arrays, meta = _split(summary)
+
+    columns = {}
+    for name, values in arrays.items():
+        if values.ndim == 2:
+            for i, row in enumerate(values):
+                columns[f"{name}_{i}"] = pa.array(np.ascontiguousarray(row, dtype=np.float64))
+        else:
+            columns[name] = pa.array(np.asarray(values, dtype=np.float64))
+
+    schema_meta = {"summary": json.dumps({**meta, **(extra_meta or {})})}
+    batch = pa.RecordBatch.from_pydict(columns).replace_schema_metadata(schema_meta)
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+def encode_msgpack(summary: dict, extra_meta: dict | None = None) -> bytes:
+    import msgpack
+
+    arrays, meta = _split(summary)
+
+    packed = {}
+    for name, values in arrays.items():
+        values = np.ascontiguousarray(values, dtype="<f4")
+        packed[name] = {"dtype": "<f4", "shape": list(values.shape), "data": values.tobytes()}
+
+    return msgpack.packb({"meta": {**meta, **(extra_meta or {})}, "arrays": packed}, use_bin_type=True)
+
+
+ENCODERS = {
+    ARROW_STREAM: encode_arrow,
+    MSGPACK: encode_msgpack,
+}
@@ -0,0 +1,175 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+# Shared FRED fetch layer for the ingestion pipelines. Series IDs are
+# de-duplicated and fetched concurrently on a small thread pool, with request
+# starts spaced to stay under FRED's rate limit and failed requests retried with
+# exponential backoff. Every response is also written to an on-disk cache keyed
+# by (series, observation_start), so a run can be replayed without network access:
+#
+#   FRED_OFFLINE=1       serve only from the cache (missing series raise)
+#   FRED_CACHE_DIR       cache location (default backend/.cache/fred)
+#   FRED_WORKERS         concurrent requests
+#   FRED_REQUESTS_PER_SECOND
+#
+# In offline mode a request with no exact cache entry is served from any cached
+# fetch of the same series that started earlier, trimmed to the requested start.
+#
+# Incremental runs (refresh_window) re-fetch a look-back window before the last
+# stored date so FRED revisions are picked up. Monthly and quarterly prints land
+# and are revised one to several months after their observation date, so the
+# window reaches back the longest look-back of the frequencies in the run.
+# FRED_FULL_REFRESH=1 rebuilds the whole table.
+
+CACHE_DIR = os.getenv(
+    "FRED_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "fred"),
+)
+OFFLINE = os.getenv("FRED_OFFLINE") == "1"
+WORKERS = int(os.getenv("FRED_WORKERS", 4))
+REQUESTS_PER_SECOND = float(os.getenv("FRED_REQUESTS_PER_SECOND", 2))  # FRED allows 120 per minute
+RETRIES = 4
+BACKOFF_SECONDS = 1.0
+
+FULL_REFRESH = os.getenv("FRED_FULL_REFRESH") == "1"
+LOOKBACK_DAYS = {
+    "daily": int(os.getenv("FRED_LOOKBACK_DAYS", 14)),
+    "monthly": 120,
+    "quarterly": 210,  # the third GDP estimate lands about five months after the quarter starts
+}
+
+
+class RateLimiter:
+    """Spaces request starts at least 1/rate seconds apart across threads."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        time.sleep(max(start - now, 0.0))
+
+
+def _start_key(observation_start) -> str:
+    return "all" if observation_start is None else pd.Timestamp(observation_start).strftime("%Y-%m-%d")
+
+
+class FredFetcher:
+    def __init__(
+        self,
+        api_key=None,
+        cache_dir=CACHE_DIR,
+        offline=OFFLINE,
+        workers=WORKERS,
+        rate=REQUESTS_PER_SECOND,
+        retries=RETRIES,
+        client=None,
+    ):
+        self.api_key = api_key
+        self.cache_dir = cache_dir
+        self.offline = offline
+        self.workers = workers
+        self.retries = retries
+        self._limiter = RateLimiter(rate)
+        self._client = client
+
+    def _fred(self):
+        if self._client is None:
+            from fredapi import Fred
+
+            self._client = Fred(api_key=self.api_key)
+        return self._client
+
+    def _path(self, series_id, observation_start):
+        return os.path.join(self.cache_dir, f"{series_id}_{_start_key(observation_start)}.csv")
+
+    def _read_cache(self, series_id, observation_start):
+        path = self._path(series_id, observation_start)
+        if os.path.exists(path):
+            return _read_series(path, series_id)
+        if not self.offline or not os.path.isdir(self.cache_dir):
+            return None
+
+        # Offline: any earlier-starting fetch of the same series covers the request
+        requested = _start_key(observation_start)
+        prefix = f"{series_id}_"
+        for name in sorted(os.listdir(self.cache_dir)):
+            start = name[len(prefix):-4] if name.startswith(prefix) and name.endswith(".csv") else None
+            if start is not None and (start == "all" or (requested != "all" and start <= requested)):
+                series = _read_series(os.path.join(self.cache_dir, name), series_id)
+                return series if observation_start is None else series[series.index >= pd.Timestamp(observation_start)]
+        return None
+
+    def _write_cache(self, series_id, observation_start, series):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(series_id, observation_start)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        series.rename(series_id).to_csv(tmp, index_label="date")
+        os.replace(tmp, path)
+
+    def get_series(self, series_id, observation_start=None) -> pd.Series:
+        cached = self._read_cache(series_id, observation_start) if self.offline else None
+        if cached is not None:
+            return cached
+        if self.offline:
+            raise LookupError(f"FRED series {series_id} (from {_start_key(observation_start)}) is not cached.")
+
+        for attempt in range(self.retries + 1):
+            self._limiter.wait()
+            try:
+                series = self._fred().get_series(series_id=series_id, observation_start=observation_start)
+                break
+            except Exception:
+                if attempt == self.retries:
+                    raise
+                time.sleep(BACKOFF_SECONDS * 2**attempt)
+
+        series.index = pd.to_datetime(series.index)
+        self._write_cache(series_id, observation_start, series)
+        return series
+
+    def get_many(self, series_ids, observation_start=None) -> dict[str, pd.Series]:
+        """Each distinct series fetched once, concurrently."""
+        unique = list(dict.fromkeys(series_ids))
+        with ThreadPoolExecutor(max_workers=max(min(self.workers, len(unique)), 1)) as pool:
+            fetched = pool.map(lambda series_id: self.get_series(series_id, observation_start), unique)
+            return dict(zip(unique, fetched))
+
+
+def _read_series(path, series_id) -> pd.Series:
+    frame = pd.read_csv(path, index_col="date", parse_dates=["date"])
+    series = frame[series_id]
+    series.name = series.index.name = None  # match what fredapi returns
+    return series
+
+
+def last_stored_date(supabase, table):
+    rows = supabase.table(table).select("date").order("date", desc=True).limit(1).execute().data
+    if not rows:
+        return None
+    last = pd.Timestamp(rows[0]["date"])
+    return last.tz_convert(None) if last.tzinfo is not None else last
+
+
+def refresh_window(supabase, table, series_dict, history_days, full_refresh=FULL_REFRESH):
+    """(window_start, observation_start) of an incremental run, or (None, None) for a full load.
+
+    series_dict maps column names to (series_id, frequency); history_days is what
+    the transforms need before the window (e.g. a year for 12-month changes).
+    """
+    last_date = None if full_refresh else last_stored_date(supabase, table)
+    if last_date is None:
+        return None, None
+
+    lookback = max(LOOKBACK_DAYS[freq] for _, freq in series_dict.values())
+    window_start = (last_date - pd.Timedelta(days=lookback)).normalize()
+    return window_start, window_start - pd.Timedelta(days=history_days)
@@ -0,0 +1,165 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from dotenv import load_dotenv
+
+from utils.fred import LOOKBACK_DAYS
+
+# Local columnar mirror of the Supabase tables. Each table lives in one
+# uncompressed Arrow IPC file so reads are memory-mapped and columns come back
+# as zero-copy NumPy views. Syncs fetch rows newer than the cached max date
+# minus the table's revision window, and replace the cached rows in that window,
+# so revisions the ingestion pipelines upsert over recent dates reach the mirror.
+
+STORE_DIR = os.getenv(
+    "LOCAL_STORE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache"),
+)
+TABLES = ("yield_curve_data", "macro_indicators", "yield_curve_fits")
+# Days before the cached max date to re-fetch: the longest look-back
+# (utils/fred.py) the table's pipeline rewrites. Curve fits are never revised.
+REVISION_DAYS = {
+    "yield_curve_data": LOOKBACK_DAYS["monthly"],
+    "macro_indicators": LOOKBACK_DAYS["quarterly"],
+}
+PAGE_SIZE = 1000
+
+
+def supabase_client():
+    from supabase import create_client
+
+    load_dotenv()
+    return create_client(f"https://{os.getenv('SUPABASE_HOST')}", os.getenv("SUPABASE_SERVICE_ROLE_KEY"))
+
+
+def fetch_rows(table: str, newer_than: pd.Timestamp | None = None, client=None) -> list[dict]:
+    """Page rows from Supabase in date order, optionally only those after `newer_than`."""
+    client = client or supabase_client()
+
+    rows = []
+    offset = 0
+    while True:
+        query = client.table(table).select("*").order("date")
+        if newer_than is not None:
+            query = query.gt("date", newer_than.strftime("%Y-%m-%dT%H:%M:%SZ"))
+        response = query.range(offset, offset + PAGE_SIZE - 1).execute()
+        if not response.data:
+            break
+        rows.extend(response.data)
+        offset += PAGE_SIZE
+
+    return rows
+
+
+def _as_datetime64(value) -> np.datetime64:
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert("UTC").tz_localize(None)
+    return np.datetime64(ts, "s")
+
+
+def _contiguous(column: pa.ChunkedArray) -> pa.Array:
+    # Files are written as a single record batch, so this is normally a no-op
+    return column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+
+
+class LocalStore:
+    """On-disk Arrow copy of Supabase tables with incremental sync."""
+
+    def __init__(self, root: str = STORE_DIR, fetch=fetch_rows, revision_days=REVISION_DAYS):
+        self.root = root
+        self._fetch = fetch
+        self.revision_days = revision_days
+
+    def path(self, table: str) -> str:
+        return os.path.join(self.root, f"{table}.arrow")
+
+    def exists(self, table: str) -> bool:
+        return os.path.exists(self.path(table))
+
+    def _open(self, table: str) -> pa.Table:
+        # Memory-mapped: buffers point straight into the page cache
+        with pa.memory_map(self.path(table), "r") as source:
+            return pa.ipc.open_file(source).read_all()
+
+    def max_date(self, table: str) -> pd.Timestamp | None:
+        if not self.exists(table):
+            return None
+        dates = self._open(table).column("date")
+        if len(dates) == 0:
+            return None
+        return pd.Timestamp(dates[-1].as_py())
+
+    def sync(self, table: str) -> int:
+        """Fetch rows from the revision window on and replace the cached ones. Returns the rows fetched."""
+        last = self.max_date(table)
+        cutoff = None if last is None else last - pd.Timedelta(days=self.revision_days.get(table, 0))
+        rows = self._fetch(table, cutoff)
+        if not rows:
+            return 0
+
+        df = pd.DataFrame(rows)
+        df["date"] = pd.to_datetime(df["date"], utc=True).astype("datetime64[s, UTC]")
+        # JSON drops the fraction of whole numbers, so a batch can arrive as int64
+        # for a column stored as double; Arrow will not unify the two
+        numeric = df.select_dtypes("number").columns
+        df[numeric] = df[numeric].astype("float64")
+        new = pa.Table.from_pandas(df, preserve_index=False)
+
+        if cutoff is not None:
+            # Cached rows up to the cutoff are kept; everything after it comes from the fetch
+            cached = self._open(table)
+            dates = _contiguous(cached.column("date")).to_numpy(zero_copy_only=True)
+            keep = np.searchsorted(dates, _as_datetime64(cutoff), "right")
+            new = pa.concat_tables([cached.slice(0, keep), new], promote_options="default")
+
+        self._write(table, new)
+        return len(rows)
+
+    def _write(self, table: str, data: pa.Table):
+        # Written beside the live file and swapped in, so readers never see a partial file
+        os.makedirs(self.root, exist_ok=True)
+        tmp = self.path(table) + ".tmp"
+        with pa.OSFile(tmp, "wb") as sink:
+            with pa.ipc.new_file(sink, data.schema) as writer:
+                writer.write_table(data.combine_chunks())
+        os.replace(tmp, self.path(table))
+
+    def write_frame(self, table: str, df: pd.DataFrame):
+        """Replace a locally derived table (not synced from Supabase) with a date-indexed frame."""
+        df = df.rename_axis("date").reset_index()
+        df["date"] = pd.to_datetime(df["date"], utc=True).astype("datetime64[s, UTC]")
+        self._write(table, pa.Table.from_pandas(df, preserve_index=False))
+
+    def sync_all(self) -> dict:
+        return {table: self.sync(table) for table in TABLES}
+
+    def read(self, table: str, columns: list[str], start=None, end=None) -> dict[str, np.ndarray]:
+        """Column arrays for dates in [start, end], zero-copy wherever the column has no nulls."""
+        data = self._open(table)
+
+        dates = _contiguous(data.column("date")).to_numpy(zero_copy_only=True)
+        lo = 0 if start is None else np.searchsorted(dates, _as_datetime64(start), "left")
+        hi = len(dates) if end is None else np.searchsorted(dates, _as_datetime64(end), "right")
+
+        out = {"date": dates[lo:hi]}
+        for name in columns:
+            column = _contiguous(data.column(name)).slice(lo, hi - lo)
+            # Numeric columns without nulls are views; nulls/booleans fall back to a copy
+            out[name] = column.to_numpy(zero_copy_only=False)
+        return out
+
+    def frame(self, table: str) -> pd.DataFrame:
+        """Whole table as a date-sorted DataFrame indexed by date."""
+        df = self._open(table).to_pandas()
+        df.set_index("date", inplace=True)
+        return df.sort_index()
+
+
+local_store = LocalStore()
+
+
+if __name__ == "__main__":
+    print(local_store.sync_all())
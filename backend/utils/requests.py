@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Literal, Optional
 
 
 class YieldCurveInput(BaseModel):
@@ -27,8 +27,34 @@ class SimulationRequest(BaseModel):
     sigma: float = Field(..., description="Volatility")
     T: float = Field(5.0, gt=0, description="Simulation horizon in years")
     dt: float = Field(1 / 252, gt=0, description="Time step (default daily)")
-    n_paths: int = Field(500, ge=1, le=10_000, description="Number of Monte-Carlo paths")
+    n_paths: int = Field(500, ge=1, le=1_000_000, description="Number of Monte-Carlo paths (above 10,000 runs chunked, unless n_workers is set and the paths fit in memory)")
     seed: Optional[int] = Field(42, description="Random seed for reproducibility")
+    chunk_size: Optional[int] = Field(
+        None,
+        ge=100,
+        le=10_000,
+        description="Simulate in chunks of this many paths with online statistics (bounded memory)",
+    )
+    n_workers: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Spread path blocks across this many worker processes, up to the CPU count (results do not depend on the count)",
+    )
+    sampling: str = Field(
+        "pseudo",
+        pattern="^(pseudo|antithetic|sobol)$",
+        description="Shock generation: 'pseudo', 'antithetic' pairs or scrambled 'sobol' with a Brownian bridge",
+    )
+    scheme: str = Field(
+        "euler",
+        pattern="^(euler|exact|qe)$",
+        description="Discretisation scheme: 'euler', the model's exact transition (vasicek, cir, hull_white) or quadratic-exponential (cir)",
+    )
+    max_points: Optional[int] = Field(
+        None,
+        ge=10,
+        description="Downsample the plotted series to at most this many points (statistics still use the full grid)",
+    )
 
     # Vasicek / CIR specific
     kappa: Optional[float] = Field(None, description="Mean-reversion speed (Vasicek, CIR)")
@@ -62,9 +88,55 @@ class PricingRequest(BaseModel):
         0.5,
         description="Payment frequency in years (0.5 = semi-annual)",
     )
+    control_variate: bool = Field(
+        False,
+        description="Correct ZCB and swap estimators with analytic control variates (vasicek, hull_white, ho_lee)",
+    )
+    sensitivities: bool = Field(
+        False,
+        description="Bump-and-revalue r0, sigma and kappa/alpha sensitivities on the same shocks (in-memory runs); vega is far less noisy with control_variate",
+    )
 
 
 class SimulateAndPriceRequest(BaseModel):
     """Combined request: run simulation then price instruments in one call."""
     simulation: SimulationRequest
-    pricing: PricingRequest
\ No newline at end of file
+    pricing: PricingRequest
+
+
+class InstrumentBook(BaseModel):
+    """Columnar instrument table for /price-book: every column has one entry per instrument."""
+    instrument_type: list[Literal["zcb", "fra", "swap", "bond"]] = Field(
+        ...,
+        description="Instrument kind for each row",
+    )
+    notional: list[float] = Field(..., description="Notional (negative flips the side)")
+    maturity: list[float] = Field(..., description="Final cashflow date in years")
+    start: Optional[list[float]] = Field(
+        None,
+        description="Accrual start for FRAs and forward-starting swaps/bonds (default 0)",
+    )
+    rate: Optional[list[float]] = Field(
+        None,
+        description="Fixed rate: FRA strike, swap fixed rate or bond coupon (default 0)",
+    )
+    frequency: Optional[list[float]] = Field(
+        None,
+        description="Coupon / fixed-leg period in years for swaps and bonds (default 0.5)",
+    )
+
+
+class BookRequest(BaseModel):
+    """Simulate once and value a whole instrument book against the shared discount factors."""
+    simulation: SimulationRequest
+    book: InstrumentBook
+
+
+class ScenarioGridRequest(BaseModel):
+    """Run one model over a parameter grid, every scenario driven by the same shocks."""
+    simulation: SimulationRequest
+    grid: dict[str, list[float]] = Field(
+        ...,
+        description="Values per parameter (r0, sigma, and kappa/theta or alpha as the model allows); scenarios are their Cartesian product",
+    )
+    pricing: Optional[PricingRequest] = None
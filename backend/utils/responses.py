@@ -30,10 +30,22 @@ class SimulationResponse(BaseModel):
     terminal_std: float
 
 
+class Sensitivities(BaseModel):
+    """Central finite differences on common random numbers."""
+    delta: float = Field(..., description="d value / d r0")
+    dv01: float = Field(..., description="Change in value for a 1bp fall in r0")
+    vega: float = Field(..., description="d value / d sigma")
+    mean_reversion: Optional[float] = Field(None, description="d value / d kappa (vasicek, cir) or d alpha (hull_white)")
+
+
 class ZCBResult(BaseModel):
     maturity: float
     mean_price: float
     std_price: float
+    std_error: Optional[float] = None
+    analytic_price: Optional[float] = None
+    variance_reduction: Optional[float] = None
+    sensitivities: Optional[Sensitivities] = None
 
 
 class ForwardResult(BaseModel):
@@ -41,11 +53,14 @@ class ForwardResult(BaseModel):
     T2: float
     mean_forward: float
     std_forward: float
+    std_error: Optional[float] = None
+    sensitivities: Optional[Sensitivities] = None
 
 
 class SwapResult(BaseModel):
     maturity: float
     par_rate: float
+    sensitivities: Optional[Sensitivities] = None
 
 
 class PricingResponse(BaseModel):
@@ -56,4 +71,43 @@ class PricingResponse(BaseModel):
 
 class SimulateAndPriceResponse(BaseModel):
     simulation: SimulationResponse
-    pricing: PricingResponse
\ No newline at end of file
+    pricing: PricingResponse
+
+
+class BookResponse(BaseModel):
+    n_instruments: int
+    n_cashflow_dates: int
+    values: list[float] = Field(..., description="Present value per instrument, in input order")
+    total: float
+    totals_by_type: dict[str, float]
+
+
+class JobStatus(BaseModel):
+    """Returned by the /jobs endpoints; fetch the result from /jobs/{job_id}/result once done."""
+    job_id: str
+    status: str = Field(..., description="'queued', 'running', 'done', 'failed' or 'cancelled'")
+    progress: float = Field(..., description="Fraction of paths simulated so far (chunked runs only)")
+    created_at: float
+    updated_at: float
+    error: Optional[str] = None
+
+
+class ScenarioResult(BaseModel):
+    params: dict[str, float] = Field(..., description="The grid values of this scenario")
+    simulation: SimulationResponse
+    pricing: Optional[PricingResponse] = None
+
+
+class ScenarioGridResponse(BaseModel):
+    n_scenarios: int
+    scenarios: list[ScenarioResult]
+
+
+class CalibrationResponse(BaseModel):
+    """Rolling-window fit of a mean-reverting model, as of the end of its window."""
+    model: str
+    as_of: str
+    r0: Optional[float] = Field(None, description="Short rate at the end of the window; None where it is missing")
+    kappa: Optional[float] = Field(None, description="None where the window shows no mean reversion")
+    theta: Optional[float] = None
+    sigma: Optional[float] = None
@@ -0,0 +1,260 @@
+import numpy as np
+import pandas as pd
+
+from utils.local_store import fetch_rows, supabase_client
+
+# Nelson-Siegel and Svensson fits for every date of yield_curve_data, stored in
+# the yield_curve_fits table (one row per date). Run from backend/ with
+#
+#   python -m yield_pipeline.curve_fitting
+#
+# Only dates newer than the last stored fit are fitted. All dates are solved
+# together: the decay parameters start from a batched grid search (the betas are
+# linear, so each grid point is one batched least-squares solve; Svensson
+# searches (tau1, tau2) pairs, since holding the NS tau misses two-hump curves), then a
+# Levenberg-Marquardt loop refines every date at once with per-date damping.
+# Each date is also restarted from the previous date's solution (the last
+# stored fit, for the first new date) and keeps whichever fit is better.
+#
+#   NS        y(m) = b0 + b1 L1(m/tau) + b2 L2(m/tau)
+#   Svensson  NS + b3 L2(m/tau2)
+#   L1(x) = (1 - e^-x) / x,  L2(x) = L1(x) - e^-x
+#
+# Taus are fitted on a log scale and kept in [TAU_MIN, TAU_MAX] years.
+
+TABLE = "yield_curve_fits"
+SOURCE = "yield_curve_data"
+
+TENORS = {
+    "y_1m": 1 / 12,
+    "y_3m": 0.25,
+    "y_6m": 0.5,
+    "y_1y": 1,
+    "y_2y": 2,
+    "y_3y": 3,
+    "y_5y": 5,
+    "y_7y": 7,
+    "y_10y": 10,
+    "y_20y": 20,
+    "y_30y": 30,
+}
+
+TAU_MIN, TAU_MAX = 0.05, 30.0
+TAU_GRID = np.geomspace(0.1, 20.0, 24)
+MAX_ITER = 100
+TOLERANCE = 1e-10
+UPLOAD_PAGE = 1000
+
+NS_COLUMNS = ["ns_beta0", "ns_beta1", "ns_beta2", "ns_tau"]
+SV_COLUMNS = ["sv_beta0", "sv_beta1", "sv_beta2", "sv_beta3", "sv_tau1", "sv_tau2"]
+
+
+def _loadings(m, tau):
+    """L1, L2 and their derivatives with respect to log(tau), shape (dates, tenors)."""
+    x = m[None, :] / tau[:, None]
+    decay = np.exp(-x)
+    L1 = -np.expm1(-x) / x
+    L2 = L1 - decay
+
+    dL1 = decay / x - L1 / x
+    dL2 = dL1 + decay
+    return L1, L2, -x * dL1, -x * dL2
+
+
+def _unpack(theta, svensson):
+    if svensson:
+        return theta[:, :4], np.exp(theta[:, 4]), np.exp(theta[:, 5])
+    return theta[:, :3], np.exp(theta[:, 3]), None
+
+
+def _residuals_and_jacobian(theta, m, y, w, svensson):
+    betas, tau1, tau2 = _unpack(theta, svensson)
+    L1, L2, dL1, dL2 = _loadings(m, tau1)
+
+    fitted = betas[:, [0]] + betas[:, [1]] * L1 + betas[:, [2]] * L2
+    columns = [np.ones_like(L1), L1, L2]
+    if svensson:
+        _, M2, _, dM2 = _loadings(m, tau2)
+        fitted += betas[:, [3]] * M2
+        columns.append(M2)
+        columns.append(betas[:, [1]] * dL1 + betas[:, [2]] * dL2)
+        columns.append(betas[:, [3]] * dM2)
+    else:
+        columns.append(betas[:, [1]] * dL1 + betas[:, [2]] * dL2)
+
+    J = np.stack(columns, axis=2) * w[:, :, None]
+    return (fitted - y) * w, J
+
+
+def _linear_betas(design, y, w):
+    """Batched weighted least squares for the betas given fixed loadings (dates, tenors, k)."""
+    A = design * w[:, :, None]
+    b = y * w
+    H = np.einsum("nki,nkj->nij", A, A) + 1e-10 * np.eye(A.shape[2])
+    g = np.einsum("nki,nk->ni", A, b)
+    betas = np.linalg.solve(H, g[:, :, None])[:, :, 0]
+    sse = ((np.einsum("nkj,nj->nk", A, betas) - b) ** 2).sum(axis=1)
+    return betas, sse
+
+
+def _grid_start(m, y, w, svensson, ns_theta=None):
+    """Best grid tau (or (tau1, tau2) pair) per date with betas solved exactly.
+
+    Svensson pairs come from the full 2-D grid plus every tau2 against the
+    date's NS tau, so the start is never worse than the NS fit.
+    """
+    n = len(y)
+    best_sse = np.full(n, np.inf)
+    best = np.zeros((n, 6 if svensson else 4))
+
+    if svensson:
+        ns_tau = np.exp(ns_theta[:, 3])
+        grid = [(np.full(n, t1), np.full(n, t2)) for t1 in TAU_GRID for t2 in TAU_GRID if t1 != t2]
+        grid += [(ns_tau, np.full(n, t2)) for t2 in TAU_GRID]
+    else:
+        grid = [(np.full(n, tau),) for tau in TAU_GRID]
+
+    for taus in grid:
+        L1, L2 = _loadings(m, taus[0])[:2]
+        columns = [np.ones_like(L1), L1, L2]
+        if svensson:
+            columns.append(_loadings(m, taus[1])[1])
+
+        betas, sse = _linear_betas(np.stack(columns, axis=2), y, w)
+        if svensson:
+            # tau2 too close to tau1 makes the two humps indistinguishable
+            sse = np.where(np.abs(np.log(taus[1] / taus[0])) < 0.2, np.inf, sse)
+
+        better = sse < best_sse
+        best_sse = np.where(better, sse, best_sse)
+        best[better] = np.column_stack([betas[better], *(np.log(tau[better]) for tau in taus)])
+
+    return best
+
+
+def levenberg_marquardt(theta, m, y, w, svensson):
+    """Refine every date's parameters at once; each date keeps its own damping."""
+    n_params = theta.shape[1]
+    log_tau = slice(4, 6) if svensson else slice(3, 4)
+    lam = np.full(len(theta), 1e-3)
+
+    r, J = _residuals_and_jacobian(theta, m, y, w, svensson)
+    sse = (r**2).sum(axis=1)
+    active = np.ones(len(theta), dtype=bool)
+
+    for _ in range(MAX_ITER):
+        if not active.any():
+            break
+
+        H = np.einsum("nki,nkj->nij", J[active], J[active])
+        g = np.einsum("nki,nk->ni", J[active], r[active])
+        damped = H + lam[active, None, None] * (np.eye(n_params) * np.diagonal(H, axis1=1, axis2=2)[:, None, :] + 1e-12 * np.eye(n_params))
+        step = np.linalg.solve(damped, -g[:, :, None])[:, :, 0]
+
+        candidate = theta[active] + step
+        candidate[:, log_tau] = np.clip(candidate[:, log_tau], np.log(TAU_MIN), np.log(TAU_MAX))
+        r_new, J_new = _residuals_and_jacobian(candidate, m, y[active], w[active], svensson)
+        sse_new = (r_new**2).sum(axis=1)
+
+        idx = np.flatnonzero(active)
+        accept = sse_new < sse[idx]
+        converged = ~accept & (lam[idx] > 1e8) | accept & (sse[idx] - sse_new <= TOLERANCE * (1 + sse[idx]))
+
+        keep = idx[accept]
+        theta[keep], r[keep], J[keep], sse[keep] = candidate[accept], r_new[accept], J_new[accept], sse_new[accept]
+        lam[keep] /= 3
+        lam[idx[~accept]] *= 4
+        active[idx[converged]] = False
+
+    return theta, sse
+
+
+def _fit(m, y, w, svensson, start, previous=None):
+    """LM from the grid start, then again from the previous date's solution; best of both."""
+    theta, sse = levenberg_marquardt(start, m, y, w, svensson)
+
+    warm = np.roll(theta, 1, axis=0)
+    warm[0] = previous if previous is not None else theta[0]
+    warm_theta, warm_sse = levenberg_marquardt(warm, m, y, w, svensson)
+
+    better = warm_sse < sse
+    theta[better], sse[better] = warm_theta[better], warm_sse[better]
+    return theta, sse
+
+
+def fit_curves(df: pd.DataFrame, previous: dict | None = None) -> pd.DataFrame:
+    """NS and Svensson parameters (plus RMSE) for every row of a yield table indexed by date."""
+    columns = [c for c in TENORS if c in df.columns]
+    m = np.array([TENORS[c] for c in columns])
+    y = df[columns].to_numpy(dtype=float)
+    w = np.isfinite(y).astype(float)
+    y = np.nan_to_num(y)
+
+    prev_ns = prev_sv = None
+    if previous is not None:
+        # A model stored as nulls (its fit failed) gets no warm start
+        prev_ns = np.array([previous[c] for c in NS_COLUMNS], dtype=float)
+        prev_sv = np.array([previous[c] for c in SV_COLUMNS], dtype=float)
+        prev_ns[3], prev_sv[4:] = np.log(prev_ns[3]), np.log(prev_sv[4:])
+        prev_ns = prev_ns if np.isfinite(prev_ns).all() else None
+        prev_sv = prev_sv if np.isfinite(prev_sv).all() else None
+
+    ns, ns_sse = _fit(m, y, w, False, _grid_start(m, y, w, False), prev_ns)
+    sv, sv_sse = _fit(m, y, w, True, _grid_start(m, y, w, True, ns), prev_sv)
+
+    n_obs = np.maximum(w.sum(axis=1), 1)
+    out = pd.DataFrame(index=df.index)
+    out[NS_COLUMNS] = np.column_stack([ns[:, :3], np.exp(ns[:, 3])])
+    out["ns_rmse"] = np.sqrt(ns_sse / n_obs)
+    out[SV_COLUMNS] = np.column_stack([sv[:, :4], np.exp(sv[:, 4:])])
+    out["sv_rmse"] = np.sqrt(sv_sse / n_obs)
+
+    # A date with fewer yields than parameters has no fit
+    out.loc[n_obs < len(NS_COLUMNS), NS_COLUMNS + ["ns_rmse"]] = np.nan
+    out.loc[n_obs < len(SV_COLUMNS), SV_COLUMNS + ["sv_rmse"]] = np.nan
+    return out
+
+
+def _records(fits: pd.DataFrame) -> list[dict]:
+    """Upload rows: a model whose fit failed is stored as nulls, a date where both failed is skipped."""
+    fits = fits.copy()
+    fitted = []
+    for columns in (NS_COLUMNS + ["ns_rmse"], SV_COLUMNS + ["sv_rmse"]):
+        ok = np.isfinite(fits[columns].to_numpy()).all(axis=1)
+        fits.loc[~ok, columns] = np.nan
+        fitted.append(ok)
+
+    fits = fits[fitted[0] | fitted[1]]
+    fits = fits.astype(object).where(fits.notna(), None)
+    return fits.reset_index().to_dict(orient="records")
+
+
+def _latest_fit(client) -> dict | None:
+    rows = client.table(TABLE).select("*").order("date", desc=True).limit(1).execute().data
+    return rows[0] if rows else None
+
+
+def run():
+    client = supabase_client()
+
+    previous = _latest_fit(client)
+    newer_than = pd.Timestamp(previous["date"]) if previous else None
+    rows = fetch_rows(SOURCE, newer_than, client)
+    if not rows:
+        print("Curve fits are up to date.")
+        return
+
+    df = pd.DataFrame(rows).set_index("date").sort_index()
+    fits = fit_curves(df, previous)
+
+    records = _records(fits)
+    if len(records) < len(fits):
+        print(f"Skipping {len(fits) - len(records)} dates without a fit.")
+    print(f"Uploading {len(records)} fits.")
+    for start in range(0, len(records), UPLOAD_PAGE):
+        client.table(TABLE).upsert(records[start:start + UPLOAD_PAGE], on_conflict="date").execute()
+    print("Uploaded.")
+
+
+if __name__ == "__main__":
+    run()
@@ -1,24 +1,20 @@
-from fredapi import Fred
-import pandas as pd
-import ssl, certifi
-import plotly.graph_objects as go
 import os
-from dotenv import load_dotenv
-from supabase import create_client
-
-# Creating SSL Context for FRED API
-ssl_context = ssl.create_default_context(cafile=certifi.where())
 
-# Initialising Supabase HTTPS connection
-load_dotenv()
-
-HOST = os.getenv("SUPABASE_HOST")
-fred = Fred(api_key=os.getenv("FRED_API_KEY"))
+import pandas as pd
+from dotenv import load_dotenv
 
-url = f"https://{HOST}"
-key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+from utils.fred import FredFetcher, refresh_window
+from utils.local_store import supabase_client
 
-supabase = create_client(url, key)
+# Daily US-Treasury yields and the Fed Funds rate from FRED, upserted into the
+# yield_curve_data table. Run from backend/ with
+#
+#   python -m yield_pipeline.yield_data
+#
+# Incremental runs re-fetch a look-back window before the last stored date (see
+# utils/fred.py) plus the history the transforms need, then upsert just that window.
+TABLE = "yield_curve_data"
+HISTORY_DAYS = 62  # FedFunds is monthly: the forward fill needs the observation before the window
 
 # Importing US-Treasury yield data from the FRED API
 TREASURY_MATURITIES = {
@@ -36,16 +32,35 @@ TREASURY_MATURITIES = {
 }
 
 ADDITIONALS = {
-    "FedFunds": ("FEDFUNDS", "daily")
+    "FedFunds": ("FEDFUNDS", "monthly")
 }
 
 DATA = {**TREASURY_MATURITIES, **ADDITIONALS}
 
-def download_fred_series(series_dict):
+# Renaming columns to match Supabase schema
+COLUMNS = {
+    "Date": "date",
+    "1M": "y_1m",
+    "3M": "y_3m",
+    "6M": "y_6m",
+    "1Y": "y_1y",
+    "2Y": "y_2y",
+    "3Y": "y_3y",
+    "5Y": "y_5y",
+    "7Y": "y_7y",
+    "10Y": "y_10y",
+    "20Y": "y_20y",
+    "30Y": "y_30y",
+    "FedFunds": "fed_funds"
+}
+
+def download_fred_series(fred, series_dict, observation_start=None):
     df_list = []
+    # Each distinct series is fetched once, concurrently, and shared between columns
+    fetched = fred.get_many([series_id for series_id, _ in series_dict.values()], observation_start)
+
     for name, (series_id, freq) in series_dict.items():
-        series = fred.get_series(series_id=series_id)
-        series.index = pd.to_datetime(series.index)
+        series = fetched[series_id]
 
         s = pd.DataFrame(series, columns=[name])
         s[name] = series
@@ -61,51 +76,50 @@ def download_fred_series(series_dict):
 
     return df
 
-df = download_fred_series(DATA)
+def to_records(df, window_start=None):
+    """Supabase rows from the downloaded series, forward filled to today."""
+    full_range = pd.date_range(
+        start=df.index.min(), 
+        end=pd.Timestamp.now("UTC").normalize().replace(tzinfo=None), 
+        freq="D"
+    )
 
-# Forward filling to today's date
-full_range = pd.date_range(
-    start=df.index.min(), 
-    end=pd.Timestamp.utcnow().normalize().replace(tzinfo=None), 
-    freq="D"
-)
+    df = df.reindex(full_range).rename_axis("date").reset_index()
 
-df = df.reindex(full_range).rename_axis("date").reset_index()
+    # Dealing with the 1 NaN FedFunds value at the start 
+    df["FedFunds"] = df["FedFunds"].bfill()
 
-# Dealing with the 1 NaN FedFunds value at the start 
-df["FedFunds"] = df["FedFunds"].bfill()
+    df = df.ffill()
 
-df = df.ffill()
+    df = df.rename(columns=COLUMNS)
 
-# Renaming columns to match Supabase schema
-df = df.rename(columns={
-    "Date": "date",
-    "1M": "y_1m",
-    "3M": "y_3m",
-    "6M": "y_6m",
-    "1Y": "y_1y",
-    "2Y": "y_2y",
-    "3Y": "y_3y",
-    "5Y": "y_5y",
-    "7Y": "y_7y",
-    "10Y": "y_10y",
-    "20Y": "y_20y",
-    "30Y": "y_30y",
-    "FedFunds": "fed_funds"
-})
+    # Keeping only the window being (re)written
+    if window_start is not None:
+        df = df[df["date"] >= window_start]
+
+    # Formatting date column
+    df["date"] = pd.to_datetime(df["date"]).dt.tz_localize("UTC")
+    df["date"] = df["date"].dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    df = df.dropna()
+
+    return df.to_dict(orient="records")
+
+def run(fred=None, client=None):
+    load_dotenv()
+    fred = fred or FredFetcher(api_key=os.getenv("FRED_API_KEY"))
+    client = client or supabase_client()
 
-# Formatting date column
-df["date"] = pd.to_datetime(df["date"]).dt.tz_localize("UTC")
-df["date"] = df["date"].dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+    window_start, observation_start = refresh_window(client, TABLE, DATA, HISTORY_DAYS)
+    data = to_records(download_fred_series(fred, DATA, observation_start), window_start)
 
-df = df.dropna()
+    # Full loads skip existing rows; incremental windows overwrite them with any revisions
+    print(f"Uploading {len(data)} rows")
+    client.table(TABLE).upsert(data,
+                               on_conflict="date",
+                               ignore_duplicates=window_start is None).execute()
+    print("Uploaded")
 
-# Uploading to Supabase
-data = df.to_dict(orient="records")
 
-# Uploading and skipping over duplicate values
-print("Uploading")
-supabase.table("yield_curve_data").upsert(data,
-                                          on_conflict="date",
-                                          ignore_duplicates=True).execute()
-print("Uploaded")
\ No newline at end of file
+if __name__ == "__main__":
+    run()